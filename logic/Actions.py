@@ -0,0 +1,297 @@
+ACTIONS = {}  # action name -> Action subclass
+
+
+def register(action_type):
+    ACTIONS[action_type.name] = action_type
+    return action_type
+
+
+class Action:
+    """
+    One player action. The fields of an action are its __slots__; the
+    constructor checks that every required field is given and nothing else, so
+    a malformed action fails before it touches the game. `apply` runs the action
+    on a game and returns its result.
+    """
+    __slots__ = ()
+    name = None
+    defaults = {}       # optional fields and their value when left out
+    transient = ()      # fields that are not journaled, e.g. Tk images
+    undoable = True     # recorded in the game's undo history
+
+    def __init__(self, **kwargs):
+        unknown = set(kwargs) - set(self.__slots__)
+        if unknown:
+            raise TypeError(f"{self.name} got unexpected fields: {sorted(unknown)}")
+        for field in self.__slots__:
+            if field in kwargs:
+                setattr(self, field, kwargs[field])
+            elif field in self.defaults:
+                setattr(self, field, self.defaults[field])
+            else:
+                raise TypeError(f"{self.name} is missing the field {field!r}")
+
+    def apply(self, game):
+        raise NotImplementedError
+
+    def encode(self):
+        # JSON-friendly fields for the journal; players are stored by name
+        return {
+            field: getattr(self, field).name if field == "player" else getattr(self, field)
+            for field in self.__slots__
+            if field not in self.transient
+        }
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+def failed(result):
+    """Whether an action result reports that the action was refused."""
+    if result is False:
+        return True
+    if isinstance(result, dict):
+        return result.get("success") is False
+    if isinstance(result, tuple) and result:
+        return result[0] is False
+    return False
+
+
+@register
+class StartAuction(Action):
+    __slots__ = ("card_id", "card_image_tk")
+    name = "start_auction"
+    defaults = {"card_image_tk": None}
+    transient = ("card_image_tk",)
+
+    def apply(self, game):
+        return game.start_auction(self.card_id, self.card_image_tk)
+
+
+@register
+class SubmitBid(Action):
+    __slots__ = ("bid_amount",)
+    name = "submit_bid"
+
+    def apply(self, game):
+        return game.submit_bid(self.bid_amount)
+
+
+@register
+class PassBid(Action):
+    __slots__ = ()
+    name = "pass_bid"
+
+    def apply(self, game):
+        return game.pass_bid()
+
+
+@register
+class RegisterMaxBid(Action):
+    __slots__ = ("player", "max_bid")
+    name = "register_max_bid"
+
+    def apply(self, game):
+        return game.register_max_bid(self.player, self.max_bid)
+
+
+@register
+class PlayerPass(Action):
+    __slots__ = ()
+    name = "player_pass"
+
+    def apply(self, game):
+        return game.player_pass()
+
+
+@register
+class PurchaseResources(Action):
+    __slots__ = ()
+    name = "purchase_resources"
+
+    def apply(self, game):
+        return game.confirm_purchase()
+
+
+@register
+class AddResToPurchase(Action):
+    __slots__ = ("res_type", "cost")
+    name = "add_res_to_purchase"
+
+    def apply(self, game):
+        return game.add_res_to_purchase(self.res_type, self.cost)
+
+
+@register
+class PutBackResToPurchase(Action):
+    __slots__ = ("card_id", "res_type")
+    name = "put_back_res_to_purchase"
+
+    def apply(self, game):
+        return game.put_back_res_to_purchase(self.card_id, self.res_type)
+
+
+@register
+class ConfirmLeftOverResAllocation(Action):
+    __slots__ = ("player",)
+    name = "confirm_left_over_res_allocation"
+
+    def apply(self, game):
+        return game.confirm_left_over_res_allocation(self.player)
+
+
+@register
+class AutoAllocateLeftOverRes(Action):
+    __slots__ = ("player",)
+    name = "auto_allocate_left_over_res"
+
+    def apply(self, game):
+        return game.auto_allocate_left_over_res(self.player)
+
+
+@register
+class GetPossiblePpForLeftRes(Action):
+    __slots__ = ("player", "res_type")
+    name = "get_possible_pp_for_left_res"
+
+    def apply(self, game):
+        return game.get_possible_pp_for_left_res(self.player, self.res_type)
+
+
+@register
+class AddLeftOverResOnHold(Action):
+    __slots__ = ("player", "card_id", "res_type")
+    name = "add_left_over_res_on_hold"
+
+    def apply(self, game):
+        return game.add_left_over_res_on_hold(self.player, self.card_id, self.res_type)
+
+
+@register
+class PutBackResToLeftOver(Action):
+    __slots__ = ("player", "card_id", "res_type")
+    name = "put_back_res_to_left_over"
+
+    def apply(self, game):
+        return game.put_back_res_to_left_over(self.player, self.card_id, self.res_type)
+
+
+@register
+class AddResToPower(Action):
+    __slots__ = ("card_id", "res_type")
+    name = "add_res_to_power"
+
+    def apply(self, game):
+        return game.add_res_to_power(self.card_id, self.res_type)
+
+
+@register
+class RemoveResFromPower(Action):
+    __slots__ = ("card_id", "res_type")
+    name = "remove_res_from_power"
+
+    def apply(self, game):
+        return game.remove_res_from_power(self.card_id, self.res_type)
+
+
+@register
+class AllocatePower(Action):
+    __slots__ = ()
+    name = "allocate_power"
+
+    def apply(self, game):
+        return game.allocate_power()
+
+
+@register
+class CanBuildHouse(Action):
+    __slots__ = ("city_name",)
+    name = "can_build_house"
+
+    def apply(self, game):
+        return game.can_build_house(self.city_name)
+
+
+@register
+class PlanBuilds(Action):
+    __slots__ = ("count",)
+    name = "plan_builds"
+
+    def apply(self, game):
+        return game.plan_builds(self.count)
+
+
+@register
+class BuildHouse(Action):
+    __slots__ = ("city_name", "cost")
+    name = "build_house"
+
+    def apply(self, game):
+        return game.build_house(self.city_name, self.cost)
+
+
+@register
+class GeneratePower(Action):
+    __slots__ = ()
+    name = "generate_power"
+
+    def apply(self, game):
+        return game.generate_power()
+
+
+@register
+class GetValidCardsForResourceMove(Action):
+    __slots__ = ("player", "card_id", "res_type")
+    name = "get_valid_cards_for_resource_move"
+
+    def apply(self, game):
+        return game.get_valid_cards_for_resource_move(self.player, self.card_id, self.res_type)
+
+
+@register
+class ExecuteMoveResource(Action):
+    __slots__ = ("player", "source_card_id", "target_card_id", "res_type")
+    name = "execute_move_resource"
+
+    def apply(self, game):
+        return game.execute_move_resource(self.player, self.source_card_id, self.target_card_id, self.res_type)
+
+
+@register
+class Undo(Action):
+    __slots__ = ()
+    name = "undo"
+    undoable = False
+
+    def apply(self, game):
+        return game.undo()
+
+
+@register
+class Redo(Action):
+    __slots__ = ()
+    name = "redo"
+    undoable = False
+
+    def apply(self, game):
+        return game.redo()
+
+
+@register
+class ApplyActions(Action):
+    """
+    A batch of actions applied as one: the actions run in order, view
+    notifications wait until the batch is done, and when an action is refused
+    the actions already run are rolled back. Only the fields of every action are
+    checked up front, when the batch is built. The batch is a list of Action
+    objects, see Game.make_action.
+    """
+    __slots__ = ("batch",)
+    name = "apply_actions"
+
+    def apply(self, game):
+        return game.run_batch(self.batch)
+
+    def encode(self):
+        return {"batch": [[action.name, action.encode()] for action in self.batch]}
@@ -1,17 +1,30 @@
-import tkinter as tk
-from tkinter import messagebox
+from logic.Cards import CARD_NUMBERS
+
 
 class AuctionLogic:
     def __init__(self, card_id, players, on_auction_end_callback):
         self.card_id = card_id
         self.players = players
-        self.current_bid = int(card_id) - 1
+        self.current_bid = CARD_NUMBERS[card_id] - 1
         self.active_bidder_index = 0
-        self.passed_players = []
+        self.passed_players = set()
+        self.high_bidder = None  # Player holding the current bid
+        self.max_bids = {}  # Player name -> maximum bid registered for proxy bidding
         self.initial_bid_submitted = False
         self.auction_ended = False
         self.on_auction_end = on_auction_end_callback  # Callback to notify when auction ends
 
+    def clone(self, players_by_name, on_auction_end_callback):
+        """Copy of an auction in progress bound to the cloned players of a cloned game."""
+        auction = AuctionLogic.__new__(AuctionLogic)
+        auction.__dict__.update(self.__dict__)
+        auction.players = [players_by_name[player.name] for player in self.players]
+        auction.passed_players = {players_by_name[player.name] for player in self.passed_players}
+        auction.high_bidder = players_by_name[self.high_bidder.name] if self.high_bidder else None
+        auction.max_bids = dict(self.max_bids)
+        auction.on_auction_end = on_auction_end_callback
+        return auction
+
     def decrease_bid(self, bid_amount):
         if not self.initial_bid_submitted and bid_amount >= self.current_bid:
             return True
@@ -24,9 +37,10 @@ class AuctionLogic:
         active_player = self.players[self.active_bidder_index]
         if bid_amount > self.current_bid and bid_amount <= active_player.money:
             self.current_bid = bid_amount
-            self.next_bidder()
+            self.high_bidder = active_player
             if not self.initial_bid_submitted:
                 self.initial_bid_submitted = True
+            self.next_bidder()
             return True, None  # Success
         elif bid_amount > active_player.money:
             return False, "Insufficient Funds. You do not have enough money to make this bid."
@@ -37,19 +51,118 @@ class AuctionLogic:
         if not self.initial_bid_submitted:
             return False, "The player who started the bid can not pass."
         else:
-            self.passed_players.append(self.players[self.active_bidder_index])
+            self.passed_players.add(self.players[self.active_bidder_index])
             self.next_bidder()
             return True, None
 
-    def next_bidder(self):
-        remaining_bidders = [player for player in self.players if player not in self.passed_players]
-        if len(remaining_bidders) == 1:
-            self.auction_ended = True
-            self.end_auction(remaining_bidders[0])
+    def register_max_bid(self, player, max_bid):
+        """
+        Proxy bidding: the player will bid for the card up to max_bid and leaves the
+        turn rotation. Once every player still in the auction has registered, it is
+        settled in one pass by settle_max_bids. A starting player who registers
+        opens the auction at the minimum bid; any other player whose maximum does not
+        beat the standing bid passes.
+        """
+        if player not in self.players or player in self.passed_players:
+            return False, f"{player.name} is not bidding in this auction."
+        if max_bid > player.money:
+            return False, "Insufficient Funds. You do not have enough money to make this bid."
+        is_opening = not self.initial_bid_submitted and player is self.players[self.active_bidder_index]
+        if is_opening and max_bid <= self.current_bid:
+            return False, "The player who started the bid can not pass."
+
+        if not is_opening and player is not self.high_bidder and max_bid <= self.current_bid:
+            self.passed_players.add(player)
         else:
+            self.max_bids[player.name] = max_bid
+        if is_opening:
+            self.current_bid += 1
+            self.high_bidder = player
+            self.initial_bid_submitted = True
+        if player is self.players[self.active_bidder_index]:
+            self.next_bidder()
+        elif len(self.players) - len(self.passed_players) == 1:
+            self.end_with_last_bidder()
+        elif self.ready_to_settle():
+            self.settle_max_bids()
+        return True, None
+
+    def ready_to_settle(self):
+        """
+        Whether nobody is left to ask for a bid: every bidder registered a maximum,
+        or only the holder of the standing bid did not and no registered maximum
+        beats that bid.
+        """
+        waiting = [
+            player for player in self.players
+            if player not in self.passed_players and player.name not in self.max_bids
+        ]
+        if not waiting:
+            return True
+        return waiting == [self.high_bidder] and all(
+            max_bid <= self.current_bid
+            for name, max_bid in self.max_bids.items()
+            if name != self.high_bidder.name
+        )
+
+    def settle_max_bids(self):
+        """
+        Second-price settlement of the registered maximum bids: the highest maximum
+        wins and pays one more than the runner-up's maximum, and more than the
+        standing bid unless it is the winner's, but never more than its own maximum
+        or its money. Ties go to the player holding the current bid, then to the
+        player who bids first after them.
+        """
+        start = self.players.index(self.high_bidder)
+        bidders = [
+            self.players[(start + offset) % len(self.players)] for offset in range(len(self.players))
+        ]
+        bidders = [player for player in bidders if player not in self.passed_players]
+
+        def ceiling(player):
+            max_bid = self.max_bids.get(player.name, 0)
+            return max(max_bid, self.current_bid) if player is self.high_bidder else max_bid
+
+        ranked = sorted(bidders, key=ceiling, reverse=True)
+        winner = ranked[0]
+        runner_up = ceiling(ranked[1]) if len(ranked) > 1 else 0
+        price = min(runner_up + 1, ceiling(winner))
+        if winner is self.high_bidder:
+            price = max(price, self.current_bid)
+        else:
+            # The winner has to beat the standing bid, even when its holder passed since
+            price = max(price, self.current_bid + 1)
+        price = min(price, ceiling(winner), winner.money)
+
+        self.current_bid = price
+        self.high_bidder = winner
+        self.passed_players.update(ranked[1:])
+        self.auction_ended = True
+        self.end_auction(winner)
+
+    def end_with_last_bidder(self):
+        winner = next(player for player in self.players if player not in self.passed_players)
+        if winner is not self.high_bidder and winner.name in self.max_bids:
+            # A proxy left alone still has to beat the standing bid
+            self.settle_max_bids()
+            return
+        self.auction_ended = True
+        self.end_auction(winner)
+
+    def next_bidder(self):
+        if len(self.players) - len(self.passed_players) == 1:
+            self.end_with_last_bidder()
+            return
+        if self.ready_to_settle():
+            self.settle_max_bids()
+            return
+        # Players who registered a maximum bid are no longer asked to bid
+        for _ in range(len(self.players) - 1):
             self.active_bidder_index = (self.active_bidder_index + 1) % len(self.players)
-            while self.players[self.active_bidder_index] in self.passed_players:
-                self.active_bidder_index = (self.active_bidder_index + 1) % len(self.players)
+            player = self.players[self.active_bidder_index]
+            if player not in self.passed_players and player.name not in self.max_bids:
+                return
+        self.settle_max_bids()
 
     def end_auction(self, winner):
         # Notify the game that the auction has ended
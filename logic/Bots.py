@@ -0,0 +1,216 @@
+import random
+from logic.Cards import CARD_NUMBERS
+from logic.Actions import AddResToPurchase, ApplyActions, BuildHouse, StartAuction, SubmitBid
+from logic.MCTS import ParallelSearch
+from utils.constants import CITIES
+
+RESOURCE_TYPES = ["coal", "oil", "trash", "uranium"]
+
+
+class Bot:
+    """
+    Base policy for self-play. The simulator asks a bot for one decision at a time;
+    every method receives the live game and the player the bot controls.
+    Subclasses override the choices they care about.
+    """
+    proxy_bidding = True  # auctions among these bots are settled from choose_max_bid
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+
+    def choose_power_plant(self, game, player):
+        """Card id to put up for auction, or None to pass."""
+        affordable = [card_id for card_id in auctionable_cards(game) if CARD_NUMBERS[card_id] <= player.money]
+        return self.rng.choice(affordable) if affordable else None
+
+    def choose_bid(self, game, player, auction_logic):
+        """Bid amount, or None to pass."""
+        return None
+
+    def choose_max_bid(self, game, player, auction_logic):
+        """The most the player pays for the card when the auction is settled at once; 0 to stay out."""
+        return 0
+
+    def choose_power_plant_to_remove(self, game, player, power_plant_ids):
+        return min(power_plant_ids, key=CARD_NUMBERS.__getitem__)
+
+    def choose_power_plant_for_resource(self, game, player, valid_cards, res_type, cost):
+        return valid_cards[0]
+
+    def choose_resource(self, game, player):
+        """Resource type of the next token to buy, or None to stop buying."""
+        return None
+
+    def choose_city(self, game, player):
+        """City to build the next house in, or None to stop building."""
+        return None
+
+    def choose_power(self, game, player):
+        """
+        List of (card_id, res_type) tokens to move into power. By default the
+        game's power plan: the most cities for the cheapest tokens.
+        """
+        return game.get_power_plan(player)[1]
+
+    def __repr__(self):
+        return f"{type(self).__name__}()"
+
+
+class RandomBot(Bot):
+    """Uniformly random legal choices; the baseline opponent."""
+
+    def choose_power_plant(self, game, player):
+        if game.round > 1 and self.rng.random() < 0.5:
+            return None
+        return super().choose_power_plant(game, player)
+
+    def choose_bid(self, game, player, auction_logic):
+        bid = auction_logic.current_bid + 1
+        if bid > player.money or (auction_logic.initial_bid_submitted and self.rng.random() < 0.6):
+            return None
+        return bid
+
+    def choose_max_bid(self, game, player, auction_logic):
+        if self.rng.random() < 0.6:
+            return 0
+        return min(auction_logic.current_bid + 1 + self.rng.randrange(6), player.money)
+
+    def choose_power_plant_for_resource(self, game, player, valid_cards, res_type, cost):
+        return self.rng.choice(valid_cards)
+
+    def choose_resource(self, game, player):
+        candidates = [
+            res_type for res_type in RESOURCE_TYPES
+            if game.get_valid_cards_for_res(res_type) and affordable_token(game, player, res_type)
+        ]
+        if not candidates or self.rng.random() < 0.3:
+            return None
+        return self.rng.choice(candidates)
+
+    def choose_city(self, game, player):
+        candidates = buildable_cities(game, player)
+        if not candidates or self.rng.random() < 0.3:
+            return None
+        return self.rng.choice(list(candidates))
+
+
+class GreedyBot(Bot):
+    """
+    Simple hand-tuned policy: buy the biggest affordable plant, fuel every plant
+    for the next Bureaucracy and build the cheapest cities it can power.
+    """
+
+    def choose_power_plant(self, game, player):
+        affordable = [card_id for card_id in auctionable_cards(game) if CARD_NUMBERS[card_id] <= player.money]
+        if not affordable:
+            return None
+        best = max(affordable, key=lambda card_id: (game.deck.cards[card_id].cities_to_power, CARD_NUMBERS[card_id]))
+        weakest = min(
+            (owned_pp.card.cities_to_power for owned_pp in player.owned_power_plants.values()),
+            default=0,
+        )
+        if game.round > 1 and len(player.owned_power_plants) >= 3 and game.deck.cards[best].cities_to_power <= weakest:
+            return None
+        return best
+
+    def choose_bid(self, game, player, auction_logic):
+        bid = auction_logic.current_bid + 1
+        if bid > self.choose_max_bid(game, player, auction_logic):
+            return None
+        return bid
+
+    def choose_max_bid(self, game, player, auction_logic):
+        card = game.deck.cards[auction_logic.card_id]
+        return min(card.number + 4 * card.cities_to_power, player.money)
+
+    def choose_resource(self, game, player):
+        for owned_pp in sorted(player.owned_power_plants.values(), key=lambda pp: -pp.card.cities_to_power):
+            card = owned_pp.card
+            if card.card_type == "renewable" or not card.resource_number:
+                continue
+            stored = sum(owned_pp.resources_on_card.values()) + sum(owned_pp.resources_to_purchase.values())
+            if stored >= card.resource_number:
+                continue
+            res_types = ["coal", "oil"] if card.card_type == "hybrid" else [card.card_type]
+            for res_type in sorted(res_types, key=lambda r: game.resources.get_next_cost(r) or 99):
+                if affordable_token(game, player, res_type):
+                    return res_type
+        return None
+
+    def choose_city(self, game, player):
+        capacity = sum(owned_pp.card.cities_to_power or 0 for owned_pp in player.owned_power_plants.values())
+        if len(player.cities) > capacity:
+            return None
+        candidates = buildable_cities(game, player)
+        if not candidates:
+            return None
+        return min(candidates, key=candidates.get)
+
+
+class MCTSBot(Bot):
+    """
+    Monte Carlo tree search player. Every decision runs a root-parallel search
+    (logic/MCTS.py) across `workers` processes for `time_budget` seconds and
+    plays the most visited action, so a move takes a fixed amount of time.
+    """
+    proxy_bidding = False
+
+    def __init__(self, seed=None, time_budget=1.0, workers=None, **options):
+        super().__init__(seed)
+        self.time_budget = time_budget
+        self.search = ParallelSearch(workers=workers, seed=seed, **options)
+
+    def choose_action(self, game):
+        return self.search.choose(game, self.time_budget)
+
+    def choose_power_plant(self, game, player):
+        action = self.choose_action(game)
+        return action.card_id if isinstance(action, StartAuction) else None
+
+    def choose_bid(self, game, player, auction_logic):
+        action = self.choose_action(game)
+        return action.bid_amount if isinstance(action, SubmitBid) else None
+
+    def choose_resource(self, game, player):
+        action = self.choose_action(game)
+        return action.res_type if isinstance(action, AddResToPurchase) else None
+
+    def choose_city(self, game, player):
+        action = self.choose_action(game)
+        return action.city_name if isinstance(action, BuildHouse) else None
+
+    def choose_power(self, game, player):
+        action = self.choose_action(game)
+        if not isinstance(action, ApplyActions):
+            return []
+        return [(fire.card_id, fire.res_type) for fire in action.batch if fire.name == "add_res_to_power"]
+
+    def close(self):
+        self.search.close()
+
+
+BOTS = {
+    "random": RandomBot,
+    "greedy": GreedyBot,
+    "mcts": MCTSBot,
+}
+
+
+def auctionable_cards(game):
+    """Cards of the current market (the first row) that can be auctioned."""
+    return game.power_plant_market.current_cards()
+
+
+def affordable_token(game, player, res_type):
+    cost = game.resources.get_next_cost(res_type)
+    return cost is not None and player.money_to_pay + cost <= player.money
+
+
+def buildable_cities(game, player):
+    """city_name -> total cost for every city the current player can build in now."""
+    candidates = {}
+    for city_name in CITIES:
+        result = game.can_build_house(city_name)
+        if result["success"]:
+            candidates[city_name] = result["cost"]
+    return candidates
@@ -0,0 +1,98 @@
+import json
+import os
+import pickle
+from types import MappingProxyType
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+CARDS_JSON_PATH = os.path.join(current_dir, '..', 'power_plant_cards.json')
+# Optional pre-parsed registry, written by write_cache and used while it is newer than the JSON
+CARDS_CACHE_PATH = os.path.join(current_dir, '..', 'power_plant_cards.pickle')
+
+STEP3 = "step3"
+STEP3_NUMBER = 1000  # the step 3 card sorts after every power plant
+
+RESOURCE_TYPES = ('coal', 'oil', 'trash', 'uranium')
+# card type -> resource types a power plant of that type stores
+STORABLE_TYPES = MappingProxyType({
+    'coal': ('coal',),
+    'oil': ('oil',),
+    'trash': ('trash',),
+    'uranium': ('uranium',),
+    'hybrid': ('coal', 'oil'),
+    'renewable': (),
+    'step 3': (),
+})
+# (card type, resource type) -> whether the plant stores and burns that resource
+COMPATIBLE = MappingProxyType({
+    (card_type, res_type): res_type in storable
+    for card_type, storable in STORABLE_TYPES.items()
+    for res_type in RESOURCE_TYPES
+})
+
+
+class Card:
+    """
+    Static description of one power plant card. Cards are shared by every game
+    in the process and never change; `number` is the integer value of the card
+    used for ordering and minimum bids.
+    """
+    __slots__ = ('card_id', 'number', 'row_index', 'col_index', 'card_type', 'resource_number', 'cities_to_power')
+
+    def __init__(self, card_id, row_index, col_index, card_type, resource_number, cities_to_power):
+        set_field = object.__setattr__
+        set_field(self, 'card_id', card_id)
+        set_field(self, 'number', STEP3_NUMBER if card_id == STEP3 else int(card_id))
+        set_field(self, 'row_index', row_index)
+        set_field(self, 'col_index', col_index)
+        set_field(self, 'card_type', card_type)
+        set_field(self, 'resource_number', resource_number)
+        set_field(self, 'cities_to_power', cities_to_power)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Card {self.card_id} is read-only")
+
+    def __reduce__(self):
+        return Card, (
+            self.card_id, self.row_index, self.col_index, self.card_type, self.resource_number, self.cities_to_power
+        )
+
+    def __repr__(self):
+        return f"Card({self.card_id}, {self.card_type}, {self.resource_number}, {self.cities_to_power})"
+
+
+def parse_cards(json_path=CARDS_JSON_PATH):
+    with open(json_path, 'r') as json_file:
+        cards_data = json.load(json_file)
+    return {
+        card_id: Card(
+            card_id=card_id,
+            row_index=card_info['row_index'],
+            col_index=card_info['col_index'],
+            card_type=card_info['type'],
+            resource_number=card_info['resource_number'],
+            cities_to_power=card_info['cities_to_power'],
+        )
+        for card_id, card_info in cards_data.items()
+    }
+
+
+def load_cards(json_path=CARDS_JSON_PATH, cache_path=CARDS_CACHE_PATH):
+    """card_id -> Card, from the pickled cache when it is up to date, else from the JSON."""
+    if cache_path and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(json_path):
+        with open(cache_path, 'rb') as cache_file:
+            return pickle.load(cache_file)
+    return parse_cards(json_path)
+
+
+def write_cache(json_path=CARDS_JSON_PATH, cache_path=CARDS_CACHE_PATH):
+    with open(cache_path, 'wb') as cache_file:
+        pickle.dump(parse_cards(json_path), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+# The registry: loaded once per process and shared, read-only, by every deck and view
+CARDS = MappingProxyType(load_cards())
+# card_id -> number, for sorting card ids without a lookup per attribute
+CARD_NUMBERS = MappingProxyType({card_id: card.number for card_id, card in CARDS.items()})
+# Card ids in file order and their index, for compact integer encodings of card lists
+CARD_IDS = tuple(CARDS)
+CARD_INDEX = MappingProxyType({card_id: index for index, card_id in enumerate(CARD_IDS)})
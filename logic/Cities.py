@@ -1,8 +1,122 @@
 from utils.constants import CITIES
+from functools import lru_cache
 import heapq
 
+
+# Adjacency of the whole map: city_name -> [(neighbor, cost), ...]
+FULL_GRAPH = {city_name: [tuple(edge) for edge in info['neighbors']] for city_name, info in CITIES.items()}
+
+
+def shortest_distances(sources, graph=FULL_GRAPH):
+    """
+    Multi-source Dijkstra over graph: returns city_name -> cheapest connection cost
+    from the nearest city in sources (inf when unreachable).
+    """
+    dist = {c: float('inf') for c in graph}
+    pq = []
+    for source in sources:
+        if source in dist:
+            dist[source] = 0
+            pq.append((0, source))
+    heapq.heapify(pq)
+    while pq:
+        d, u = heapq.heappop(pq)
+        if d > dist[u]:
+            continue
+        for v, cost in graph[u]:
+            nd = d + cost
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+
+@lru_cache(maxsize=32)
+def compile_regions(regions=None):
+    """
+    Compile the playable subgraph for a frozenset of region names (None is the whole
+    map) together with its all-pairs distance table. Results are kept in an LRU keyed
+    by the frozen region set, so games and simulations that pick the same regions
+    share one compiled graph and never filter edges per query.
+    """
+    if regions is None:
+        graph = FULL_GRAPH
+    else:
+        graph = {
+            city_name: [(v, cost) for v, cost in edges if CITIES[v]['region'] in regions]
+            for city_name, edges in FULL_GRAPH.items()
+            if CITIES[city_name]['region'] in regions
+        }
+    table = {city_name: shortest_distances([city_name], graph) for city_name in graph}
+    return graph, table
+
+
+def freeze_regions(regions):
+    return frozenset(regions) if regions else None
+
+
+def get_distance_table(regions=None):
+    """
+    All-pairs connection costs: table[a][b] is the cheapest cost to connect a and b,
+    optionally restricted to regions. The map is static, so each table is computed
+    once per process and shared.
+    """
+    return compile_regions(freeze_regions(regions))[1]
+
+class NetworkFrontier:
+    """
+    Live connection costs from one player's network to every city on the map.
+    Built with a single multi-source Dijkstra and updated incrementally from the
+    all-pairs table whenever the player connects a new city.
+    """
+
+    def __init__(self, owned_cities=(), regions=None):
+        self.regions = freeze_regions(regions)
+        graph = compile_regions(self.regions)[0]
+        owned_cities = [c for c in owned_cities if c in graph]
+        self.shared = False
+        self.size = len(owned_cities)
+        if owned_cities:
+            self.distances = shortest_distances(owned_cities, graph)
+        else:
+            # The first city of a network needs no connection
+            self.distances = dict.fromkeys(graph, 0)
+
+    def clone(self):
+        # Copy-on-write: the clone shares the distance map until either side adds a city
+        network = NetworkFrontier.__new__(NetworkFrontier)
+        network.regions = self.regions
+        network.size = self.size
+        network.distances = self.distances
+        network.shared = self.shared = True
+        return network
+
+    def add_city(self, city_name):
+        row = get_distance_table(self.regions)[city_name]
+        if self.shared:
+            self.distances = dict(self.distances)
+            self.shared = False
+        if self.size == 0:
+            self.distances = dict(row)
+        else:
+            distances = self.distances
+            for other, cost in row.items():
+                if cost < distances[other]:
+                    distances[other] = cost
+        self.size += 1
+
+    def get_connection_cost(self, city_name):
+        cost = self.distances.get(city_name, float('inf'))
+        return None if cost == float('inf') else cost
+
+    def __repr__(self):
+        return f"NetworkFrontier(size={self.size})"
+
+
 class Cities:
-    def __init__(self):
+    def __init__(self, regions=None):
+        # Regions chosen for this game, None plays on the whole map
+        self.regions = freeze_regions(regions)
         # Track built cities: city_name -> list of owners
         # self.built_cities = {}  # only store cities once built
         self.built_cities = {'Duisburg': ['Player 4', 'Player 2'], 'Duesseldorf': ['Player 4'], 'Dortmund': ['Player 1'], 'Koln': ['Player 1'], 'Munster': ['Player 2'], "Trier": ['Player 3', 'Player 2'], 'Essen': ['Player 3'], 'Aachen': ['Player 3']}
@@ -11,6 +125,13 @@ class Cities:
         # Validate neighbor consistency on initialization
         self._validate_neighbors()
 
+    def clone(self):
+        cities = Cities.__new__(Cities)
+        cities.regions = self.regions
+        cities.built_cities = {city_name: owners[:] for city_name, owners in self.built_cities.items()}
+        cities.occupied_regions = self.occupied_regions[:]
+        return cities
+
     def _validate_neighbors(self):
         errors = []
         for city, info in CITIES.items():
@@ -51,36 +172,85 @@ class Cities:
         else:
             self.built_cities[city_name] = [player_name]
     
-    def get_connection_cost(self, city_name, owned_cities, regions=[]):
+    def get_connection_cost(self, city_name, owned_cities, regions=None):
         """
-        Calculate the minimum connection cost from any city in owned_cities to city_name
-        using Dijkstra's algorithm. Returns 0 if owned_cities is empty, or None if no path exists.
+        Calculate the minimum connection cost from any city in owned_cities to city_name,
+        looked up in the cached distance table of the given regions (the game's regions
+        by default). Returns 0 if owned_cities is empty, or None if no path exists.
         """
         if not owned_cities:
             return 0
-        
-        if len(regions) > 0 and city_name not in regions:
-            raise ValueError(f"City {city_name} not in regions {regions}")
 
-        dist = {c: float('inf') for c in CITIES}
-        dist[city_name] = 0
-        pq = [(0, city_name)]
-        visited = set()
+        regions = freeze_regions(regions) or self.regions
+        table = get_distance_table(regions)
+        if city_name not in table:
+            where = f"regions {sorted(regions)}" if regions else "the map"
+            raise ValueError(f"City {city_name} not in {where}")
+
+        row = table[city_name]
+        cost = min(row.get(owned, float('inf')) for owned in owned_cities)
+        return None if cost == float('inf') else cost
+
+    def plan_builds(self, owned_cities, budget, count, candidates=None, occupied_regions=None, max_regions=None):
+        """
+        Cheapest way to add `count` new cities to a network within budget. Returns
+        (total_cost, [city_name, ...] in build order), or None if no plan fits.
+
+        Each new house pays its build cost plus the connection from the network built
+        so far, so the cost of a set is a minimum spanning tree over the all-pairs table
+        with the owned network contracted to one node (a Steiner tree would under-quote
+        because the rules never charge for shared track). A best-first search over city
+        sets grows that tree Prim-style and the first complete set popped is optimal.
+        candidates restricts the cities considered; occupied_regions/max_regions keep
+        the plan within the region limit.
+        """
+        table = get_distance_table(self.regions)
+        owned_cities = [c for c in owned_cities if c in table]
+        if candidates is None:
+            candidates = [c for c in table if c not in owned_cities]
+        candidates = [c for c in candidates if c in table]
+        candidates = [c for c in candidates if c not in owned_cities]
+        build_costs = {c: self.get_build_cost(c) for c in candidates}
+        occupied_regions = set(occupied_regions or ())
+
+        # Connection cost from the current network to every candidate
+        if owned_cities:
+            base = {c: min(table[c][o] for o in owned_cities) for c in candidates}
+        else:
+            base = dict.fromkeys(candidates, 0)
+
+        counter = 0
+        pq = [(0, counter, (), base)]
+        expanded = set()
         while pq:
-            d, u = heapq.heappop(pq)
-            if u in visited:
+            cost, _, order, connect = heapq.heappop(pq)
+            chosen = frozenset(order)
+            if chosen in expanded:
                 continue
-            visited.add(u)
-            # If we reached an owned city, return cost
-            if u in owned_cities:
-                return d
-            for v, cost in CITIES[u]['neighbors']:
-                if len(regions) > 0 and CITIES[v]['region'] not in regions:
+            expanded.add(chosen)
+            if len(order) == count:
+                return cost, list(order)
+
+            regions = occupied_regions.union(CITIES[c]['region'] for c in order)
+            for city_name in candidates:
+                if city_name in chosen:
+                    continue
+                if max_regions is not None and CITIES[city_name]['region'] not in regions and len(regions) >= max_regions:
+                    continue
+                # Zero-cost neighbours can not be owned by the same player
+                if any(cost_ == 0 and n in chosen for n, cost_ in CITIES[city_name]['neighbors']):
+                    continue
+                new_cost = cost + build_costs[city_name] + connect[city_name]
+                if new_cost > budget or chosen | {city_name} in expanded:
                     continue
-                nd = d + cost
-                if nd < dist[v]:
-                    dist[v] = nd
-                    heapq.heappush(pq, (nd, v))
+                row = table[city_name]
+                if order or owned_cities:
+                    new_connect = {c: min(d, row[c]) for c, d in connect.items()}
+                else:
+                    # The first house of an empty network becomes its only source
+                    new_connect = {c: row[c] for c in connect}
+                counter += 1
+                heapq.heappush(pq, (new_cost, counter, order + (city_name,), new_connect))
 
         return None
 
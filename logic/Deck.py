@@ -1,75 +1,83 @@
-import json
 import random
-import os
+from array import array
+from logic.Cards import CARDS, CARD_IDS, CARD_INDEX, STEP3
 
-current_dir = os.path.dirname(os.path.abspath(__file__))
-cards_json_path = os.path.join(current_dir, '..', 'power_plant_cards.json')
+# Plants removed from the deck to form the first market
+INITIAL_MARKET = ['3', '4', '5', '6', '7', '8', '9', '10']
+FIRST_CARD = '13'  # always on top of the draw stack, step3 is always at the bottom
+# Plants shuffled in between, in file order so a seeded game always deals the same stack
+SHUFFLED_CARDS = [
+    card_id for card_id in CARDS if card_id not in INITIAL_MARKET and card_id not in (FIRST_CARD, STEP3)
+]
 
-class Card:
-    def __init__(self, card_id, row_index, col_index, card_type, resource_number, cities_to_power):
-        self.card_id = card_id
-        self.row_index = row_index
-        self.col_index = col_index
-        self.card_type = card_type
-        self.resource_number = resource_number
-        self.cities_to_power = cities_to_power
 
-    def __repr__(self):
-        return f"Card({self.card_id}, {self.card_type}, {self.resource_number}, {self.cities_to_power})"
+def deal_orders(count, seed=None):
+    """
+    Deal count initial draw stacks up front, e.g. one per game of a simulation
+    batch. Each stack is an array of card indexes (see Cards.CARD_IDS) from the
+    top: 13, the shuffled plants, then step3. The same seed deals the same stacks.
+    """
+    rng = random.Random(seed)
+    shuffled = array('B', (CARD_INDEX[card_id] for card_id in SHUFFLED_CARDS))
+    top, bottom = array('B', [CARD_INDEX[FIRST_CARD]]), array('B', [CARD_INDEX[STEP3]])
+    orders = []
+    for _ in range(count):
+        rng.shuffle(shuffled)
+        orders.append(top + shuffled + bottom)
+    return orders
+
 
 class Deck:
-    def __init__(self):
-        self.cards = {}
-        self.stack_card_ids = []
-        self.load_cards(cards_json_path)
+    def __init__(self, rng=None):
+        # the game's random generator, so a seeded game deals the same deck
+        self.rng = rng or random.Random()
+        # the shared card registry, loaded once per process
+        self.cards = CARDS
+        # Undrawn card ids from the bottom of the stack, so a draw pops the last one
+        self.draw_pile = list(reversed(CARD_IDS))
     
     def __repr__(self):
         return f"Deck({self.stack_card_ids})"
 
-    def load_cards(self, json_path):
-        with open(json_path, 'r') as json_file:
-            cards_data = json.load(json_file)
-            for card_id, card_info in cards_data.items():
-                card = Card(
-                    card_id=card_id,
-                    row_index=card_info['row_index'],
-                    col_index=card_info['col_index'],
-                    card_type=card_info['type'],
-                    resource_number=card_info['resource_number'],
-                    cities_to_power=card_info['cities_to_power']
-                )
-                self.cards[card_id] = card
+    @property
+    def stack_card_ids(self):
+        """Undrawn card ids from the top of the stack."""
+        return self.draw_pile[::-1]
 
-        # Initialize stack_card_ids with all card IDs
-        self.stack_card_ids = list(self.cards.keys())
+    @stack_card_ids.setter
+    def stack_card_ids(self, card_ids):
+        self.draw_pile = list(reversed(card_ids))
 
-    def prepare_initial_deck(self):
-        # Remove specific card IDs from the initial deck
-        initial_removals = ['3', '4', '5', '6', '7', '8', '9', '10']
-        for card_id in initial_removals:
-            if card_id in self.stack_card_ids:
-                self.stack_card_ids.remove(card_id)
-        
-        # Shuffle the remaining deck, except 13 and step3
-        self.stack_card_ids.remove('13')
-        self.stack_card_ids.remove('step3')
-        random.shuffle(self.stack_card_ids)
-        
-        # Put 13 on top and step3 on the bottom
-        self.stack_card_ids.insert(0, '13')
-        self.stack_card_ids.append('step3')
-        
-        return initial_removals
+    def prepare_initial_deck(self, order=None):
+        """
+        Deal the draw stack and return the card ids of the first market. order is
+        a stack from deal_orders; without it the plants are shuffled with the
+        deck's generator, keeping 13 on top and step3 at the bottom.
+        """
+        if order is None:
+            shuffled = SHUFFLED_CARDS[:]
+            self.rng.shuffle(shuffled)
+            self.draw_pile = [STEP3] + shuffled[::-1] + [FIRST_CARD]
+        else:
+            self.draw_pile = [CARD_IDS[index] for index in reversed(order)]
+        return INITIAL_MARKET[:]
 
     def draw_card(self):
-        if self.stack_card_ids:
-            return self.stack_card_ids.pop(0)
+        if self.draw_pile:
+            return self.draw_pile.pop()
         return None
 
+    def clone(self):
+        # Cards are static and shared, only the draw stack is copied
+        deck = Deck.__new__(Deck)
+        deck.cards = self.cards
+        deck.draw_pile = self.draw_pile[:]
+        deck.rng = random.Random()
+        deck.rng.setstate(self.rng.getstate())
+        return deck
+
     def put_back(self, card_id):
-        self.stack_card_ids.append(card_id)
+        self.draw_pile.insert(0, card_id)
     
     def shuffle(self):
-        random.shuffle(self.current_card_ids)
-
-
+        self.rng.shuffle(self.draw_pile)
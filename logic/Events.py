@@ -0,0 +1,78 @@
+# Notifications that only describe the current state; while held, only the latest is delivered
+COALESCED = {
+    "status_changed",
+    "players_changed",
+    "player_changed",
+    "player_control_changed",
+    "market_changed",
+    "resource_market_changed",
+    "remaining_resources_changed",
+    "build_costs_changed",
+}
+
+
+class EventBus:
+    """
+    Minimal publish/subscribe hub between the rules engine and any view.
+
+    Notifications (`emit`) are fanned out to every subscriber and their return
+    values are ignored. Requests (`request`) ask a single responder for a
+    decision, e.g. which power plant should receive a token; when nothing is
+    registered the caller's default is returned, which is how the engine runs
+    headless.
+
+    Between `hold` and `release` notifications are queued instead. Events that
+    describe a current state (COALESCED) are delivered once, with the latest
+    values; the others are delivered in order.
+    """
+
+    def __init__(self):
+        self.subscribers = {}  # event name -> list of callbacks
+        self.responders = {}   # request name -> callback
+        self.held = 0
+        self.pending = {}      # coalescing key -> (event, kwargs), in delivery order
+
+    def subscribe(self, event, callback):
+        self.subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event, callback):
+        callbacks = self.subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def emit(self, event, **kwargs):
+        if self.held:
+            if event in COALESCED:
+                # player_changed is kept once per player
+                key = (event, id(kwargs.get("player")))
+                self.pending.pop(key, None)
+            else:
+                key = object()
+            self.pending[key] = (event, kwargs)
+            return
+        for callback in self.subscribers.get(event, ()):
+            callback(**kwargs)
+
+    def hold(self):
+        self.held += 1
+
+    def release(self, discard=False):
+        self.held -= 1
+        if self.held:
+            return
+        pending, self.pending = self.pending, {}
+        if not discard:
+            for event, kwargs in pending.values():
+                self.emit(event, **kwargs)
+
+    def respond(self, request, callback):
+        self.responders[request] = callback
+
+    def request(self, request, default=None, **kwargs):
+        responder = self.responders.get(request)
+        if responder is None:
+            return default
+        return responder(**kwargs)
+
+    def __repr__(self):
+        return f"EventBus(events={list(self.subscribers)}, requests={list(self.responders)})"
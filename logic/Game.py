@@ -5,26 +5,43 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
 sys.path.append(parent_dir)
 
-import tkinter as tk
-from tkinter import messagebox
-from ui.PowerGridUI import PowerGridUI
-from ui.AuctionUI import AuctionUI
-from Deck import Deck
-from Resource import Resources
-from Cities import Cities
-from AuctionLogic import AuctionLogic
-from utils.constants import PHASES, CITIES, REGION_LIMITS, CITIES_TO_CASH
+from logic.Deck import Deck
+from logic.Cards import CARD_NUMBERS, STEP3
+from logic.Resource import Resources, ResourceCounts
+from logic.Cities import Cities, NetworkFrontier, freeze_regions
+from logic.AuctionLogic import AuctionLogic
+from logic.Events import EventBus
+from logic.History import History
+from logic.Journal import ActionJournal
+from logic.Power import plan_power, plant_key, token_prices
+from logic.Storage import StorageIndex, storable_types, store_tokens
+from logic.Actions import (
+    ACTIONS, Action, failed, StartAuction, SubmitBid, PassBid, PlayerPass, PurchaseResources, AddResToPurchase,
+    PutBackResToPurchase, ConfirmLeftOverResAllocation, AutoAllocateLeftOverRes, AddLeftOverResOnHold, PutBackResToLeftOver, AddResToPower,
+    RemoveResFromPower, AllocatePower, BuildHouse, GeneratePower, ExecuteMoveResource,
+)
+from utils.constants import PHASES, CITIES, REGION_LIMITS, CITIES_TO_CASH, STEP_2_CITIES, GAME_END_CITIES
+from bisect import insort
+from operator import attrgetter
+import hashlib
 import random
 
 
 class PowerPlantMarket:
+    """
+    The power plants on offer, kept in card order (the step 3 card sorts last).
+    In Steps 1 and 2 the first four cards are the current market that can be
+    auctioned and the rest the future market; in Step 3 the market shrinks to
+    six cards that are all current.
+    """
+    __slots__ = ('current_market', 'current_size')
+
     def __init__(self):
-        self.current_market = []  # List of card_ids
+        self.current_market = []  # List of card_ids, lowest first
+        self.current_size = 4  # How many of the lowest cards can be auctioned
 
     def add_card_to_market(self, card_id):
-        self.current_market.append(card_id)
-        if card_id != "step3":
-            self.current_market.sort(key=lambda x: int(x))
+        insort(self.current_market, card_id, key=CARD_NUMBERS.__getitem__)
 
     def remove_lowest_card(self):
         self.current_market.pop(0)
@@ -33,18 +50,56 @@ class PowerPlantMarket:
         if card_id in self.current_market:
             self.current_market.remove(card_id)
 
+    def current_cards(self):
+        """Card ids that can be put up for auction."""
+        return [card_id for card_id in self.current_market[:self.current_size] if card_id != STEP3]
+
+    def future_cards(self):
+        return self.current_market[self.current_size:]
+
+    def start_step3(self):
+        """Remove the step 3 card and the lowest plant; the remaining cards are all current."""
+        self.remove_card_from_market(STEP3)
+        if self.current_market:
+            self.remove_lowest_card()
+        self.current_size = 6
+
+    def snapshot(self):
+        # Immutable, so simulations can keep and share it without copying
+        return tuple(self.current_market), self.current_size
+
+    def restore(self, snapshot):
+        market, self.current_size = snapshot
+        self.current_market = list(market)
+
+    def clone(self):
+        market = PowerPlantMarket.__new__(PowerPlantMarket)
+        market.restore(self.snapshot())
+        return market
+
     def __repr__(self):
         return f"PowerPlantMarket({self.current_market})"
 
 
 class OwnedPowerPlant:
+    __slots__ = ('card', 'resources_on_card', 'resources_to_purchase', 'resources_to_power', 'resources_on_hold')
+
     def __init__(self, card):
         self.card = card  # The static card info from Deck.cards
-        # Initialize dynamic resource state
-        self.resources_on_card = {}
-        self.resources_to_purchase = {}
-        self.resources_to_power = {}
-        self.resources_on_hold = {}
+        # Initialize dynamic resource state, counts indexed by resource type
+        self.resources_on_card = ResourceCounts()
+        self.resources_to_purchase = ResourceCounts()
+        self.resources_to_power = ResourceCounts()
+        self.resources_on_hold = ResourceCounts()
+
+    def clone(self):
+        owned_pp = OwnedPowerPlant.__new__(OwnedPowerPlant)
+        owned_pp.card = self.card
+        owned_pp.resources_on_card = self.resources_on_card.clone()
+        owned_pp.resources_to_purchase = self.resources_to_purchase.clone()
+        owned_pp.resources_to_power = self.resources_to_power.clone()
+        owned_pp.resources_on_hold = self.resources_on_hold.clone()
+        return owned_pp
 
     def __repr__(self):
         return (
@@ -53,6 +108,12 @@ class OwnedPowerPlant:
 
 
 class Player:
+    __slots__ = (
+        'name', 'color', 'power_plants', 'owned_power_plants', 'money', 'cities', 'network',
+        'phase_completed', 'money_to_pay', 'left_resources_from_removed_pp', 'cities_powered', 'storage',
+        'order_key',
+    )
+
     def __init__(self, name, color):
         self.name = name
         self.color = color
@@ -60,9 +121,38 @@ class Player:
         self.owned_power_plants = {}
         self.money = 50
         self.cities = []
+        # connection cost from this player's network to every city
+        self.network = NetworkFrontier()
         self.phase_completed = False
         self.money_to_pay = 0
-        self.left_resources_from_removed_pp = {}
+        self.left_resources_from_removed_pp = ResourceCounts()
+        # cities powered in the latest Bureaucracy phase, decides the winner
+        self.cities_powered = 0
+        # free token slots of the power plants, built on first use, see Game.storage_index
+        self.storage = None
+        # (cities, highest power plant) that decides the turn order, kept up to date as they change
+        self.order_key = (0, 0)
+
+    def update_order_key(self):
+        """Recompute the turn order key from the player's cities and power plants."""
+        self.order_key = (len(self.cities), max(map(CARD_NUMBERS.__getitem__, self.owned_power_plants), default=0))
+
+    def clone(self):
+        player = Player.__new__(Player)
+        player.name = self.name
+        player.color = self.color
+        player.power_plants = self.power_plants[:]
+        player.owned_power_plants = {card_id: owned_pp.clone() for card_id, owned_pp in self.owned_power_plants.items()}
+        player.money = self.money
+        player.cities = self.cities[:]
+        player.network = self.network.clone()
+        player.phase_completed = self.phase_completed
+        player.money_to_pay = self.money_to_pay
+        player.left_resources_from_removed_pp = self.left_resources_from_removed_pp.clone()
+        player.cities_powered = self.cities_powered
+        player.storage = None
+        player.order_key = self.order_key
+        return player
 
     def __repr__(self):
         return (
@@ -72,8 +162,24 @@ class Player:
 
 
 class Game:
-    def __init__(self, root):
-        self.deck = Deck()
+    def __init__(self, root=None, regions=None, seed=None, journal_path=None, deck_order=None, undo_depth=None):
+        """
+        Create a game. When a Tk `root` is given the PowerGridUI is attached as a
+        view; otherwise the engine runs headless and only emits events on `self.events`.
+        regions optionally restricts the map to the chosen region names.
+        seed makes every shuffle of the game reproducible; with journal_path each
+        action is appended to a journal that logic/Replay.py can play back.
+        deck_order is an initial draw stack dealt up front by Deck.deal_orders.
+        undo_depth caps how many actions can be undone, unlimited by default; bots
+        playing headless pass 0 so long games do not keep every change in memory.
+        """
+        self.events = EventBus()
+        # inverse deltas of the actions taken so far, see handle_action
+        self.history = History(undo_depth)
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        self.journal = ActionJournal(journal_path, self.seed, regions, deck_order) if journal_path else None
+        self.deck = Deck(self.rng)
         self.players = []
         self.power_plant_market = PowerPlantMarket()
         self.colors = [
@@ -94,28 +200,47 @@ class Game:
         self.round = 0
 
         self.current_player_index = 0
+        self.game_over = False
+        self.winner = None
+        self.auction_logic = None
 
-        self.initialize_game_state()
-
-        self.ui = PowerGridUI(root, self.get_game_state, self.handle_action)
-        self.initialize_game_ui()
-        self.next_phase()
+        self.initialize_game_state(deck_order)
 
         # [TODO] choose regions before game starts
         self.max_regions = REGION_LIMITS[len(self.players)]
+        if regions:
+            self.choose_regions(regions)
+
+        self.ui = None
+        if root is not None:
+            self.attach_ui(root)
+        self.initialize_game_ui()
+        self.next_phase()
+        if self.journal is not None:
+            self.journal.phase_started(self.round, PHASES[self.phase_index], self.export_state())
 
     def __repr__(self):
         return f"Game(Players: {self.players}, Power Plant Market: {self.power_plant_market})"
 
     def next_phase(self):
+        if self.round > 0 and PHASES[self.phase_index] == "Bureaucracy":
+            self.end_round()
+            if self.game_over:
+                return
+
+        self.history.remember(self, "phase_index", "current_player_index", "round", "players")
+        for player in self.players:
+            self.history.remember(player, "phase_completed")
         self.phase_index = (self.phase_index + 1) % len(PHASES)
         print(f"NEXT PHASE: {self.phase_index}")
         self.current_player_index = 0
         for player in self.players:
             player.phase_completed = False
 
-        self.ui.update_status(
-            PHASES[self.phase_index], self.players[self.current_player_index].name
+        self.events.emit(
+            "status_changed",
+            phase_name=PHASES[self.phase_index],
+            current_player_name=self.players[self.current_player_index].name,
         )
         # [TODO] May need to sort players
         if PHASES[self.phase_index] == "Auction":
@@ -123,23 +248,237 @@ class Game:
             self.sort_players()
             print(f"Round: {self.round}")
         elif PHASES[self.phase_index] == "Resources":
+            if STEP3 in self.power_plant_market.current_market:
+                self.start_step3()
             if self.round == 1:
                 self.sort_players()
             self.players.reverse()
         
-        self.ui.create_player_info(self.players, PHASES[self.phase_index])
-        self.ui.update_player_control()
+        self.events.emit("players_changed", players=self.players, phase=PHASES[self.phase_index])
+        self.events.emit("player_control_changed")
+        self.notify_build_costs()
+
+    def choose_regions(self, regions):
+        """
+        Restrict the game to the given regions. The restricted subgraph and its distance
+        table are compiled once and shared through the LRU in Cities.
+        """
+        regions = set(regions)
+        unknown = regions - {info["region"] for info in CITIES.values()}
+        if unknown:
+            raise ValueError(f"Unknown regions: {sorted(unknown)}")
+        if len(regions) > self.max_regions:
+            raise ValueError(f"Cannot play in {len(regions)} regions, limit is {self.max_regions}")
+
+        self.cities.regions = freeze_regions(regions)
+        for player in self.players:
+            player.network = NetworkFrontier(player.cities, self.cities.regions)
+
+    def clone(self, undo_depth=None):
+        """
+        Shallow structural copy for search and what-if analysis: every mutable piece of
+        state is copied, static data (cards, the city graph, distance tables) is shared.
+        The clone is headless and has no subscribers, and starts with an empty history
+        limited to undo_depth actions (unlimited by default).
+        """
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.events = EventBus()
+        game.history = History(undo_depth)
+        game.journal = None
+        game.ui = None
+        game.rng = random.Random()
+        game.rng.setstate(self.rng.getstate())
+        game.deck = self.deck.clone()
+        game.deck.rng = game.rng
+        game.power_plant_market = self.power_plant_market.clone()
+        game.resources = self.resources.clone()
+        game.cities = self.cities.clone()
+        game.occupied_regions = set(self.occupied_regions)
+
+        players = {player.name: player.clone() for player in self.players}
+        game.players = [players[player.name] for player in self.players]
+        if self.winner:
+            game.winner = players[self.winner.name]
+        if self.auction_logic:
+            game.auction_logic = self.auction_logic.clone(players, game.on_auction_end)
+        return game
+
+    def export_state(self):
+        """
+        Complete mutable state of the game as plain JSON data, including the random
+        generator, so restore_state can continue the game exactly from this point.
+        """
+        version, internal_state, gauss_next = self.rng.getstate()
+        auction = None
+        if self.auction_logic and not self.auction_logic.auction_ended:
+            auction = {
+                "card_id": self.auction_logic.card_id,
+                "players": [player.name for player in self.auction_logic.players],
+                "current_bid": self.auction_logic.current_bid,
+                "active_bidder_index": self.auction_logic.active_bidder_index,
+                "passed_players": [
+                    player.name for player in self.auction_logic.players if player in self.auction_logic.passed_players
+                ],
+                "high_bidder": self.auction_logic.high_bidder.name if self.auction_logic.high_bidder else None,
+                "max_bids": dict(self.auction_logic.max_bids),
+                "initial_bid_submitted": self.auction_logic.initial_bid_submitted,
+            }
+        return {
+            "seed": self.seed,
+            "rng": [version, list(internal_state), gauss_next],
+            "regions": sorted(self.cities.regions) if self.cities.regions else None,
+            "step": self.step,
+            "phase_index": self.phase_index,
+            "round": self.round,
+            "current_player_index": self.current_player_index,
+            "game_over": self.game_over,
+            "winner": self.winner.name if self.winner else None,
+            "players": [
+                {
+                    "name": player.name,
+                    "color": player.color,
+                    "money": player.money,
+                    "cities": player.cities[:],
+                    "phase_completed": player.phase_completed,
+                    "money_to_pay": player.money_to_pay,
+                    "left_resources": player.left_resources_from_removed_pp.counts[:],
+                    "cities_powered": player.cities_powered,
+                    "power_plants": [
+                        [
+                            card_id,
+                            owned_pp.resources_on_card.counts[:],
+                            owned_pp.resources_to_purchase.counts[:],
+                            owned_pp.resources_to_power.counts[:],
+                            owned_pp.resources_on_hold.counts[:],
+                        ]
+                        for card_id, owned_pp in player.owned_power_plants.items()
+                    ],
+                }
+                for player in self.players
+            ],
+            "market": self.power_plant_market.current_market[:],
+            "deck": self.deck.stack_card_ids[:],
+            "available": dict(self.resources.available),
+            "remaining_resources": dict(self.resources.remaining_resources),
+            "built_cities": {city_name: owners[:] for city_name, owners in self.cities.built_cities.items()},
+            "occupied_regions": sorted(self.occupied_regions),
+            "auction": auction,
+        }
+
+    def restore_state(self, state):
+        """Replace the state of this game with one produced by export_state."""
+        self.seed = state["seed"]
+        version, internal_state, gauss_next = state["rng"]
+        self.rng.setstate((version, tuple(internal_state), gauss_next))
+        self.cities.regions = freeze_regions(state["regions"])
+        self.step = state["step"]
+        self.phase_index = state["phase_index"]
+        self.round = state["round"]
+        self.current_player_index = state["current_player_index"]
+        self.game_over = state["game_over"]
+
+        self.players = []
+        for player_state in state["players"]:
+            player = Player(player_state["name"], player_state["color"])
+            player.money = player_state["money"]
+            player.cities = player_state["cities"][:]
+            player.network = NetworkFrontier(player.cities, self.cities.regions)
+            player.phase_completed = player_state["phase_completed"]
+            player.money_to_pay = player_state["money_to_pay"]
+            player.left_resources_from_removed_pp = ResourceCounts.from_list(player_state["left_resources"])
+            player.cities_powered = player_state["cities_powered"]
+            for card_id, on_card, to_purchase, to_power, on_hold in player_state["power_plants"]:
+                owned_pp = OwnedPowerPlant(self.deck.cards[card_id])
+                owned_pp.resources_on_card = ResourceCounts.from_list(on_card)
+                owned_pp.resources_to_purchase = ResourceCounts.from_list(to_purchase)
+                owned_pp.resources_to_power = ResourceCounts.from_list(to_power)
+                owned_pp.resources_on_hold = ResourceCounts.from_list(on_hold)
+                player.owned_power_plants[card_id] = owned_pp
+            player.update_order_key()
+            self.players.append(player)
+        players = {player.name: player for player in self.players}
+        self.winner = players[state["winner"]] if state["winner"] else None
+
+        self.power_plant_market.restore((state["market"], 6 if self.step == 3 else 4))
+        self.deck.stack_card_ids = state["deck"][:]
+        self.resources.available = dict(state["available"])
+        self.resources.remaining_resources = dict(state["remaining_resources"])
+        self.cities.built_cities = {city_name: owners[:] for city_name, owners in state["built_cities"].items()}
+        self.occupied_regions = set(state["occupied_regions"])
+
+        self.auction_logic = None
+        auction = state["auction"]
+        if auction:
+            self.auction_logic = AuctionLogic(
+                auction["card_id"], [players[name] for name in auction["players"]], self.on_auction_end
+            )
+            self.auction_logic.current_bid = auction["current_bid"]
+            self.auction_logic.active_bidder_index = auction["active_bidder_index"]
+            self.auction_logic.passed_players = {players[name] for name in auction["passed_players"]}
+            self.auction_logic.high_bidder = players[auction["high_bidder"]] if auction["high_bidder"] else None
+            self.auction_logic.max_bids = dict(auction["max_bids"])
+            self.auction_logic.initial_bid_submitted = auction["initial_bid_submitted"]
 
-    def initialize_game_state(self):
+        self.history.clear()
+        self.on_state_restored()
+
+    def end_round(self):
+        """
+        Bookkeeping once every player has finished Bureaucracy: end the game when
+        a player reached the city limit, otherwise advance the step and refill
+        the resource market.
+        """
+        num_players = len(self.players)
+        self.history.remember(self, "game_over", "winner", "step")
+        self.history.remember(self.resources, "available", "remaining_resources")
+        if any(len(player.cities) >= GAME_END_CITIES[num_players] for player in self.players):
+            self.game_over = True
+            self.winner = max(
+                self.players,
+                key=lambda player: (player.cities_powered, player.money, len(player.cities)),
+            )
+            self.events.emit("game_over", winner=self.winner, players=self.players)
+            return
+
+        if self.step == 1 and any(len(player.cities) >= STEP_2_CITIES[num_players] for player in self.players):
+            self.step = 2
+
+        self.resources.refill_resources(num_players, self.step)
+        self.events.emit("resource_market_changed", resources=self.resources)
+        self.events.emit("remaining_resources_changed", remaining_resources=self.resources.remaining_resources)
+
+    def start_step3(self):
+        """Step 3 starts after the Auction phase in which the step 3 card was drawn."""
+        self.history.remember(self, "step")
+        self.history.remember(self.power_plant_market, "current_market", "current_size")
+        self.history.remember(self.deck, "draw_pile")
+        self.step = 3
+        self.power_plant_market.start_step3()
+        self.deck.shuffle()
+        self.events.emit(
+            "market_changed", step=self.step, power_plants_market=self.power_plant_market.current_market
+        )
+
+    def attach_ui(self, root):
+        # Imported lazily so the headless engine never loads tkinter or PIL
+        from ui.PowerGridUI import PowerGridUI
+
+        self.ui = PowerGridUI(root, self.get_game_state, self.handle_action)
+        self.ui.subscribe(self.events)
+
+    def initialize_game_state(self, deck_order=None):
         self.initialize_players()
-        self.initialize_power_plant_market()
+        self.initialize_power_plant_market(deck_order)
 
     def initialize_game_ui(self):
-        self.ui.create_power_plant_market(
-            self.step, self.power_plant_market.current_market
+        self.events.emit(
+            "game_initialized",
+            step=self.step,
+            power_plants_market=self.power_plant_market.current_market,
+            resources=self.resources,
+            remaining_resources=self.resources.remaining_resources,
         )
-        self.ui.load_resources(self.resources.cur_resources)
-        self.ui.create_resource_section(self.resources.remaining_resources)
 
     def initialize_players(self):
         player_names = ["Player 1", "Player 2", "Player 3", "Player 4"]
@@ -150,9 +489,9 @@ class Game:
             {"11": {"uranium": 1}, "12": {"coal": 1, "oil": 1}},
             {"15": {"coal": 2}, "34": {"uranium": 2}},
         ]
-        random.shuffle(self.colors)
+        self.rng.shuffle(self.colors)
         pp_res_index = [i for i in range(len(player_names))]
-        random.shuffle(pp_res_index)
+        self.rng.shuffle(pp_res_index)
 
         for i, name in enumerate(player_names):
             player = Player(name, self.colors[i])
@@ -160,7 +499,7 @@ class Game:
             for pp_card_id in power_plants[i]:
                 pp_card_obj = self.deck.cards[pp_card_id]
                 owned_pp = OwnedPowerPlant(pp_card_obj)
-                owned_pp.resources_on_card = pp_resources[i].get(pp_card_id, {})
+                owned_pp.resources_on_card = ResourceCounts(pp_resources[i].get(pp_card_id))
                 owned_pp_dict[pp_card_id] = owned_pp
             player.owned_power_plants = owned_pp_dict
 
@@ -169,70 +508,162 @@ class Game:
                 for city_owner_name in player_names:
                     if name == city_owner_name:
                         player.cities.append(city_name)
+            player.network = NetworkFrontier(player.cities)
+            player.update_order_key()
             self.players.append(player)
 
-    def initialize_power_plant_market(self):
-        self.power_plant_market.current_market = self.deck.prepare_initial_deck()
+    def initialize_power_plant_market(self, deck_order=None):
+        self.power_plant_market.current_market = self.deck.prepare_initial_deck(deck_order)
 
     def handle_action(self, action, **kwargs):
-        if action == "start_auction":
-            self.start_auction(kwargs["card_id"], kwargs["card_image_tk"])
-        elif action == "player_pass":
-            self.player_pass()
-            
-        elif action == "purchase_resources":
-            self.confirm_purchase()
+        """
+        Run one player action given by name, e.g. handle_action("build_house",
+        city_name=..., cost=...). See logic/Actions.py for the available actions.
+        """
+        return self.apply_action(self.make_action(action, kwargs))
+
+    def make_action(self, name, kwargs):
+        """Typed action for a name and its fields; players may be given by name."""
+        action_type = ACTIONS.get(name)
+        if action_type is None:
+            raise ValueError(f"Unknown action: {name}")
+        kwargs = dict(kwargs)
+        if isinstance(kwargs.get("player"), str):
+            name = kwargs["player"]
+            kwargs["player"] = next((player for player in self.players if player.name == name), None)
+            if kwargs["player"] is None:
+                raise ValueError(f"Unknown player: {name}")
+        if "batch" in kwargs:
+            kwargs["batch"] = [
+                item if isinstance(item, Action) else self.make_action(item[0], item[1]) for item in kwargs["batch"]
+            ]
+        return action_type(**kwargs)
+
+    def apply_actions(self, batch):
+        """
+        Apply a sequence of actions, Action objects or (name, kwargs) pairs, as one
+        undoable step. The actions run one by one and view notifications are held
+        back until the batch is done; when an action is refused, the actions that
+        already ran are rolled back.
+        """
+        return self.handle_action("apply_actions", batch=batch)
 
-        elif action == "add_res_to_purchase":
-            return self.add_res_to_purchase(kwargs["res_type"], kwargs["cost"])
-        
-        elif action == "put_back_res_to_purchase":
-            return self.put_back_res_to_purchase(kwargs["card_id"], kwargs["res_type"])
-        
-        elif action == "confirm_left_over_res_allocation":
-            self.confirm_left_over_res_allocation(kwargs["player"])
-        
-        elif action == "get_possible_pp_for_left_res":
-            return self.get_possible_pp_for_left_res(kwargs["player"], kwargs["res_type"])
-        
-        elif action == "add_left_over_res_on_hold":
-            return self.add_left_over_res_on_hold(kwargs["player"], kwargs["card_id"], kwargs["res_type"])
+    def apply_action(self, action):
+        """
+        Run an Action. Everything it changes is logged in self.history so it can be
+        reverted with the "undo" and "redo" actions, and the action itself goes to
+        the journal when the game keeps one.
+        """
+        journal = self.journal
+        if journal is None:
+            return self.run_action(action)
+
+        phase = (self.round, self.phase_index)
+        journal.begin()
+        try:
+            return self.run_action(action)
+        finally:
+            journal.commit(action.name, action.encode())
+            if self.game_over:
+                self.close_journal()
+            elif journal.depth == 0 and (self.round, self.phase_index) != phase:
+                # Index every phase start; a new round also gets a keyframe to seek from
+                keyframe = self.export_state() if PHASES[self.phase_index] == "Auction" else None
+                journal.phase_started(self.round, PHASES[self.phase_index], keyframe)
+
+    def run_action(self, action):
+        if not action.undoable:
+            return action.apply(self)
+
+        self.history.begin()
+        try:
+            return action.apply(self)
+        finally:
+            self.history.commit(action.name)
+
+    def run_batch(self, actions):
+        self.events.hold()
+        discard = True
+        try:
+            results = []
+            for i, action in enumerate(actions):
+                result = self.run_action(action)
+                if failed(result):
+                    self.history.rollback()
+                    self.invalidate_storage()
+                    return {"success": False, "index": i, "action": action.name, "result": result}
+                results.append(result)
+            discard = False
+            return {"success": True, "results": results}
+        except Exception:
+            self.history.rollback()
+            self.invalidate_storage()
+            raise
+        finally:
+            # A rolled back batch never reaches the view
+            self.events.release(discard=discard)
+
+    def undo(self):
+        label = self.history.undo()
+        if label is None:
+            return {"success": False, "message": "Nothing to undo."}
+        self.on_state_restored()
+        return {"success": True, "action": label}
+
+    def redo(self):
+        label = self.history.redo()
+        if label is None:
+            return {"success": False, "message": "Nothing to redo."}
+        self.on_state_restored()
+        return {"success": True, "action": label}
+
+    def request_decision(self, request, default, **kwargs):
+        """Ask the players for a decision through the event bus and journal the answer."""
+        value = self.events.request(request, default=default, **kwargs)
+        if self.journal is not None:
+            self.journal.decide(request, value)
+        return value
+
+    def state_digest(self):
+        """Short fingerprint of the whole game state, used to verify replays."""
+        state = (
+            self.step, self.phase_index, self.round, self.current_player_index, self.game_over,
+            self.winner.name if self.winner else None,
+            [
+                (
+                    player.name, player.color, player.money, player.cities, player.money_to_pay,
+                    player.phase_completed, player.cities_powered, list(player.left_resources_from_removed_pp.items()),
+                    [
+                        (card_id, list(owned_pp.resources_on_card.items()), list(owned_pp.resources_to_purchase.items()),
+                         list(owned_pp.resources_to_power.items()), list(owned_pp.resources_on_hold.items()))
+                        for card_id, owned_pp in player.owned_power_plants.items()
+                    ],
+                )
+                for player in self.players
+            ],
+            self.power_plant_market.current_market, self.deck.stack_card_ids,
+            sorted(self.resources.available.items()), sorted(self.resources.remaining_resources.items()),
+            sorted(self.cities.built_cities.items()), sorted(self.occupied_regions),
+        )
+        return hashlib.sha1(repr(state).encode()).hexdigest()
 
-        elif action == "put_back_res_to_left_over":
-            return self.put_back_res_to_left_over(kwargs["player"], kwargs["card_id"], kwargs["res_type"])
-        
-        elif action == "add_res_to_power":
-            return self.add_res_to_power(kwargs["card_id"], kwargs["res_type"])
-        
-        elif action == "remove_res_from_power":
-            return self.remove_res_from_power(kwargs["card_id"], kwargs["res_type"])
-        
-        elif action == "can_build_house":
-            return self.can_build_house(kwargs["city_name"])
-        
-        elif action == "build_house":
-            self.build_house(kwargs["city_name"], kwargs["cost"])
-        
-        elif action == "generate_power":
-            return self.generate_power()
-        
-        elif action == "get_valid_cards_for_resource_move":
-            return self.get_valid_cards_for_resource_move(kwargs["player"], kwargs["card_id"], kwargs["res_type"])
-        elif action == "execute_move_resource":
-            return self.execute_move_resource(kwargs["player"], kwargs["source_card_id"], kwargs["target_card_id"], kwargs["res_type"])
+    def close_journal(self):
+        if self.journal is not None:
+            self.journal.checkpoint(self.state_digest())
+            self.journal.close()
+            self.journal = None
+
+    def on_state_restored(self):
+        self.invalidate_storage()
+        self.events.emit("state_restored", game_state=self.get_game_state())
+        self.notify_build_costs()
 
     def sort_players(self):
         if self.round == 1 and PHASES[self.phase_index] == "Auction":
-            random.shuffle(self.players)
+            self.rng.shuffle(self.players)
         else:
-            self.players.sort(
-                key=lambda player: (
-                    -len(player.cities),
-                    -max(
-                        [int(card_id) for card_id in player.owned_power_plants.keys()]
-                    ),
-                )
-            )
+            # Most cities first, ties broken by the highest power plant; the sort is stable
+            self.players.sort(key=attrgetter("order_key"), reverse=True)
 
     def get_game_state(self):
         game_state = {
@@ -249,43 +680,80 @@ class Game:
         return game_state
 
     def start_auction(self, card_id, card_image_tk):
+        if card_id not in self.power_plant_market.current_cards():
+            return False, f"Power plant {card_id} is not in the current market."
+        self.history.remember(self, "auction_logic")
         auction_players = [
             player for player in self.players if not player.phase_completed
         ]
         self.auction_logic = AuctionLogic(card_id, auction_players, self.on_auction_end)
-        self.auction_ui = AuctionUI(self.ui.root, self.auction_logic, card_image_tk)
+        self.events.emit("auction_started", auction_logic=self.auction_logic, card_image_tk=card_image_tk)
 
-    def on_auction_end(self, winner, card_id, final_bid):
-        # Close the auction window
-        self.auction_ui.close_window()
+    def submit_bid(self, bid_amount):
+        self.remember_auction()
+        return self.auction_logic.submit_bid(bid_amount)
+
+    def pass_bid(self):
+        self.remember_auction()
+        return self.auction_logic.pass_bid()
 
-        # Show a message box to announce the winner
-        message = f"{winner.name} won the auction for power plant {card_id} with a bid of {final_bid}."
-        messagebox.showinfo("Auction Result", message)
+    def register_max_bid(self, player, max_bid):
+        self.remember_auction()
+        return self.auction_logic.register_max_bid(player, max_bid)
+
+    def remember_auction(self):
+        self.history.remember(
+            self.auction_logic, "current_bid", "active_bidder_index", "passed_players", "high_bidder", "max_bids",
+            "initial_bid_submitted", "auction_ended",
+        )
 
+    def on_auction_end(self, winner, card_id, final_bid):
+        # AuctionLogic may also be driven directly, outside handle_action, so open a history entry here too
+        self.history.begin()
+        try:
+            self.resolve_auction(winner, card_id, final_bid)
+        finally:
+            self.history.commit("auction_end")
+
+    def resolve_auction(self, winner, card_id, final_bid):
+        # Let the view close the auction window and announce the winner
+        self.events.emit("auction_ended", winner=winner, card_id=card_id, final_bid=final_bid)
+
+        self.history.remember(
+            winner, "money", "owned_power_plants", "left_resources_from_removed_pp", "phase_completed", "order_key"
+        )
         winner.money -= final_bid
         card_obj = self.deck.cards.get(card_id)
         new_owned_pp = OwnedPowerPlant(card_obj)
         # Add the new owned power plant first
         winner.owned_power_plants[card_id] = new_owned_pp
+        winner.order_key = (winner.order_key[0], max(winner.order_key[1], card_obj.number))
+        self.invalidate_storage(winner)
 
         need_to_allocate_resources = False
         if len(winner.owned_power_plants) > 3:
-            power_plant_to_remove = self.ui.show_power_plant_removal_menu(
-                [cp for cp in list(winner.owned_power_plants.keys()) if cp != card_id]
+            removable_ids = [cp for cp in list(winner.owned_power_plants.keys()) if cp != card_id]
+            power_plant_to_remove = self.request_decision(
+                "select_power_plant_to_remove",
+                default=min(removable_ids, key=CARD_NUMBERS.__getitem__),
+                player=winner,
+                power_plant_ids=removable_ids,
             )
             removed_pp = winner.owned_power_plants.pop(power_plant_to_remove)
+            if removed_pp.card.number == winner.order_key[1]:
+                winner.update_order_key()
+            self.invalidate_storage(winner)
             if sum(removed_pp.resources_on_card.values()) > 0:
-                # Move resources from the removed power plant to new_owned_pp if possible,
+                # Store the resources of the removed power plant on the remaining ones if they all fit,
                 # If not, leave them unallocated.
-                can_move_res_to_new_pp = self.can_move_resources_to_new_pp(new_owned_pp, removed_pp.resources_on_card)
+                can_move_res_to_new_pp = self.can_move_resources_to_new_pp(winner, removed_pp.resources_on_card)
 
                 print("CAN MOVE RES: ", can_move_res_to_new_pp)
                 if not can_move_res_to_new_pp:
                     need_to_allocate_resources = True
                     winner.left_resources_from_removed_pp = removed_pp.resources_on_card
-                    self.ui.update_player_info(winner, PHASES[self.phase_index])
-                    self.ui.update_player_control(winner)
+                    self.events.emit("player_changed", player=winner, phase=PHASES[self.phase_index])
+                    self.events.emit("player_control_changed", player=winner)
         
         self.remove_power_plant_from_market(card_id)
 
@@ -293,12 +761,14 @@ class Game:
             winner.phase_completed = True
 
             # Update the player info UI
-            self.ui.create_player_info(self.players, PHASES[self.phase_index])
+            self.events.emit("players_changed", players=self.players, phase=PHASES[self.phase_index])
 
             # Determine the next player to start the auction
             self.determine_next_player()
     
     def remove_power_plant_from_market(self, card_id):
+        self.history.remember(self.power_plant_market, "current_market", "current_size")
+        self.history.remember(self.deck, "draw_pile")
         # Remove the purchased power plant from the market
         self.power_plant_market.remove_card_from_market(card_id)
 
@@ -311,15 +781,17 @@ class Game:
             pass  # Placeholder
 
         # Update the power plant market UI
-        self.ui.create_power_plant_market(self.step, self.power_plant_market.current_market)
+        self.events.emit(
+            "market_changed", step=self.step, power_plants_market=self.power_plant_market.current_market
+        )
         
 
     def determine_next_player(self):
         print("next player")
         if not self.players[self.current_player_index].phase_completed:
-            self.ui.update_player_control()
-            pass
+            self.events.emit("player_control_changed")
         else:
+            self.history.remember(self, "current_player_index")
             while self.current_player_index < len(self.players):
                 if self.players[self.current_player_index].phase_completed:
                     self.current_player_index += 1
@@ -330,87 +802,85 @@ class Game:
             if self.current_player_index >= len(self.players):
                 self.next_phase()
             else:
-                self.ui.update_status(
-                    PHASES[self.phase_index],
-                    self.players[self.current_player_index].name,
+                self.events.emit(
+                    "status_changed",
+                    phase_name=PHASES[self.phase_index],
+                    current_player_name=self.players[self.current_player_index].name,
                 )
-                self.ui.update_player_control()
+                self.events.emit("player_control_changed")
+                self.notify_build_costs()
 
     def player_pass(self):
+        self.history.remember(self.players[self.current_player_index], "phase_completed")
         self.players[self.current_player_index].phase_completed = True
         self.determine_next_player()
 
-    def can_hold_resource(self, owned_pp, res_type):
-        card_type = owned_pp.card.card_type
-        phase = PHASES[self.phase_index]
+    def storage_index(self, player):
+        """
+        The player's StorageIndex. It is rebuilt when the player's power plants were
+        replaced wholesale or the index was invalidated, e.g. by an undo.
+        """
+        if player.storage is None or player.storage.plants is not player.owned_power_plants:
+            player.storage = StorageIndex(player.owned_power_plants)
+        return player.storage
 
-        if card_type == "renewable":
-            return False
-        if card_type == "hybrid":
-            if res_type not in ["coal", "oil"]:
-                return False
-        else:
-            if card_type != res_type:
-                return False
+    def update_storage(self, player, card_id, used):
+        """Count `used` more stored tokens (fewer when negative) on a plant; a stale index is rebuilt later anyway."""
+        storage = player.storage
+        if storage is not None and storage.plants is player.owned_power_plants:
+            storage.take(card_id, used)
+
+    def invalidate_storage(self, player=None):
+        for stale in [player] if player else self.players:
+            stale.storage = None
+
+    def can_hold_resource(self, player, card_id, res_type):
+        return self.storage_index(player).can_hold(card_id, res_type)
 
-        cur_token_num = sum(owned_pp.resources_on_card.values())
-        if phase == "Resources":
-            purchase_token_num = sum(owned_pp.resources_to_purchase.values())
-        else:
-            # this is the case when the player is in the auction phase and has not confirmed left-over resource allocation   
-            purchase_token_num = sum(owned_pp.resources_on_hold.values())
-        
-        print(
-            f"cur_token_num: {cur_token_num}, purchase_token_num: {purchase_token_num}, resource_number: {owned_pp.card.resource_number}")
-        if cur_token_num + purchase_token_num < 2 * owned_pp.card.resource_number:
-            return True
-        return False
-    
     def get_possible_pp_for_left_res(self, player, res_type):
-        candidates = []
-        for card_id, owned_pp in player.owned_power_plants.items():
-            if self.can_hold_resource(owned_pp, res_type):
-                candidates.append(card_id)
-        
-        return candidates
+        return self.storage_index(player).cards_for(res_type)
 
-    def can_move_resources_to_new_pp(self, new_owned_pp, removed_resources):
+    def can_move_resources_to_new_pp(self, player, removed_resources):
         """
-        Attempts to move resource tokens from removed_resources to new_owned_pp.
-        If True, also move the resources to new_owned_pp.
+        Attempts to store the tokens of removed_resources on the player's power
+        plants, moving stored tokens between plants to make room. If every token
+        fits, also store them.
         """
-        if new_owned_pp.card.card_type == "renewable":
-            return False
-
-        if len(removed_resources) > 1 and new_owned_pp.card.card_type != "hybrid":
+        placement, dropped = self.plan_storage(player, removed_resources)
+        if any(dropped):
             return False
+        self.apply_storage(player, placement)
+        return True
 
-        if len(removed_resources) > 1 and sum(removed_resources.values()) > 2 * new_owned_pp.card.resource_number:
-            return False
-        
-        if len(removed_resources) ==1:
-            if new_owned_pp.card.card_type != "hybrid":
-                if next(iter(removed_resources.keys())) != new_owned_pp.card.card_type:
-                     return False
-            else:
-                if next(iter(removed_resources.keys())) not in ["coal", "oil"]:
-                    return False
+    def plan_storage(self, player, extra):
+        """
+        (card_id -> token counts, counts of tokens that do not fit) for the
+        redistribution of the player's stored tokens and the extra ones that keeps
+        the most, see logic/Storage.py. Tokens on hold count as stored.
+        """
+        plants = [
+            (card_id, storable_types(owned_pp.card), 2 * owned_pp.card.resource_number)
+            for card_id, owned_pp in player.owned_power_plants.items()
+        ]
+        placed = {
+            card_id: [on_card + on_hold for on_card, on_hold in zip(
+                owned_pp.resources_on_card.counts, owned_pp.resources_on_hold.counts
+            )]
+            for card_id, owned_pp in player.owned_power_plants.items()
+        }
+        return store_tokens(plants, placed, extra.counts)
 
-        if len(removed_resources) ==1 and next(iter(removed_resources.values())) > 2 * new_owned_pp.card.resource_number:
-            return False
-        
-        for res, count in removed_resources.items():
-            new_owned_pp.resources_on_card[res] = count
-    
-        return True
+    def apply_storage(self, player, placement):
+        for card_id, counts in placement.items():
+            owned_pp = player.owned_power_plants[card_id]
+            self.history.remember(owned_pp, "resources_on_card", "resources_on_hold")
+            owned_pp.resources_on_card = ResourceCounts.from_list(counts)
+            owned_pp.resources_on_hold = ResourceCounts()
+        self.invalidate_storage(player)
 
     def get_valid_cards_for_res(self, res_type):
         current_player = self.players[self.current_player_index]
-        valid_cards = []
-        for card_id, owned_pp in current_player.owned_power_plants.items():
-            if self.can_hold_resource(owned_pp, res_type):
-                valid_cards.append(card_id)
-        return valid_cards
+        return self.storage_index(current_player).cards_for(res_type)
 
     def add_res_to_purchase(self, res_type, cost):
         current_player = self.players[self.current_player_index]
@@ -428,22 +898,31 @@ class Game:
         if len(valid_cards) == 1:
             card_id = valid_cards[0]
         else:
-            # More than one valid card: ask the UI to display a selection menu.
-            card_id = self.ui.show_power_plant_selection_menu(
-                valid_cards, res_type, cost
+            # More than one valid card: ask the view to display a selection menu.
+            card_id = self.request_decision(
+                "select_power_plant_for_resource",
+                default=valid_cards[0],
+                player=current_player,
+                valid_cards=valid_cards,
+                res_type=res_type,
+                cost=cost,
             )
             if not card_id:
                 return {"success": False, "message": "No power plant selected."}
 
         owned_pp = current_player.owned_power_plants[card_id]
+        self.history.remember(owned_pp, "resources_to_purchase")
+        self.history.remember(current_player, "money_to_pay")
+        self.history.remember(self.resources, "available")
         owned_pp.resources_to_purchase[res_type] = (
             owned_pp.resources_to_purchase.get(res_type, 0) + 1
         )
+        self.update_storage(current_player, card_id, 1)
         current_player.money_to_pay += cost
         if self.resources.remove_left_most_resources(res_type):
-            self.ui.load_resources(self.resources.cur_resources)
-            self.ui.update_player_info(current_player, PHASES[self.phase_index])
-            self.ui.update_player_control()
+            self.events.emit("resource_market_changed", resources=self.resources)
+            self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
+            self.events.emit("player_control_changed")
 
             return {"success": True}
         else:
@@ -460,15 +939,19 @@ class Game:
                 "message": f"No {res_type} resource in purchase list.",
             }
 
+        self.history.remember(owned_pp, "resources_to_purchase")
+        self.history.remember(current_player, "money_to_pay")
+        self.history.remember(self.resources, "available")
         # Retrieve the cost of the token being put back.
         cost = self.resources.add_back_left_most_resource(res_type)
         if cost > 0:
             owned_pp.resources_to_purchase[res_type] -= 1
+            self.update_storage(current_player, card_id, -1)
             current_player.money_to_pay -= cost
 
-            self.ui.load_resources(self.resources.cur_resources)
-            self.ui.update_player_info(current_player, PHASES[self.phase_index])
-            self.ui.update_player_control()
+            self.events.emit("resource_market_changed", resources=self.resources)
+            self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
+            self.events.emit("player_control_changed")
             return {"success": True}
         else:
             return {"success": False, "message": "Could not add resource back to market."}
@@ -483,9 +966,12 @@ class Game:
                 "message": f"No {res_type} resource on hold for this card {card_id}.",
             }
     
+        self.history.remember(owned_pp, "resources_on_hold")
+        self.history.remember(player, "left_resources_from_removed_pp")
         owned_pp.resources_on_hold[res_type] -= 1
+        self.update_storage(player, card_id, -1)
         player.left_resources_from_removed_pp[res_type] = player.left_resources_from_removed_pp.get(res_type, 0) + 1
-        self.ui.update_player_info(player, PHASES[self.phase_index])
+        self.events.emit("player_changed", player=player, phase=PHASES[self.phase_index])
 
         return {"success": True}
     
@@ -500,11 +986,13 @@ class Game:
                 "message": f"No {res_type} resource on card.",
             }
         
+        self.history.remember(owned_pp, "resources_on_card", "resources_to_power")
         owned_pp.resources_on_card[res_type] -= 1
         owned_pp.resources_to_power[res_type] = (
             owned_pp.resources_to_power.get(res_type, 0) + 1
         )
-        self.ui.update_player_info(current_player, PHASES[self.phase_index])
+        self.update_storage(current_player, card_id, -1)
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
         return {"success": True}
 
     def remove_res_from_power(self, card_id, res_type):
@@ -519,13 +1007,42 @@ class Game:
                 "message": f"No {res_type} resource in power list.",
             }
         
+        self.history.remember(owned_pp, "resources_on_card", "resources_to_power")
         owned_pp.resources_to_power[res_type] -= 1
         owned_pp.resources_on_card[res_type] = (
             owned_pp.resources_on_card.get(res_type, 0) + 1
         )
-        self.ui.update_player_info(current_player, PHASES[self.phase_index])
+        self.update_storage(current_player, card_id, 1)
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
         return {"success": True}
 
+    def get_power_plan(self, player=None):
+        """
+        (cities powered, [(card_id, res_type), ...]) for the tokens that power the
+        most of the player's cities at the lowest token cost, see logic/Power.py.
+        """
+        player = player or self.players[self.current_player_index]
+        plants = tuple(plant_key(owned_pp) for owned_pp in player.owned_power_plants.values())
+        powered, tokens = plan_power(plants, len(player.cities), token_prices(self.resources))
+        return powered, list(tokens)
+
+    def allocate_power(self):
+        """Put the tokens of the current player's power plan into power, replacing any picked by hand."""
+        current_player = self.players[self.current_player_index]
+        powered, tokens = self.get_power_plan(current_player)
+        for owned_pp in current_player.owned_power_plants.values():
+            self.history.remember(owned_pp, "resources_on_card", "resources_to_power")
+            for res_type, amount in owned_pp.resources_to_power.items():
+                owned_pp.resources_on_card[res_type] += amount
+            owned_pp.resources_to_power.clear()
+        for card_id, res_type in tokens:
+            owned_pp = current_player.owned_power_plants[card_id]
+            owned_pp.resources_on_card[res_type] -= 1
+            owned_pp.resources_to_power[res_type] += 1
+        self.invalidate_storage(current_player)
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
+        return {"success": True, "cities_powered": powered, "tokens": tokens}
+
     def add_left_over_res_on_hold(self, player, card_id, res_type):
         print(f"left resources: {player.left_resources_from_removed_pp}")
 
@@ -535,80 +1052,101 @@ class Game:
         if player.left_resources_from_removed_pp[res_type] < 0:
             return False
 
+        self.history.remember(owned_pp, "resources_on_hold")
+        self.history.remember(player, "left_resources_from_removed_pp")
         player.left_resources_from_removed_pp[res_type] -= 1
         owned_pp.resources_on_hold[res_type] = owned_pp.resources_on_hold.get(res_type, 0) + 1
+        self.update_storage(player, card_id, 1)
 
-        self.ui.update_player_info(player, PHASES[self.phase_index])
+        self.events.emit("player_changed", player=player, phase=PHASES[self.phase_index])
 
         return True
 
     def confirm_purchase(self):
         current_player = self.players[self.current_player_index]
 
+        self.history.remember(current_player, "money", "money_to_pay", "phase_completed")
         for card_id, owned_pp in current_player.owned_power_plants.items():
+            self.history.remember(owned_pp, "resources_on_card", "resources_to_purchase")
             # For each resource type, move resources from resources_to_purchase to resources_on_card
             for res_type, purchase_amount in owned_pp.resources_to_purchase.items():
                 owned_pp.resources_on_card[res_type] = (
                     owned_pp.resources_on_card.get(res_type, 0) + purchase_amount
                 )
-            owned_pp.resources_to_purchase = {}
+            owned_pp.resources_to_purchase.clear()
 
         current_player.money -= current_player.money_to_pay
         current_player.money_to_pay = 0
-        self.ui.update_player_info(current_player, PHASES[self.phase_index])
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
         current_player.phase_completed = True
         self.determine_next_player()
     
+    def auto_allocate_left_over_res(self, player):
+        """
+        Place the player's left-over tokens in one step: the redistribution that
+        keeps the most tokens replaces any placed by hand, then the allocation is
+        confirmed. Tokens that do not fit are discarded.
+        """
+        if not player.left_resources_from_removed_pp:
+            return {"success": False, "message": "No resources left to allocate."}
+        placement, dropped = self.plan_storage(player, player.left_resources_from_removed_pp)
+        self.apply_storage(player, placement)
+        self.confirm_left_over_res_allocation(player)
+        return {"success": True, "discarded": dict(ResourceCounts.from_list(dropped).items())}
+
     def confirm_left_over_res_allocation(self, player):
+        self.history.remember(player, "left_resources_from_removed_pp", "phase_completed")
         for owned_pp in player.owned_power_plants.values():
+            self.history.remember(owned_pp, "resources_on_card", "resources_on_hold")
             for res_type, amount in owned_pp.resources_on_hold.items():
                 if amount > 0:
                     owned_pp.resources_on_card[res_type] = owned_pp.resources_on_card.get(res_type, 0) + amount
-            owned_pp.resources_on_hold = {}
+            owned_pp.resources_on_hold.clear()
         
-        player.left_resources_from_removed_pp = {}
+        player.left_resources_from_removed_pp = ResourceCounts()
 
         player.phase_completed = True
         
-        self.ui.create_player_info(self.players, PHASES[self.phase_index])
+        self.events.emit("players_changed", players=self.players, phase=PHASES[self.phase_index])
         self.determine_next_player()
         
 
-    def can_build_house(self, city_name):
-        current_player = self.players[self.current_player_index]
+    def check_build_rules(self, player, city_name):
+        """
+        Return the reason player may not build in city_name regardless of money,
+        or None when the city is open to the player.
+        """
         # Region‐limit check
         region = CITIES[city_name]["region"]
+        if self.cities.regions and region not in self.cities.regions:
+            return f"Cannot build a house in region {region!r}: it is not played in this game"
         is_new_region = region not in self.occupied_regions
         if is_new_region and len(self.occupied_regions) + 1 > self.max_regions:
-            return {
-                "success": False,
-                "message": f"Cannot build a house in region {region!r}: limit is {self.max_regions}",
-            }
+            return f"Cannot build a house in region {region!r}: limit is {self.max_regions}"
 
-        if city_name in current_player.cities:
-            return {
-                "success": False,
-                "message": f"You have built a house in {city_name}",
-            }
+        if city_name in player.cities:
+            return f"You have built a house in {city_name}"
 
         # Step limit check
         if len(self.cities.built_cities.get(city_name, [])) >= self.step:
-            return {
-                "success": False,
-                "message": f"Cannot build another house in {city_name} at current step",
-            }
+            return f"Cannot build another house in {city_name} at current step"
 
         # Zero‐cost neighbor rule
         for neighbor, cost in CITIES[city_name]["neighbors"]:
-            if cost == 0 and neighbor in current_player.cities:
-                return {
-                    "success": False,
-                    "message": f"Cannot build in {city_name} because you have built in its 0‑cost neighbor {neighbor}",
-                }
+            if cost == 0 and neighbor in player.cities:
+                return f"Cannot build in {city_name} because you have built in its 0‑cost neighbor {neighbor}"
+
+        return None
+
+    def can_build_house(self, city_name):
+        current_player = self.players[self.current_player_index]
+        message = self.check_build_rules(current_player, city_name)
+        if message:
+            return {"success": False, "message": message}
             
         # Compute costs
         build_cost = self.cities.get_build_cost(city_name)
-        connection_cost = self.cities.get_connection_cost(city_name, current_player.cities)
+        connection_cost = current_player.network.get_connection_cost(city_name)
         total_cost = build_cost + connection_cost
 
         # Affordability
@@ -620,22 +1158,70 @@ class Game:
 
         return {"success": True, "cost": total_cost}
 
+    def get_build_costs(self, player=None):
+        """
+        Total cost (house plus connection) of every city player may build in, read
+        from the player's network frontier instead of one graph search per city.
+        """
+        player = player or self.players[self.current_player_index]
+        costs = {}
+        for city_name in CITIES:
+            if self.check_build_rules(player, city_name) is not None:
+                continue
+            connection_cost = player.network.get_connection_cost(city_name)
+            if connection_cost is not None:
+                costs[city_name] = self.cities.get_build_cost(city_name) + connection_cost
+        return costs
+
+    def plan_builds(self, count, player=None):
+        """
+        Cheapest legal way for player to build `count` more cities this turn with
+        their money: (total_cost, cities in build order), or None.
+        """
+        player = player or self.players[self.current_player_index]
+        candidates = [c for c in CITIES if self.check_build_rules(player, c) is None]
+        return self.cities.plan_builds(
+            player.cities,
+            player.money,
+            count,
+            candidates=candidates,
+            occupied_regions=self.occupied_regions,
+            max_regions=self.max_regions,
+        )
+
+    def notify_build_costs(self):
+        # Only the Houses phase shows the overlay; an empty dict clears it
+        if PHASES[self.phase_index] == "Houses":
+            player = self.players[self.current_player_index]
+            self.events.emit("build_costs_changed", costs=self.get_build_costs(player), money=player.money)
+        else:
+            self.events.emit("build_costs_changed", costs={}, money=0)
+
     def build_house(self, city_name, cost):
         current_player = self.players[self.current_player_index]
 
+        self.history.remember(current_player, "money", "cities", "network", "order_key")
+        self.history.remember(self, "occupied_regions")
+        self.history.remember_item(self.cities.built_cities, city_name)
         current_player.money -= cost
         current_player.cities.append(city_name)
+        current_player.order_key = (current_player.order_key[0] + 1, current_player.order_key[1])
+        current_player.network.add_city(city_name)
         self.occupied_regions.add(CITIES[city_name]["region"])
         if city_name in self.cities.built_cities:
             self.cities.built_cities[city_name].append(current_player.name)
         else:
             self.cities.built_cities[city_name] = [current_player.name]
         
-        self.ui.update_player_info(current_player, PHASES[self.phase_index])
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
         print(f"Built Citeis: {self.cities.built_cities}")
-        self.ui.add_house(
-            city_name, current_player.color, len(self.cities.built_cities[city_name])
+        self.events.emit(
+            "house_built",
+            city_name=city_name,
+            color=current_player.color,
+            house_index=len(self.cities.built_cities[city_name]),
         )
+        self.notify_build_costs()
     
     def generate_power(self):
         current_player = self.players[self.current_player_index]
@@ -648,21 +1234,24 @@ class Game:
                     return {"success": False, "message": f"Incorrect number of resources to power for power plant card: {owned_pp.card.card_id}"}
                 cities_can_power += owned_pp.card.cities_to_power
         
-        cities_can_power = min(cities_can_power, len(current_player.cities))
+        cities_can_power = min(cities_can_power, len(current_player.cities), max(CITIES_TO_CASH))
+        self.history.remember(current_player, "money", "cities_powered")
+        self.history.remember(self.resources, "remaining_resources")
+        for owned_pp in current_player.owned_power_plants.values():
+            self.history.remember(owned_pp, "resources_to_power")
         cash = CITIES_TO_CASH[cities_can_power]
+        current_player.cities_powered = cities_can_power
         self.resources.return_resources_to_remaining(current_player.owned_power_plants)
         current_player.money += cash
-        self.ui.update_player_info(current_player, PHASES[self.phase_index])
+        self.events.emit("player_changed", player=current_player, phase=PHASES[self.phase_index])
         print(f'remaining resources: {self.resources.remaining_resources}')
-        self.ui.update_resource_section(self.resources.remaining_resources)
+        self.events.emit("remaining_resources_changed", remaining_resources=self.resources.remaining_resources)
         self.player_pass()
 
         return {"success": True, "message": f"Generated {cash} cash from {cities_can_power} cities"}
 
     def get_valid_cards_for_resource_move(self, player, source_card_id, res_type):
-        valid = [cid for cid, pp in player.owned_power_plants.items() 
-                 if cid != source_card_id and self.can_hold_resource(pp, res_type)]
-        return valid
+        return [card_id for card_id in self.storage_index(player).cards_for(res_type) if card_id != source_card_id]
 
     def execute_move_resource(self, player, source_card_id, target_card_id, res_type):
         source_pp = player.owned_power_plants.get(source_card_id)
@@ -671,13 +1260,148 @@ class Game:
             return {"success": False, "message": "Power plant not found."}
         if source_pp.resources_on_card.get(res_type, 0) <= 0:
             return {"success": False, "message": "No resource to move."}
+        self.history.remember(source_pp, "resources_on_card")
+        self.history.remember(target_pp, "resources_on_card")
         source_pp.resources_on_card[res_type] -= 1
         target_pp.resources_on_card[res_type] = target_pp.resources_on_card.get(res_type, 0) + 1
-        self.ui.update_player_info(player, PHASES[self.phase_index])
+        self.update_storage(player, source_card_id, -1)
+        self.update_storage(player, target_card_id, 1)
+        self.events.emit("player_changed", player=player, phase=PHASES[self.phase_index])
         return {"success": True}
 
+    def free_storage(self, player):
+        """
+        card_id -> number of tokens the power plant can still take, counting the
+        tokens being bought or placed after an auction, as can_hold_resource does.
+        """
+        return dict(self.storage_index(player).free)
+
+    def get_decision_player(self):
+        """The player who has to act next: the active bidder, a player placing left-over tokens or the current player."""
+        auction = self.auction_logic
+        if auction and not auction.auction_ended:
+            return auction.players[auction.active_bidder_index]
+        for player in self.players:
+            if player.left_resources_from_removed_pp:
+                return player
+        return self.players[self.current_player_index]
+
+    def get_legal_actions(self):
+        """
+        Every action the player whose decision is pending may take right now, as
+        Action objects ready for apply_action. Storage space is computed once per
+        plant and building costs come from the network frontier, so no rule
+        predicate is evaluated per candidate.
+        """
+        if self.game_over:
+            return []
+        phase = PHASES[self.phase_index]
+
+        auction = self.auction_logic
+        if auction and not auction.auction_ended:
+            bidder = self.get_decision_player()
+            actions = [SubmitBid(bid_amount=bid) for bid in range(auction.current_bid + 1, bidder.money + 1)]
+            if auction.initial_bid_submitted:
+                actions.append(PassBid())
+            return actions
+
+        # A player who won a plant over the limit first places the tokens of the discarded one
+        for player in self.players:
+            if player.left_resources_from_removed_pp:
+                return self.get_left_over_actions(player)
+
+        player = self.players[self.current_player_index]
+        if phase == "Auction":
+            actions = [
+                StartAuction(card_id=card_id)
+                for card_id in self.power_plant_market.current_cards()
+                if CARD_NUMBERS[card_id] <= player.money
+            ]
+            if self.round > 1:
+                actions.append(PlayerPass())
+            return actions
+
+        if phase == "Resources":
+            actions = []
+            storage = self.storage_index(player)
+            for res_type in ("coal", "oil", "trash", "uranium"):
+                cost = self.resources.get_next_cost(res_type)
+                if cost is None or player.money_to_pay + cost > player.money:
+                    continue
+                if storage.room(res_type) > 0:
+                    actions.append(AddResToPurchase(res_type=res_type, cost=cost))
+            for card_id, owned_pp in player.owned_power_plants.items():
+                for res_type in owned_pp.resources_to_purchase.keys():
+                    actions.append(PutBackResToPurchase(card_id=card_id, res_type=res_type))
+            actions.append(PurchaseResources() if player.money_to_pay > 0 else PlayerPass())
+            return actions + self.get_resource_moves(player)
+
+        if phase == "Houses":
+            actions = [
+                BuildHouse(city_name=city_name, cost=cost)
+                for city_name, cost in self.get_build_costs(player).items()
+                if cost <= player.money
+            ]
+            actions.append(PlayerPass())
+            return actions
+
+        # Bureaucracy
+        actions = []
+        can_generate = True
+        for card_id, owned_pp in player.owned_power_plants.items():
+            to_power = owned_pp.resources_to_power.total()
+            if to_power and to_power != owned_pp.card.resource_number:
+                can_generate = False
+            if to_power < owned_pp.card.resource_number:
+                for res_type in owned_pp.resources_on_card.keys():
+                    actions.append(AddResToPower(card_id=card_id, res_type=res_type))
+            for res_type in owned_pp.resources_to_power.keys():
+                actions.append(RemoveResFromPower(card_id=card_id, res_type=res_type))
+        if can_generate:
+            actions.append(GeneratePower())
+        planned = sorted(self.get_power_plan(player)[1])
+        selected = sorted(
+            (card_id, res_type)
+            for card_id, owned_pp in player.owned_power_plants.items()
+            for res_type, amount in owned_pp.resources_to_power.items()
+            for _ in range(amount)
+        )
+        if planned != selected:
+            actions.append(AllocatePower())
+        return actions + self.get_resource_moves(player)
+
+    def get_left_over_actions(self, player):
+        free = self.free_storage(player)
+        actions = []
+        for res_type in player.left_resources_from_removed_pp.keys():
+            for card_id, space in free.items():
+                if space > 0 and res_type in storable_types(player.owned_power_plants[card_id].card):
+                    actions.append(AddLeftOverResOnHold(player=player, card_id=card_id, res_type=res_type))
+        for card_id, owned_pp in player.owned_power_plants.items():
+            for res_type in owned_pp.resources_on_hold.keys():
+                actions.append(PutBackResToLeftOver(player=player, card_id=card_id, res_type=res_type))
+        actions.append(ConfirmLeftOverResAllocation(player=player))
+        actions.append(AutoAllocateLeftOverRes(player=player))
+        return actions
+
+    def get_resource_moves(self, player):
+        """Moves of one stored token to another of the player's plants with room for it."""
+        free = self.free_storage(player)
+        moves = []
+        for source_card_id, source_pp in player.owned_power_plants.items():
+            for res_type in source_pp.resources_on_card.keys():
+                for target_card_id, space in free.items():
+                    if target_card_id != source_card_id and space > 0 and \
+                            res_type in storable_types(player.owned_power_plants[target_card_id].card):
+                        moves.append(ExecuteMoveResource(
+                            player=player, source_card_id=source_card_id, target_card_id=target_card_id, res_type=res_type
+                        ))
+        return moves
+
 
 if __name__ == "__main__":
+    import tkinter as tk
+
     root = tk.Tk()
     game = Game(root)
     # Print the game state to verify
@@ -0,0 +1,119 @@
+from collections import deque
+from logic.Resource import ResourceCounts
+
+MISSING = object()  # marks a mapping key that did not exist before an action
+
+
+def snapshot(value):
+    """Copy of a piece of mutable game state deep enough to survive later in-place edits."""
+    if isinstance(value, ResourceCounts):
+        return value.clone()
+    if isinstance(value, list):
+        return value[:]
+    if isinstance(value, set):
+        return set(value)
+    if isinstance(value, dict):
+        return {k: v[:] if isinstance(v, list) else v for k, v in value.items()}
+    if hasattr(value, 'add_city'):
+        # NetworkFrontier clones copy-on-write
+        return value.clone()
+    return value
+
+
+class History:
+    """
+    Undo/redo log of inverse deltas. While an action runs, the game calls
+    `remember(obj, *attrs)` / `remember_item(mapping, key)` before it changes
+    anything, and only the old values of what the action touches are stored.
+    Undo restores them (capturing the current values for redo) without ever
+    snapshotting the whole game.
+
+    max_depth caps how many actions can be undone; with 0 nothing is kept once
+    an action is done (a batch in progress can still be rolled back), which is
+    what headless bots and rollouts use.
+    """
+
+    def __init__(self, max_depth=None):
+        self.max_depth = max_depth
+        self.undo_stack = deque(maxlen=max_depth)  # (label, [delta, ...]), oldest dropped first
+        self.redo_stack = []
+        self.current = None   # deltas of the action being recorded, keyed to keep the oldest value
+        self.depth = 0
+
+    def begin(self):
+        self.depth += 1
+        if self.depth == 1:
+            self.current = {}
+
+    def commit(self, label):
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        deltas, self.current = self.current, None
+        if deltas:
+            self.undo_stack.append((label, list(deltas.values())))
+            self.redo_stack.clear()
+
+    def remember(self, obj, *attrs):
+        if self.current is None:
+            return
+        for attr in attrs:
+            key = (id(obj), attr)
+            if key not in self.current:
+                self.current[key] = ('attr', obj, attr, snapshot(getattr(obj, attr)))
+
+    def remember_item(self, mapping, item_key):
+        if self.current is None:
+            return
+        key = (id(mapping), 'item', item_key)
+        if key not in self.current:
+            self.current[key] = ('item', mapping, item_key, snapshot(mapping.get(item_key, MISSING)))
+
+    def rollback(self):
+        """Revert everything recorded so far for the action in progress and forget it."""
+        if self.current:
+            self._apply(list(self.current.values()))
+            self.current = {}
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def undo(self):
+        if not self.undo_stack:
+            return None
+        label, deltas = self.undo_stack.pop()
+        self.redo_stack.append((label, self._apply(deltas)))
+        return label
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        label, deltas = self.redo_stack.pop()
+        self.undo_stack.append((label, self._apply(deltas)))
+        return label
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def _apply(self, deltas):
+        """Restore the given values and return the inverse deltas."""
+        inverse = []
+        for kind, target, key, value in reversed(deltas):
+            if kind == 'attr':
+                inverse.append((kind, target, key, snapshot(getattr(target, key))))
+                setattr(target, key, value)
+            else:
+                inverse.append((kind, target, key, snapshot(target.get(key, MISSING))))
+                if value is MISSING:
+                    target.pop(key, None)
+                else:
+                    target[key] = value
+        inverse.reverse()
+        return inverse
+
+    def __repr__(self):
+        return f"History(undo={len(self.undo_stack)}, redo={len(self.redo_stack)}, max_depth={self.max_depth})"
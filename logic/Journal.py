@@ -0,0 +1,109 @@
+import json
+
+JOURNAL_VERSION = 1
+
+
+class ActionJournal:
+    """
+    Append-only JSON-lines log of one game: a header with the seed and setup,
+    then one line per top-level action with the decisions the players made while
+    it ran, and checkpoints carrying a digest of the state at that point.
+    Every line is flushed as soon as it is written so a crashed game keeps its log.
+
+    Each round starts with a keyframe holding the full exported state, and the
+    index file next to the journal (path + ".idx") maps the start of every phase
+    to its byte offset and to the offset of the keyframe to replay it from.
+    """
+
+    def __init__(self, path, seed, regions=None, deck_order=None):
+        self.path = path
+        self.file = open(path, "wb")
+        self.index_file = open(index_path(path), "w")
+        self.offset = 0
+        self.keyframe_offset = None
+        self.depth = 0
+        self.decisions = []
+        self.action_count = 0
+        self.write({
+            "type": "header",
+            "version": JOURNAL_VERSION,
+            "seed": seed,
+            "regions": sorted(regions) if regions else None,
+            "deck": list(deck_order) if deck_order is not None else None,
+        })
+
+    def write(self, entry):
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode()
+        self.file.write(line)
+        self.file.flush()
+        self.offset += len(line)
+
+    def begin(self):
+        self.depth += 1
+
+    def decide(self, request, value):
+        self.decisions.append([request, value])
+
+    def commit(self, action, kwargs):
+        # Actions triggered from inside another action are replayed by their parent
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        entry = {"type": "action", "action": action, "kwargs": kwargs}
+        if self.decisions:
+            entry["decisions"] = self.decisions
+            self.decisions = []
+        self.write(entry)
+        self.action_count += 1
+
+    def phase_started(self, round, phase, state=None):
+        """
+        Index the phase that starts with the next action; with the exported game
+        state also write a keyframe that seeking can resume from.
+        """
+        if state is not None:
+            self.keyframe_offset = self.offset
+            self.write({"type": "keyframe", "round": round, "phase": phase, "actions": self.action_count, "state": state})
+        entry = {
+            "round": round,
+            "phase": phase,
+            "offset": self.offset,
+            "keyframe": self.keyframe_offset,
+            "actions": self.action_count,
+        }
+        self.index_file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.index_file.flush()
+
+    def checkpoint(self, digest):
+        self.write({"type": "checkpoint", "actions": self.action_count, "digest": digest})
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            self.index_file.close()
+
+    def __repr__(self):
+        return f"ActionJournal({self.path!r}, actions={self.action_count})"
+
+
+def index_path(path):
+    return path + ".idx"
+
+
+def read_index(path):
+    """(round, phase) -> index entry of the journal at path; a phase reached again after an undo keeps its latest start."""
+    with open(index_path(path)) as index_file:
+        entries = [json.loads(line) for line in index_file if line.strip()]
+    return {(entry["round"], entry["phase"]): entry for entry in entries}
+
+
+def read_journal(path):
+    """(header, entries) of a journal written by ActionJournal."""
+    with open(path) as journal_file:
+        entries = [json.loads(line) for line in journal_file if line.strip()]
+    if not entries or entries[0].get("type") != "header":
+        raise ValueError(f"{path} is not a game journal")
+    header = entries[0]
+    if header["version"] != JOURNAL_VERSION:
+        raise ValueError(f"Unsupported journal version {header['version']}")
+    return header, entries[1:]
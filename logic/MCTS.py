@@ -0,0 +1,228 @@
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from logic.Actions import (
+    AddResToPower, ApplyActions, BuildHouse, ExecuteMoveResource, GeneratePower, PutBackResToLeftOver,
+    PutBackResToPurchase, RemoveResFromPower, SubmitBid,
+)
+from logic.Game import Game
+
+# Actions that only take back an earlier step; leaving them out of the search keeps it from going in circles
+REVERSIBLE = (PutBackResToPurchase, PutBackResToLeftOver, RemoveResFromPower, ExecuteMoveResource)
+BID_STEPS = (1, 3, 8)       # raises over the current bid the search tries
+MAX_CITY_OPTIONS = 6        # cheapest cities the search considers per build
+
+
+def action_key(action):
+    return action.name, json.dumps(action.encode(), sort_keys=True)
+
+
+def fire_plants(game, player):
+    """Batch that fires the plants of the player's power plan, then generates power."""
+    batch = [AddResToPower(card_id=card_id, res_type=res_type) for card_id, res_type in game.get_power_plan(player)[1]]
+    return ApplyActions(batch=batch + [GeneratePower()])
+
+
+def candidate_actions(game):
+    """The legal actions worth searching: no take-backs, a few bid levels and the cheapest cities."""
+    actions = [action for action in game.get_legal_actions() if not isinstance(action, REVERSIBLE)]
+    if any(isinstance(action, GeneratePower) for action in actions) or \
+            any(isinstance(action, AddResToPower) for action in actions):
+        # Bureaucracy: follow the power plan, or keep the tokens
+        player = game.players[game.current_player_index]
+        return [fire_plants(game, player), GeneratePower()]
+
+    bids = [action for action in actions if isinstance(action, SubmitBid)]
+    if bids:
+        lowest = bids[0].bid_amount
+        keep = {lowest + step - 1 for step in BID_STEPS}
+        actions = [action for action in actions if not isinstance(action, SubmitBid) or action.bid_amount in keep]
+
+    builds = sorted((action for action in actions if isinstance(action, BuildHouse)), key=lambda action: action.cost)
+    if len(builds) > MAX_CITY_OPTIONS:
+        dropped = set(id(action) for action in builds[MAX_CITY_OPTIONS:])
+        actions = [action for action in actions if id(action) not in dropped]
+    return actions
+
+
+def evaluate(game):
+    """
+    Reward in [0, 1] for every player: 1 for the winner of a finished game,
+    otherwise the player's place between the weakest (0) and the strongest (1)
+    position by cities, cities the plants can supply and money.
+    """
+    if game.game_over:
+        return {player.name: float(player is game.winner) for player in game.players}
+    scores = {}
+    for player in game.players:
+        capacity = sum(owned_pp.card.cities_to_power for owned_pp in player.owned_power_plants.values())
+        scores[player.name] = 10 * min(len(player.cities), capacity) + 3 * len(player.cities) + player.money / 5
+    low, high = min(scores.values()), max(scores.values())
+    if high == low:
+        return dict.fromkeys(scores, 0.5)
+    return {name: (score - low) / (high - low) for name, score in scores.items()}
+
+
+def determinize(game, rng):
+    # The order of the draw stack is hidden; every iteration samples one (step 3 stays at the bottom)
+    pile = game.deck.draw_pile
+    bottom = 1 if pile and pile[0] == "step3" else 0
+    stack = pile[bottom:]
+    rng.shuffle(stack)
+    game.deck.draw_pile = pile[:bottom] + stack
+
+
+class Node:
+    __slots__ = ("player", "action", "visits", "value", "children")
+
+    def __init__(self, player=None, action=None):
+        self.player = player    # name of the player whose choice led here
+        self.action = action
+        self.visits = 0
+        self.value = 0.0
+        self.children = {}      # action key -> Node
+
+
+class TreeSearch:
+    """
+    Monte Carlo tree search over the live rules engine. Every iteration works on a
+    clone with a freshly sampled deck: it walks the tree with UCT among the
+    actions legal in that sample, expands one new action, plays random candidate
+    actions until `rollout_rounds` rounds later and backs up evaluate().
+    """
+
+    def __init__(self, game, seed=None, exploration=1.4, rollout_rounds=1, max_rollout_actions=400):
+        self.game = game
+        self.rng = random.Random(seed)
+        self.exploration = exploration
+        self.rollout_rounds = rollout_rounds
+        self.max_rollout_actions = max_rollout_actions
+        self.root = Node()
+
+    def run(self, time_budget, max_iterations=None):
+        deadline = time.perf_counter() + time_budget
+        iterations = 0
+        # The engine still logs to stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            while time.perf_counter() < deadline and (max_iterations is None or iterations < max_iterations):
+                self.iterate()
+                iterations += 1
+        return iterations
+
+    def iterate(self):
+        game = self.game.clone(undo_depth=0)
+        determinize(game, self.rng)
+        node, path = self.root, [self.root]
+        while not game.game_over:
+            actions = {action_key(action): action for action in candidate_actions(game)}
+            if not actions:
+                break
+            player = game.get_decision_player().name
+            untried = [key for key in actions if key not in node.children]
+            if untried:
+                key = self.rng.choice(untried)
+                node.children[key] = Node(player, actions[key])
+                game.apply_action(actions[key])
+                path.append(node.children[key])
+                break
+            key = self.select(node, actions)
+            game.apply_action(actions[key])
+            node = node.children[key]
+            path.append(node)
+
+        self.rollout(game)
+        rewards = evaluate(game)
+        for node in path:
+            node.visits += 1
+            if node.player is not None:
+                node.value += rewards[node.player]
+
+    def select(self, node, actions):
+        log_visits = math.log(node.visits or 1)
+
+        def uct(key):
+            child = node.children[key]
+            return child.value / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+
+        return max(actions, key=uct)
+
+    def rollout(self, game):
+        last_round = game.round + self.rollout_rounds
+        for _ in range(self.max_rollout_actions):
+            if game.game_over or game.round > last_round:
+                return
+            actions = candidate_actions(game)
+            if not actions:
+                return
+            game.apply_action(self.rng.choice(actions))
+
+    def root_stats(self):
+        """action key -> [visits, value, action name, journaled fields], the form workers send back."""
+        return {
+            key: [child.visits, child.value, child.action.name, child.action.encode()]
+            for key, child in self.root.children.items()
+        }
+
+
+def search_worker(state, time_budget, seed, options):
+    """Entry point of a pool worker: rebuild the game from its exported state and search it."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(seed=state["seed"], regions=state["regions"], undo_depth=0)
+        game.restore_state(state)
+    search = TreeSearch(game, seed=seed, **options)
+    search.run(time_budget)
+    return search.root_stats()
+
+
+def merge_stats(results):
+    merged = {}
+    for stats in results:
+        for key, (visits, value, name, fields) in stats.items():
+            entry = merged.setdefault(key, [0, 0.0, name, fields])
+            entry[0] += visits
+            entry[1] += value
+    return merged
+
+
+class ParallelSearch:
+    """
+    Root-parallel MCTS: each pool worker grows its own tree from the same position
+    for the whole time budget and the root statistics are summed before the most
+    visited action is picked. The pool is kept between moves.
+    """
+
+    def __init__(self, workers=None, seed=None, **options):
+        self.workers = workers or os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.options = options
+        self.executor = None
+
+    def choose(self, game, time_budget):
+        """Best action for the pending decision, or None when nothing is legal."""
+        if self.workers == 1:
+            search = TreeSearch(game, seed=self.rng.randrange(2**32), **self.options)
+            search.run(time_budget)
+            stats = search.root_stats()
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            state = game.export_state()
+            futures = [
+                self.executor.submit(search_worker, state, time_budget, self.rng.randrange(2**32), self.options)
+                for _ in range(self.workers)
+            ]
+            stats = merge_stats(future.result() for future in futures)
+        if not stats:
+            return None
+        visits, value, name, fields = max(stats.values(), key=lambda entry: (entry[0], entry[1]))
+        return game.make_action(name, fields)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
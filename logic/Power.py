@@ -0,0 +1,81 @@
+from functools import lru_cache
+from itertools import combinations
+from logic.Resource import RESOURCE_INDEX, RESOURCE_TYPES, SLOT_COSTS
+from utils.constants import CITIES_TO_CASH
+
+MAX_POWERED_CITIES = max(CITIES_TO_CASH)
+
+
+def plant_key(owned_pp):
+    """
+    Hashable description of an owned power plant for plan_power: the card and
+    every token it could burn, counting tokens already moved into power.
+    """
+    card = owned_pp.card
+    tokens = tuple(
+        on_card + to_power
+        for on_card, to_power in zip(owned_pp.resources_on_card.counts, owned_pp.resources_to_power.counts)
+    )
+    return card.card_id, card.card_type, card.resource_number or 0, card.cities_to_power or 0, tokens
+
+
+def token_prices(resources):
+    """What a token of every resource type would cost to buy back now, in RESOURCE_TYPES order."""
+    return tuple(resources.get_next_cost(res_type) or max(SLOT_COSTS[res_type]) for res_type in RESOURCE_TYPES)
+
+
+def cheapest_firing(plant, prices):
+    """(cost, tokens) of the cheapest way to fire one plant, or None when it lacks the tokens."""
+    card_id, card_type, needed, capacity, tokens = plant
+    if card_type == "hybrid":
+        coal, oil = RESOURCE_INDEX["coal"], RESOURCE_INDEX["oil"]
+        # Every coal/oil split the plant holds the tokens for
+        splits = [
+            (num_coal * prices[coal] + (needed - num_coal) * prices[oil], num_coal)
+            for num_coal in range(needed + 1)
+            if num_coal <= tokens[coal] and needed - num_coal <= tokens[oil]
+        ]
+        if not splits:
+            return None
+        cost, num_coal = min(splits)
+        return cost, ("coal",) * num_coal + ("oil",) * (needed - num_coal)
+    index = RESOURCE_INDEX[card_type]
+    if tokens[index] < needed:
+        return None
+    return needed * prices[index], (card_type,) * needed
+
+
+@lru_cache(maxsize=4096)
+def plan_power(plants, cities, prices):
+    """
+    Tokens to burn so a player powers the most cities while burning the cheapest
+    tokens. plants is a tuple of plant_key(), cities the number of cities the
+    player owns and prices the token_prices() of the market. Returns the number of
+    cities powered and a tuple of (card_id, res_type) tokens to move into power.
+
+    A player owns at most four plants, so every subset of the plants that can fire
+    is tried; plans are cached by plant set, token counts and prices.
+    """
+    always_on = 0
+    firings = []
+    for plant in plants:
+        card_id, card_type, needed, capacity, tokens = plant
+        if card_type == "renewable" or not needed:
+            always_on += capacity
+            continue
+        firing = cheapest_firing(plant, prices)
+        if firing is not None:
+            firings.append((card_id, capacity, *firing))
+
+    limit = min(cities, MAX_POWERED_CITIES)
+    best_score, best_choice = None, ()
+    for size in range(len(firings) + 1):
+        for choice in combinations(firings, size):
+            powered = min(always_on + sum(capacity for _, capacity, _, _ in choice), limit)
+            cost = sum(cost for _, _, cost, _ in choice)
+            score = (powered, -cost)
+            if best_score is None or score > best_score:
+                best_score, best_choice = score, choice
+
+    tokens = tuple((card_id, res_type) for card_id, _, _, fuel in best_choice for res_type in fuel)
+    return best_score[0], tokens
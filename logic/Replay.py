@@ -0,0 +1,137 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from collections import deque
+from logic.Game import Game
+from logic.Journal import read_journal, read_index
+
+# Decisions the engine asks for while an action runs, answered from the journal on replay
+DECISIONS = ["select_power_plant_for_resource", "select_power_plant_to_remove"]
+
+
+def new_game(header):
+    """Headless game set up exactly like the journaled one, before its first action."""
+    return Game(seed=header["seed"], regions=header["regions"], deck_order=header.get("deck"))
+
+
+def answer_from(game, pending):
+    for request in DECISIONS:
+        game.events.respond(request, lambda request=request, **kwargs: take_decision(pending, request))
+
+
+def take_decision(pending, request):
+    if not pending:
+        raise ValueError(f"Journal has no recorded answer for {request}")
+    recorded_request, value = pending.popleft()
+    if recorded_request != request:
+        raise ValueError(f"Journal answers {recorded_request}, the game asked for {request}")
+    return value
+
+
+def apply_entry(game, entry, pending):
+    """Re-execute one journaled action; returns False for entries that are not actions."""
+    if entry["type"] != "action":
+        return False
+    pending.extend(entry.get("decisions", ()))
+    game.handle_action(entry["action"], **entry["kwargs"])
+    if pending:
+        raise ValueError(f"Unused decisions after {entry['action']}: {list(pending)}")
+    return True
+
+
+def replay(journal_path, verify=True, quiet=True):
+    """
+    Play a journal back headlessly as fast as the engine goes. With verify every
+    checkpoint digest and keyframe is compared to the replayed state and a
+    divergence raises ValueError. Returns the final game and a summary with the
+    engine throughput.
+    """
+    header, entries = read_journal(journal_path)
+    pending = deque()
+    actions = checkpoints = keyframes = 0
+
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        game = new_game(header)
+        answer_from(game, pending)
+        started = time.perf_counter()
+        for entry in entries:
+            if apply_entry(game, entry, pending):
+                actions += 1
+            elif entry["type"] == "checkpoint" and verify:
+                digest = game.state_digest()
+                if digest != entry["digest"]:
+                    raise ValueError(
+                        f"Replay diverged after {actions} actions: expected {entry['digest']}, got {digest}"
+                    )
+                checkpoints += 1
+            elif entry["type"] == "keyframe" and verify:
+                if json.loads(json.dumps(game.export_state())) != entry["state"]:
+                    raise ValueError(f"Replay diverged before round {entry['round']} ({actions} actions)")
+                keyframes += 1
+        elapsed = time.perf_counter() - started
+
+    return game, {
+        "actions": actions,
+        "checkpoints_verified": checkpoints,
+        "keyframes_verified": keyframes,
+        "digest": game.state_digest(),
+        "seconds": round(elapsed, 6),
+        "actions_per_second": round(actions / elapsed, 1) if elapsed else None,
+    }
+
+
+def seek(journal_path, round, phase, quiet=True):
+    """
+    Game positioned at the start of `phase` in `round` of a journaled game. The
+    index points at the keyframe of that round; only the actions between the
+    keyframe and the phase start are replayed.
+    """
+    index = read_index(journal_path)
+    if (round, phase) not in index:
+        raise ValueError(f"Round {round}, {phase} phase is not in {journal_path}")
+    target = index[(round, phase)]
+    pending = deque()
+
+    output = io.StringIO() if quiet else sys.stdout
+    with open(journal_path, "rb") as journal_file, contextlib.redirect_stdout(output):
+        header = json.loads(journal_file.readline())
+        game = new_game(header)
+        answer_from(game, pending)
+        journal_file.seek(target["keyframe"])
+        game.restore_state(json.loads(journal_file.readline())["state"])
+        while journal_file.tell() < target["offset"]:
+            apply_entry(game, json.loads(journal_file.readline()), pending)
+    return game
+
+
+def benchmark(journal_path, repeat=5):
+    """Best throughput of `repeat` replays of the same journal."""
+    runs = [replay(journal_path)[1] for _ in range(repeat)]
+    return max(runs, key=lambda run: run["actions_per_second"] or 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a Power Grid game journal and verify its final state.")
+    parser.add_argument("journal")
+    parser.add_argument("--no-verify", action="store_true")
+    parser.add_argument("--benchmark", type=int, default=0, metavar="N", help="replay N times and report the best run")
+    parser.add_argument("--seek", nargs=2, metavar=("ROUND", "PHASE"), help="print the state at the start of a phase")
+    args = parser.parse_args()
+
+    if args.seek:
+        summary = seek(args.journal, int(args.seek[0]), args.seek[1]).export_state()
+    elif args.benchmark:
+        summary = benchmark(args.journal, args.benchmark)
+    else:
+        summary = replay(args.journal, verify=not args.no_verify)[1]
+    print(json.dumps(summary, indent=2))
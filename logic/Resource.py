@@ -1,3 +1,5 @@
+from itertools import accumulate
+
 INITIAL_RESOURCES = {
     'coal': [(1, True), (1, True), (1, True), (2, True), (2, True), (2, True), 
                 (3, True), (3, True), (3, True), (4, True), (4, True), (4, True), 
@@ -47,18 +49,135 @@ REFILL_RATES = {
 }
 
 
+RESOURCE_TYPES = ('coal', 'oil', 'trash', 'uranium')
+RESOURCE_INDEX = {res_type: i for i, res_type in enumerate(RESOURCE_TYPES)}
+
+
+class ResourceCounts:
+    """
+    Token counts held in a fixed array indexed by resource type. Supports the small
+    part of the dict API the game and the UI use (get, [], items, values, len, bool),
+    where only resource types with tokens are listed.
+    """
+    __slots__ = ('counts',)
+
+    def __init__(self, counts=None):
+        self.counts = [0, 0, 0, 0]
+        if counts:
+            for res_type, amount in counts.items():
+                self.counts[RESOURCE_INDEX[res_type]] = amount
+
+    def __getitem__(self, res_type):
+        return self.counts[RESOURCE_INDEX[res_type]]
+
+    def __setitem__(self, res_type, amount):
+        self.counts[RESOURCE_INDEX[res_type]] = amount
+
+    def get(self, res_type, default=0):
+        return self.counts[RESOURCE_INDEX[res_type]] or default
+
+    def items(self):
+        return [(res_type, amount) for res_type, amount in zip(RESOURCE_TYPES, self.counts) if amount]
+
+    def keys(self):
+        return [res_type for res_type, amount in zip(RESOURCE_TYPES, self.counts) if amount]
+
+    def values(self):
+        return [amount for amount in self.counts if amount]
+
+    def total(self):
+        return sum(self.counts)
+
+    def clear(self):
+        self.counts = [0, 0, 0, 0]
+
+    def clone(self):
+        copy = ResourceCounts.__new__(ResourceCounts)
+        copy.counts = self.counts[:]
+        return copy
+
+    @classmethod
+    def from_list(cls, counts):
+        """ inverse of `.counts`, used when loading a saved state
+        """
+        copy = cls.__new__(cls)
+        copy.counts = list(counts)
+        return copy
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __contains__(self, res_type):
+        return self.counts[RESOURCE_INDEX[res_type]] > 0
+
+    def __len__(self):
+        return sum(1 for amount in self.counts if amount)
+
+    def __bool__(self):
+        return any(self.counts)
+
+    def __eq__(self, other):
+        if isinstance(other, ResourceCounts):
+            return self.counts == other.counts
+        if isinstance(other, dict):
+            return dict(self.items()) == {k: v for k, v in other.items() if v}
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{dict(self.items())}"
+
+
+# Cost of every market slot from left to right, and the prefix sums of those costs.
+# Tokens always fill the right end of a track, so a count per resource type is
+# enough to describe the market and price_of_next is a difference of two prefix sums.
+SLOT_COSTS = {res_type: [cost for cost, _ in slots] for res_type, slots in INITIAL_RESOURCES.items()}
+SLOT_COST_PREFIX = {res_type: list(accumulate(costs, initial=0)) for res_type, costs in SLOT_COSTS.items()}
+
+
 class Resources:
+    # Each game owns its market: two small count dicts and no per-token state,
+    # so forking a market for lookahead is a couple of dict copies.
+    __slots__ = ('available', 'remaining_resources')
+
     def __init__(self):
-        self.cur_resources = INITIAL_RESOURCES
+        # number of tokens currently in the market, per resource type
+        self.available = {
+            res_type: sum(available for _, available in slots)
+            for res_type, slots in INITIAL_RESOURCES.items()
+        }
         self.remaining_resources = {
-            'coal': TOTAL_RESOURCES['coal'] - self.get_current_market_resources()['coal'],
-            'oil': TOTAL_RESOURCES['oil'] - self.get_current_market_resources()['oil'],
-            'trash': TOTAL_RESOURCES['trash'] - self.get_current_market_resources()['trash'],
-            'uranium': TOTAL_RESOURCES['uranium'] - self.get_current_market_resources()['uranium']
+            res_type: TOTAL_RESOURCES[res_type] - count for res_type, count in self.available.items()
+        }
+
+    def clone(self):
+        """ independent copy of the market, e.g. for a simulated game or a lookahead
+        """
+        market = Resources.__new__(Resources)
+        market.available = dict(self.available)
+        market.remaining_resources = dict(self.remaining_resources)
+        return market
+
+    @property
+    def cur_resources(self):
+        """ (cost, available) per market slot, the layout the UI renders
+        """
+        return {
+            res_type: [(cost, i >= len(costs) - self.available[res_type]) for i, cost in enumerate(costs)]
+            for res_type, costs in SLOT_COSTS.items()
         }
 
     def get_current_market_resources(self):
-        return {res_type: sum(available for _, available in res_list) for res_type, res_list in self.cur_resources.items()}
+        return dict(self.available)
+
+    def price_of_next(self, res_type, amount):
+        """ cost of buying the next `amount` tokens of res_type, None if the market has fewer
+        """
+        count = self.available[res_type]
+        if amount > count:
+            return None
+        prefix = SLOT_COST_PREFIX[res_type]
+        first = len(SLOT_COSTS[res_type]) - count
+        return prefix[first + amount] - prefix[first]
 
     def refill_resources(self, num_players, step):
         if step not in [1, 2, 3]:
@@ -66,56 +185,46 @@ class Resources:
 
         rates = REFILL_RATES[step][num_players]
         for res_type, count in rates.items():
-            available_slots = [i for i, (cost, available) in enumerate(self.cur_resources[res_type]) if not available]
-            available_slots.sort(reverse=True)
-            count = min(count, len(available_slots), self.remaining_resources[res_type])
-            for i in range(count):
-                self.cur_resources[res_type][available_slots[i]] = (self.cur_resources[res_type][available_slots[i]][0], True)
-                self.remaining_resources[res_type] -= 1
+            empty_slots = len(SLOT_COSTS[res_type]) - self.available[res_type]
+            count = min(count, empty_slots, self.remaining_resources[res_type])
+            self.available[res_type] += count
+            self.remaining_resources[res_type] -= count
     
     def remove_left_most_resources(self, res_type):
-        found = False
-        for i, (cost, available) in enumerate(self.cur_resources[res_type]):
-            if available:
-                self.cur_resources[res_type][i] = (cost, False)
-                found = True
-                break
-        return found
+        if self.available[res_type] == 0:
+            return False
+        self.available[res_type] -= 1
+        return True
     
+    def get_next_cost(self, res_type):
+        """ cost of the left most available token of res_type, None if the market is empty
+        """
+        return self.price_of_next(res_type, 1)
+
     def add_back_left_most_resource(self, res_type):
         """ also return cost for this resource token, -1 if no available slot to add back 
         """
-        last_unavailable_idx = -1
-        for i, (cost, available) in enumerate(self.cur_resources[res_type]):
-            if not available:
-                last_unavailable_idx = i
-            else:
-                break
-        if last_unavailable_idx == -1:
+        costs = SLOT_COSTS[res_type]
+        if self.available[res_type] == len(costs):
             return -1
-        
-        cost, available = self.cur_resources[res_type][last_unavailable_idx]
-        self.cur_resources[res_type][last_unavailable_idx] = (cost, True)
-        return cost
+        self.available[res_type] += 1
+        return costs[len(costs) - self.available[res_type]]
         
     
     def validate_purchase(self, res_purchases, available_money):
-        current_market_resources = self.get_current_market_resources()
         total_cost = 0
         for res_type, amount in res_purchases.items():
-            if current_market_resources.get(res_type, 0) < amount:
+            cost = self.price_of_next(res_type, amount)
+            if cost is None:
                 return (False, f'{res_type} not available for the amount: {amount}')
-            available_resources = [(cost, idx) for idx, (cost, available) in enumerate(self.cur_resources[res_type]) if available]
-            total_cost += sum(cost for cost, _ in available_resources[:amount])
+            total_cost += cost
         return (total_cost <= available_money, f'resources cost : {total_cost}')
 
 
     def proceed_purchases(self, res_purchases):
+        # tokens are always bought from the left, i.e. the cheapest first
         for res_type, amount in res_purchases.items():
-            available_resources = [(cost, idx) for idx, (cost, available) in enumerate(self.cur_resources[res_type]) if available]
-            available_resources.sort(reverse=True)
-            for cost, idx in available_resources[:amount]:
-                self.cur_resources[res_type][idx] = (cost, False)
+            self.available[res_type] -= min(amount, self.available[res_type])
     
     def return_resources_to_remaining(self, owned_power_plants):
         for owned_pp in owned_power_plants.values():
@@ -123,10 +232,10 @@ class Resources:
                 continue
             for res_type, amount in owned_pp.resources_to_power.items():
                 self.remaining_resources[res_type] += amount
-            owned_pp.resources_to_power = {}
+            owned_pp.resources_to_power.clear()
             
     def __repr__(self):
-        return f"Resources({self.cur_resources})"
+        return f"Resources({self.available})"
 
 # resouces = Resources()
 # resouces.refill_resources(4, 1)
@@ -0,0 +1,314 @@
+import mmap
+import struct
+from logic.Cards import CARD_IDS, CARD_INDEX
+from logic.Game import Game
+from logic.Resource import RESOURCE_TYPES
+from utils.constants import CITIES
+
+# Card, city and region names are stored as their index in these tables
+CITY_NAMES = list(CITIES)
+CITY_INDEX = {city_name: i for i, city_name in enumerate(CITY_NAMES)}
+REGIONS = sorted({info["region"] for info in CITIES.values()})
+
+SAVE_MAGIC = b"PGSG"
+ARCHIVE_MAGIC = b"PGAR"
+FORMAT_VERSION = 2
+
+# seed, step, phase_index, round, current_player_index, game_over, winner (-1 for none),
+# number of players, played regions, occupied regions, has rng state, has auction
+GAME_HEADER = struct.Struct("<qBbHBBbBHHBB")
+# money, money_to_pay (both can go negative), cities_powered, phase_completed, colour (r, g, b), left-over tokens,
+# name length, number of cities, number of power plants
+PLAYER = struct.Struct("<hhBB3B4BBBB")
+OWNED_POWER_PLANT = struct.Struct("<B16B")
+COUNTS = struct.Struct("<4B")
+RNG_STATE = struct.Struct("<B625IBd")
+# card, current bid, active bidder, initial bid submitted, number of bidders, number passed,
+# high bidder (-1 for none), number of registered maximum bids
+AUCTION = struct.Struct("<BHBBBBbB")
+MAX_BID = struct.Struct("<BH")
+ARCHIVE_HEADER = struct.Struct("<4sH")
+ARCHIVE_FOOTER = struct.Struct("<QQ4s")
+OFFSET = struct.Struct("<Q")
+
+
+def region_mask(regions):
+    mask = 0
+    for region in regions or ():
+        mask |= 1 << REGIONS.index(region)
+    return mask
+
+
+def mask_regions(mask):
+    return [region for i, region in enumerate(REGIONS) if mask & (1 << i)]
+
+
+def pack_ids(index, ids):
+    return bytes([len(ids)]) + bytes(index[item] for item in ids)
+
+
+def unpack_ids(table, data, offset):
+    count = data[offset]
+    return [table[i] for i in data[offset + 1:offset + 1 + count]], offset + 1 + count
+
+
+def encode_state(state, include_rng=True):
+    """
+    Fixed-width binary encoding of a state from Game.export_state(). Without
+    include_rng the 2.5kB generator state is left out, which is enough to analyse
+    a finished game but not to continue it exactly.
+    """
+    names = [player["name"] for player in state["players"]]
+    auction = state["auction"]
+    parts = [GAME_HEADER.pack(
+        state["seed"], state["step"], state["phase_index"], state["round"], state["current_player_index"],
+        state["game_over"], names.index(state["winner"]) if state["winner"] else -1, len(names),
+        region_mask(state["regions"]), region_mask(state["occupied_regions"]), include_rng, auction is not None,
+    )]
+
+    for player in state["players"]:
+        name = player["name"].encode()
+        color = bytes.fromhex(player["color"].lstrip("#"))
+        parts.append(PLAYER.pack(
+            player["money"], player["money_to_pay"], player["cities_powered"], player["phase_completed"],
+            *color, *player["left_resources"], len(name), len(player["cities"]), len(player["power_plants"]),
+        ))
+        parts.append(name)
+        parts.append(bytes(CITY_INDEX[city_name] for city_name in player["cities"]))
+        for card_id, on_card, to_purchase, to_power, on_hold in player["power_plants"]:
+            parts.append(OWNED_POWER_PLANT.pack(CARD_INDEX[card_id], *on_card, *to_purchase, *to_power, *on_hold))
+
+    parts.append(pack_ids(CARD_INDEX, state["market"]))
+    parts.append(pack_ids(CARD_INDEX, state["deck"]))
+    parts.append(COUNTS.pack(*(state["available"][res_type] for res_type in RESOURCE_TYPES)))
+    parts.append(COUNTS.pack(*(state["remaining_resources"][res_type] for res_type in RESOURCE_TYPES)))
+
+    parts.append(bytes([len(state["built_cities"])]))
+    for city_name, owners in state["built_cities"].items():
+        parts.append(bytes([CITY_INDEX[city_name], len(owners)] + [names.index(owner) for owner in owners]))
+
+    if include_rng:
+        version, internal_state, gauss_next = state["rng"]
+        parts.append(RNG_STATE.pack(version, *internal_state, gauss_next is not None, gauss_next or 0.0))
+    if auction:
+        parts.append(AUCTION.pack(
+            CARD_INDEX[auction["card_id"]], auction["current_bid"], auction["active_bidder_index"],
+            auction["initial_bid_submitted"], len(auction["players"]), len(auction["passed_players"]),
+            names.index(auction["high_bidder"]) if auction["high_bidder"] else -1, len(auction["max_bids"]),
+        ))
+        parts.append(bytes(names.index(name) for name in auction["players"] + auction["passed_players"]))
+        for name, max_bid in auction["max_bids"].items():
+            parts.append(MAX_BID.pack(names.index(name), max_bid))
+    return b"".join(parts)
+
+
+def decode_state(data, offset=0):
+    """Inverse of encode_state; data may be any buffer, e.g. a slice of a memory map."""
+    (seed, step, phase_index, round, current_player_index, game_over, winner, num_players,
+     regions, occupied_regions, has_rng, has_auction) = GAME_HEADER.unpack_from(data, offset)
+    offset += GAME_HEADER.size
+
+    players = []
+    for _ in range(num_players):
+        fields = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        name_length, num_cities, num_power_plants = fields[11:]
+        name = bytes(data[offset:offset + name_length]).decode()
+        offset += name_length
+        cities = [CITY_NAMES[i] for i in data[offset:offset + num_cities]]
+        offset += num_cities
+        power_plants = []
+        for _ in range(num_power_plants):
+            card, *counts = OWNED_POWER_PLANT.unpack_from(data, offset)
+            offset += OWNED_POWER_PLANT.size
+            power_plants.append([CARD_IDS[card], counts[0:4], counts[4:8], counts[8:12], counts[12:16]])
+        players.append({
+            "name": name,
+            "color": "#" + bytes(fields[4:7]).hex().upper(),
+            "money": fields[0],
+            "cities": cities,
+            "phase_completed": bool(fields[3]),
+            "money_to_pay": fields[1],
+            "left_resources": list(fields[7:11]),
+            "cities_powered": fields[2],
+            "power_plants": power_plants,
+        })
+    names = [player["name"] for player in players]
+
+    market, offset = unpack_ids(CARD_IDS, data, offset)
+    deck, offset = unpack_ids(CARD_IDS, data, offset)
+    available = dict(zip(RESOURCE_TYPES, COUNTS.unpack_from(data, offset)))
+    remaining_resources = dict(zip(RESOURCE_TYPES, COUNTS.unpack_from(data, offset + COUNTS.size)))
+    offset += 2 * COUNTS.size
+
+    built_cities = {}
+    num_built = data[offset]
+    offset += 1
+    for _ in range(num_built):
+        city, num_owners = data[offset], data[offset + 1]
+        built_cities[CITY_NAMES[city]] = [names[i] for i in data[offset + 2:offset + 2 + num_owners]]
+        offset += 2 + num_owners
+
+    rng = None
+    if has_rng:
+        version, *internal_state, has_gauss, gauss_next = RNG_STATE.unpack_from(data, offset)
+        offset += RNG_STATE.size
+        rng = [version, internal_state, gauss_next if has_gauss else None]
+
+    auction = None
+    if has_auction:
+        (card, current_bid, active_bidder_index, initial_bid_submitted, num_bidders, num_passed,
+         high_bidder, num_max_bids) = AUCTION.unpack_from(data, offset)
+        offset += AUCTION.size
+        bidders = [names[i] for i in data[offset:offset + num_bidders + num_passed]]
+        offset += num_bidders + num_passed
+        max_bids = {}
+        for _ in range(num_max_bids):
+            bidder, max_bid = MAX_BID.unpack_from(data, offset)
+            offset += MAX_BID.size
+            max_bids[names[bidder]] = max_bid
+        auction = {
+            "card_id": CARD_IDS[card],
+            "players": bidders[:num_bidders],
+            "current_bid": current_bid,
+            "active_bidder_index": active_bidder_index,
+            "passed_players": bidders[num_bidders:],
+            "high_bidder": names[high_bidder] if high_bidder >= 0 else None,
+            "max_bids": max_bids,
+            "initial_bid_submitted": bool(initial_bid_submitted),
+        }
+
+    return {
+        "seed": seed,
+        "rng": rng,
+        "regions": mask_regions(regions) or None,
+        "step": step,
+        "phase_index": phase_index,
+        "round": round,
+        "current_player_index": current_player_index,
+        "game_over": bool(game_over),
+        "winner": names[winner] if winner >= 0 else None,
+        "players": players,
+        "market": market,
+        "deck": deck,
+        "available": available,
+        "remaining_resources": remaining_resources,
+        "built_cities": built_cities,
+        "occupied_regions": mask_regions(occupied_regions),
+        "auction": auction,
+    }
+
+
+def game_from_state(state):
+    """Headless game continuing from a decoded state."""
+    game = Game(seed=state["seed"], regions=state["regions"])
+    if state["rng"] is None:
+        # Only the seed was kept; later shuffles will differ from the original game
+        version, internal_state, gauss_next = game.rng.getstate()
+        state = dict(state, rng=[version, list(internal_state), gauss_next])
+    game.restore_state(state)
+    return game
+
+
+def save_game(game, path):
+    with open(path, "wb") as save_file:
+        save_file.write(SAVE_MAGIC + struct.pack("<H", FORMAT_VERSION))
+        save_file.write(encode_state(game.export_state()))
+
+
+def load_game(path):
+    with open(path, "rb") as save_file:
+        data = save_file.read()
+    if data[:4] != SAVE_MAGIC or struct.unpack_from("<H", data, 4)[0] != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a saved game")
+    return game_from_state(decode_state(data, 6))
+
+
+class ArchiveWriter:
+    """
+    Packs many saved games into one file: the records back to back, then a table
+    with the offset of every record and a footer pointing at the table, so the
+    archive can be streamed while games finish.
+    """
+
+    def __init__(self, path, include_rng=False):
+        self.file = open(path, "wb")
+        self.include_rng = include_rng
+        self.offsets = []
+        self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, FORMAT_VERSION))
+
+    def add(self, game):
+        self.add_state(game.export_state())
+
+    def add_state(self, state):
+        self.offsets.append(self.file.tell())
+        self.file.write(encode_state(state, self.include_rng))
+
+    def close(self):
+        if self.file.closed:
+            return
+        table_offset = self.file.tell()
+        self.file.write(b"".join(OFFSET.pack(offset) for offset in self.offsets))
+        self.file.write(ARCHIVE_FOOTER.pack(len(self.offsets), table_offset, ARCHIVE_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Archive:
+    """
+    Read-only view of an archive through a memory map. Opening it reads only the
+    footer; each record is decoded on access, so one game out of many can be
+    loaded without touching the others.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = None
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self.map) < ARCHIVE_HEADER.size + ARCHIVE_FOOTER.size:
+                raise ValueError(f"{path} is not a saved game archive")
+            magic, version = ARCHIVE_HEADER.unpack_from(self.map, 0)
+            count, self.table_offset, footer_magic = ARCHIVE_FOOTER.unpack_from(
+                self.map, len(self.map) - ARCHIVE_FOOTER.size
+            )
+            if magic != ARCHIVE_MAGIC or footer_magic != ARCHIVE_MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a saved game archive")
+        except Exception:
+            # A bad archive must not leak its file handle or map
+            self.close()
+            raise
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def offset(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return OFFSET.unpack_from(self.map, self.table_offset + i * OFFSET.size)[0]
+
+    def __getitem__(self, i):
+        return decode_state(self.map, self.offset(i))
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def game(self, i):
+        return game_from_state(self[i])
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
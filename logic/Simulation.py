@@ -0,0 +1,227 @@
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.abspath(os.path.join(current_dir, os.pardir))
+sys.path.append(parent_dir)
+
+import argparse
+import contextlib
+import io
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from logic.Game import Game
+from logic.Cards import CARD_NUMBERS
+from logic.Deck import deal_orders
+from logic.Bots import BOTS, auctionable_cards
+from logic.SaveGame import ArchiveWriter
+from utils.constants import PHASES
+
+
+def play_game(
+    bot_names, seed=None, max_rounds=60, quiet=True, journal_path=None, keep_state=False, bot_options=None,
+    deck_order=None,
+):
+    """
+    Play one complete headless game. bot_names is a list of keys of BOTS, seated in
+    player name order ("Player 1", "Player 2", ...). Returns a JSON-friendly summary.
+    With journal_path the game is journaled and can be replayed with logic/Replay.py;
+    keep_state adds the exported end state under "state". bot_options maps a bot
+    name to extra constructor arguments, e.g. {"mcts": {"time_budget": 0.5}}.
+    deck_order is a ready-made draw stack from Deck.deal_orders.
+    """
+    bot_options = bot_options or {}
+    # The engine still logs to stdout; keep the workers silent
+    output = io.StringIO() if quiet else sys.stdout
+    with contextlib.redirect_stdout(output):
+        # Bots never undo, so the game keeps no undo history
+        game = Game(seed=seed, journal_path=journal_path, deck_order=deck_order, undo_depth=0)
+        bots = {
+            player.name: BOTS[bot_name](seed=None if seed is None else seed * 31 + i, **bot_options.get(bot_name, {}))
+            for i, (player, bot_name) in enumerate(zip(sorted(game.players, key=lambda player: player.name), bot_names))
+        }
+        register_bot_decisions(game, bots)
+        while not game.game_over and game.round <= max_rounds:
+            play_turn(game, bots)
+        game.close_journal()
+        for bot in bots.values():
+            if hasattr(bot, "close"):
+                bot.close()
+
+    result = {
+        "seed": game.seed,
+        "completed": game.game_over,
+        "winner": game.winner.name if game.winner else None,
+        "rounds": game.round,
+        "players": [
+            {
+                "name": player.name,
+                "bot": type(bots[player.name]).__name__,
+                "cities": len(player.cities),
+                "money": player.money,
+                "cities_powered": player.cities_powered,
+                "power_plants": list(player.owned_power_plants.keys()),
+            }
+            for player in sorted(game.players, key=lambda player: player.name)
+        ],
+    }
+    if keep_state:
+        result["state"] = game.export_state()
+    return result
+
+
+def register_bot_decisions(game, bots):
+    game.events.respond(
+        "select_power_plant_to_remove",
+        lambda player, power_plant_ids: bots[player.name].choose_power_plant_to_remove(game, player, power_plant_ids),
+    )
+    game.events.respond(
+        "select_power_plant_for_resource",
+        lambda player, valid_cards, res_type, cost: bots[player.name].choose_power_plant_for_resource(
+            game, player, valid_cards, res_type, cost
+        ),
+    )
+
+
+def play_turn(game, bots):
+    """Let the player whose decision is pending act once in the current phase."""
+    phase = PHASES[game.phase_index]
+    player = game.players[game.current_player_index]
+    bot = bots[player.name]
+
+    if phase == "Auction":
+        play_auction_turn(game, bots, player)
+    elif phase == "Resources":
+        while True:
+            res_type = bot.choose_resource(game, player)
+            if res_type is None:
+                break
+            cost = game.resources.get_next_cost(res_type)
+            if not game.handle_action("add_res_to_purchase", res_type=res_type, cost=cost)["success"]:
+                break
+        if player.money_to_pay > 0:
+            game.handle_action("purchase_resources")
+        else:
+            game.handle_action("player_pass")
+    elif phase == "Houses":
+        while True:
+            city_name = bot.choose_city(game, player)
+            if city_name is None:
+                break
+            result = game.handle_action("can_build_house", city_name=city_name)
+            if not result["success"]:
+                break
+            game.handle_action("build_house", city_name=city_name, cost=result["cost"])
+        game.handle_action("player_pass")
+    elif phase == "Bureaucracy":
+        batch = [
+            ("add_res_to_power", {"card_id": card_id, "res_type": res_type})
+            for card_id, res_type in bot.choose_power(game, player)
+        ]
+        # A refused batch is rolled back as a whole; then power only the renewables
+        if not game.apply_actions(batch + [("generate_power", {})])["success"]:
+            game.handle_action("generate_power")
+
+
+def settle_auction(game, bots, auction_logic):
+    """
+    Register the maximum bid of every bidder, the starting player first, in one
+    batch; the engine settles the auction when the last one is in. A refused batch
+    is rolled back and the auction is played bid by bid instead.
+    """
+    start = auction_logic.active_bidder_index
+    batch = []
+    for offset in range(len(auction_logic.players)):
+        bidder = auction_logic.players[(start + offset) % len(auction_logic.players)]
+        max_bid = min(bots[bidder.name].choose_max_bid(game, bidder, auction_logic), bidder.money)
+        if offset == 0:
+            max_bid = max(max_bid, auction_logic.current_bid + 1)
+        batch.append(("register_max_bid", {"player": bidder.name, "max_bid": max_bid}))
+    game.apply_actions(batch)
+
+
+def play_auction_turn(game, bots, player):
+    card_id = bots[player.name].choose_power_plant(game, player)
+    # Every player has to buy a power plant in the first round
+    if card_id is None and game.round == 1:
+        affordable = [c for c in auctionable_cards(game) if CARD_NUMBERS[c] <= player.money]
+        card_id = min(affordable, key=CARD_NUMBERS.__getitem__) if affordable else None
+    if card_id is None:
+        game.handle_action("player_pass")
+        return
+
+    game.handle_action("start_auction", card_id=card_id, card_image_tk=None)
+    auction_logic = game.auction_logic
+    if all(bots[bidder.name].proxy_bidding for bidder in auction_logic.players):
+        settle_auction(game, bots, auction_logic)
+    while not auction_logic.auction_ended:
+        bidder = auction_logic.players[auction_logic.active_bidder_index]
+        bid = bots[bidder.name].choose_bid(game, bidder, auction_logic)
+        if not auction_logic.initial_bid_submitted:
+            bid = max(bid or 0, auction_logic.current_bid + 1)
+        if bid is None or not game.handle_action("submit_bid", bid_amount=bid)[0]:
+            game.handle_action("pass_bid")
+
+    # The winner may have to place tokens from a discarded power plant
+    for winner in game.players:
+        if winner.left_resources_from_removed_pp:
+            game.handle_action("auto_allocate_left_over_res", player=winner)
+
+
+def simulate(num_games, bot_names, output_path, workers=None, seed=0, max_rounds=60, archive_path=None):
+    """
+    Play num_games games across a process pool and stream one JSON line per finished
+    game to output_path. With archive_path the end states are also packed into a
+    save-game archive (see logic/SaveGame.py). Returns a summary with the win count
+    of every bot seat. The draw stacks of all games are dealt up front from seed,
+    so a run is reproducible from its seed.
+    """
+    wins = {}
+    completed = 0
+    started = time.perf_counter()
+    archive = ArchiveWriter(archive_path) if archive_path else None
+    deck_orders = deal_orders(num_games, seed)
+    with open(output_path, "w") as output_file, ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                play_game, bot_names, seed + game_index, max_rounds, True, None, archive is not None, None,
+                deck_orders[game_index],
+            )
+            for game_index in range(num_games)
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            if archive:
+                archive.add_state(result.pop("state"))
+            output_file.write(json.dumps(result) + "\n")
+            output_file.flush()
+            completed += result["completed"]
+            if result["winner"]:
+                wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+    if archive:
+        archive.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "games": num_games,
+        "completed": completed,
+        "wins": wins,
+        "seconds": round(elapsed, 3),
+        "games_per_minute": round(num_games / elapsed * 60, 1) if elapsed else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Power Grid games between bots.")
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("-b", "--bots", nargs="+", default=["greedy", "greedy", "random", "random"], choices=sorted(BOTS))
+    parser.add_argument("-o", "--output", default="simulation_results.jsonl")
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-rounds", type=int, default=60)
+    parser.add_argument("--archive", default=None, help="also pack the end states into this save-game archive")
+    args = parser.parse_args()
+
+    summary = simulate(args.games, args.bots, args.output, args.workers, args.seed, args.max_rounds, args.archive)
+    print(json.dumps(summary, indent=2))
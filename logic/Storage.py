@@ -0,0 +1,143 @@
+from collections import deque
+from logic.Cards import STORABLE_TYPES
+from logic.Resource import RESOURCE_TYPES
+
+SOURCE, SINK = "source", "sink"
+
+
+def store_tokens(plants, placed, extra):
+    """
+    Redistribute a player's tokens over their power plants so that as many as
+    possible are kept.
+
+    plants is a list of (card_id, storable resource types, capacity), placed maps
+    a card_id to the token counts (in RESOURCE_TYPES order) already on that plant
+    and extra holds the counts of the tokens still to be stored. Returns the new
+    counts of every plant and the counts of the tokens that did not fit.
+
+    This is a maximum flow from the resource types to the plants, where a plant
+    takes at most its capacity (2 * resource_number). The flow starts from the
+    current placement, so tokens already stored are only moved to make room.
+    """
+    totals = [sum(counts) for counts in zip(extra, *placed.values())]
+    residual = {SOURCE: {}, SINK: {}}
+    for index, res_type in enumerate(RESOURCE_TYPES):
+        stored = sum(counts[index] for counts in placed.values())
+        residual[SOURCE][res_type] = totals[index] - stored
+        residual[res_type] = {SOURCE: stored}
+    for card_id, res_types, capacity in plants:
+        counts = placed.get(card_id, [0, 0, 0, 0])
+        residual[card_id] = {SINK: capacity - sum(counts)}
+        residual[SINK][card_id] = sum(counts)
+        for index, res_type in enumerate(RESOURCE_TYPES):
+            if res_type in res_types:
+                residual[res_type][card_id] = float("inf")
+                residual[card_id][res_type] = counts[index]
+
+    while True:
+        path = augmenting_path(residual)
+        if path is None:
+            break
+        amount = min(residual[u][v] for u, v in zip(path, path[1:]))
+        for u, v in zip(path, path[1:]):
+            residual[u][v] -= amount
+            residual[v][u] = residual[v].get(u, 0) + amount
+
+    # The flow from a resource type to a plant is the residual capacity back along it
+    placement = {
+        card_id: [residual[card_id].get(res_type, 0) for res_type in RESOURCE_TYPES]
+        for card_id, res_types, capacity in plants
+    }
+    dropped = [residual[SOURCE][res_type] for res_type in RESOURCE_TYPES]
+    return placement, dropped
+
+
+def augmenting_path(residual):
+    """Shortest path from the source to the sink with spare capacity, or None."""
+    previous = {SOURCE: None}
+    queue = deque([SOURCE])
+    while queue:
+        node = queue.popleft()
+        for neighbor, capacity in residual[node].items():
+            if capacity > 0 and neighbor not in previous:
+                previous[neighbor] = node
+                if neighbor == SINK:
+                    path = [SINK]
+                    while previous[path[-1]] is not None:
+                        path.append(previous[path[-1]])
+                    return path[::-1]
+                queue.append(neighbor)
+    return None
+
+
+def storable_types(card):
+    """Resource types a power plant card can store."""
+    return STORABLE_TYPES[card.card_type]
+
+
+class StorageIndex:
+    """
+    Free token slots of one player's power plants. A plant stores up to twice its
+    resource_number tokens, counting the tokens on the card and those being bought
+    or placed after an auction; tokens moved into power free their slot.
+
+    The game updates the index as tokens are bought, placed, moved and powered,
+    and rebuilds it when plants are replaced, so storage checks do not recount any
+    tokens. Besides the free slots of every plant it keeps the free slots per
+    resource type of the single-type plants and the shared coal/oil slots of
+    hybrids.
+    """
+    __slots__ = ("plants", "free", "types", "dedicated", "hybrid")
+
+    def __init__(self, owned_power_plants):
+        self.plants = owned_power_plants  # the dict the index was built from
+        self.free = {}                      # card_id -> free slots
+        self.types = {}                     # card_id -> storable resource types
+        self.dedicated = dict.fromkeys(RESOURCE_TYPES, 0)
+        self.hybrid = 0
+        for card_id, owned_pp in owned_power_plants.items():
+            self.add_plant(card_id, owned_pp)
+
+    def add_plant(self, card_id, owned_pp):
+        res_types = storable_types(owned_pp.card)
+        if not res_types:
+            return
+        used = owned_pp.resources_on_card.total() + owned_pp.resources_to_purchase.total() \
+            + owned_pp.resources_on_hold.total()
+        self.types[card_id] = res_types
+        self.free[card_id] = 0
+        self.release(card_id, 2 * owned_pp.card.resource_number - used)
+
+    def take(self, card_id, amount=1):
+        self.release(card_id, -amount)
+
+    def release(self, card_id, amount=1):
+        res_types = self.types.get(card_id)
+        if res_types is None:
+            return
+        self.free[card_id] += amount
+        if len(res_types) > 1:
+            self.hybrid += amount
+        else:
+            self.dedicated[res_types[0]] += amount
+
+    def can_hold(self, card_id, res_type):
+        return res_type in self.types.get(card_id, ()) and self.free[card_id] > 0
+
+    def cards_for(self, res_type):
+        """Card ids of the plants with a free slot for res_type, in the player's order."""
+        return [card_id for card_id, free in self.free.items() if free > 0 and res_type in self.types[card_id]]
+
+    def room(self, res_type):
+        """How many more tokens of res_type the player can store."""
+        if res_type in ("coal", "oil"):
+            return self.dedicated[res_type] + self.hybrid
+        return self.dedicated[res_type]
+
+    def can_store(self, counts):
+        """Whether the player can store all of counts (res_type -> tokens) at once."""
+        coal, oil = counts.get("coal", 0), counts.get("oil", 0)
+        return (
+            all(amount <= self.room(res_type) for res_type, amount in counts.items())
+            and coal + oil <= self.dedicated["coal"] + self.dedicated["oil"] + self.hybrid
+        )
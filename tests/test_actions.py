@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from logic.Actions import AddResToPurchase, BuildHouse
+from logic.Game import Game, OwnedPowerPlant
+from logic.History import History
+from logic.Replay import replay
+from utils.constants import PHASES
+
+class TestActions(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=3)
+        while PHASES[self.game.phase_index] != 'Resources':
+            self.game.handle_action('player_pass')
+        self.player = self.game.players[self.game.current_player_index]
+        card_id = next(c for c, card in self.game.deck.cards.items() if card.card_type == 'coal' and card.resource_number == 3)
+        self.player.owned_power_plants = {card_id: OwnedPowerPlant(self.game.deck.cards[card_id])}
+        self.owned_pp = self.player.owned_power_plants[card_id]
+
+    def buy_coal(self, count):
+        # Prices as they will be when each token is bought
+        costs = [self.game.resources.price_of_next('coal', i + 1) - self.game.resources.price_of_next('coal', i) for i in range(count)]
+        return [AddResToPurchase(res_type='coal', cost=cost) for cost in costs]
+
+    def test_actions_are_validated(self):
+        with self.assertRaises(ValueError):
+            self.game.handle_action('build_castle')
+        with self.assertRaises(TypeError):
+            self.game.handle_action('build_house', city_name='Essen')
+        with self.assertRaises(TypeError):
+            BuildHouse(city_name='Essen', cost=10, player=self.player)
+        with self.assertRaises(ValueError):
+            self.game.handle_action('confirm_left_over_res_allocation', player='Player 9')
+
+    def test_batch_defers_and_coalesces_notifications(self):
+        seen = []
+        self.game.events.subscribe('resource_market_changed', lambda resources: seen.append(resources.available['coal']))
+        available = self.game.resources.available['coal']
+        result = self.game.apply_actions(self.buy_coal(3))
+        self.assertTrue(result['success'])
+        self.assertEqual(seen, [available - 3])
+        self.assertEqual(self.owned_pp.resources_to_purchase['coal'], 3)
+
+    def test_refused_batch_is_rolled_back(self):
+        seen = []
+        self.game.events.subscribe('player_changed', lambda player, phase: seen.append(player))
+        available, money_to_pay = dict(self.game.resources.available), self.player.money_to_pay
+        # The plant stores at most six coal
+        result = self.game.apply_actions(self.buy_coal(7))
+        self.assertFalse(result['success'])
+        self.assertEqual(result['index'], 6)
+        self.assertEqual(self.game.resources.available, available)
+        self.assertEqual(self.player.money_to_pay, money_to_pay)
+        self.assertFalse(self.owned_pp.resources_to_purchase)
+        self.assertEqual(seen, [])
+
+    def test_refused_batch_is_rolled_back_without_undo_history(self):
+        self.game.history = History(max_depth=0)
+        available = dict(self.game.resources.available)
+        self.assertFalse(self.game.apply_actions(self.buy_coal(7))['success'])
+        self.assertEqual(self.game.resources.available, available)
+        self.assertTrue(self.game.apply_actions(self.buy_coal(2))['success'])
+        self.assertFalse(self.game.history.can_undo())
+
+    def test_batch_is_one_undo_step(self):
+        available = dict(self.game.resources.available)
+        self.game.apply_actions([('add_res_to_purchase', {'res_type': a.res_type, 'cost': a.cost}) for a in self.buy_coal(2)])
+        self.assertEqual(self.game.handle_action('undo')['action'], 'apply_actions')
+        self.assertEqual(self.game.resources.available, available)
+
+class TestBatchJournal(unittest.TestCase):
+    def test_batches_replay(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            journal_path = os.path.join(tmp_dir, 'game.jsonl')
+            game = Game(seed=8, journal_path=journal_path)
+            game.apply_actions([('player_pass', {}) for _ in game.players])
+            self.assertEqual(PHASES[game.phase_index], 'Resources')
+            game.close_journal()
+            replayed, summary = replay(journal_path)
+        self.assertEqual(summary['actions'], 1)
+        self.assertEqual(replayed.state_digest(), game.state_digest())
+
+if __name__ == '__main__':
+    unittest.main()
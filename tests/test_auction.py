@@ -0,0 +1,92 @@
+import unittest
+from logic.Game import Game
+
+class TestProxyAuction(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=2)
+        self.card_id = self.game.power_plant_market.current_market[0]
+        self.game.handle_action('start_auction', card_id=self.card_id)
+        self.auction = self.game.auction_logic
+        self.bidders = self.auction.players
+        self.money = {player.name: player.money for player in self.bidders}
+
+    def register(self, max_bids):
+        return self.game.apply_actions([
+            ('register_max_bid', {'player': player.name, 'max_bid': max_bid})
+            for player, max_bid in zip(self.bidders, max_bids)
+        ])
+
+    def paid(self, player):
+        return self.money[player.name] - player.money
+
+    def test_highest_maximum_pays_second_price(self):
+        minimum = int(self.card_id)
+        self.assertTrue(self.register([minimum + 5, minimum + 9, 0, minimum + 2])['success'])
+        self.assertTrue(self.auction.auction_ended)
+        winner = self.bidders[1]
+        self.assertIn(self.card_id, winner.owned_power_plants)
+        self.assertEqual(self.paid(winner), minimum + 6)
+        self.assertEqual(set(self.auction.passed_players), set(self.bidders) - {winner})
+
+    def test_unopposed_opener_pays_the_minimum(self):
+        self.register([40, 0, 0, 0])
+        self.assertIn(self.card_id, self.bidders[0].owned_power_plants)
+        self.assertEqual(self.paid(self.bidders[0]), int(self.card_id))
+
+    def test_tie_goes_to_the_opener(self):
+        minimum = int(self.card_id)
+        self.register([minimum + 4, minimum + 4, 0, 0])
+        self.assertIn(self.card_id, self.bidders[0].owned_power_plants)
+        self.assertEqual(self.paid(self.bidders[0]), minimum + 4)
+
+    def test_opener_must_bid(self):
+        result = self.game.handle_action('register_max_bid', player=self.bidders[0], max_bid=0)
+        self.assertFalse(result[0])
+        self.assertFalse(self.auction.max_bids)
+
+    def test_mixes_with_live_bids(self):
+        minimum = int(self.card_id)
+        self.game.handle_action('submit_bid', bid_amount=minimum + 3)
+        # Registered players are skipped when the turn passes on
+        self.game.handle_action('register_max_bid', player=self.bidders[2], max_bid=minimum + 10)
+        self.assertEqual(self.auction.active_bidder_index, 1)
+        self.game.handle_action('pass_bid')
+        self.assertEqual(self.auction.active_bidder_index, 3)
+        self.game.handle_action('register_max_bid', player=self.bidders[3], max_bid=minimum + 1)
+        self.assertEqual(self.auction.active_bidder_index, 0)
+        self.game.handle_action('register_max_bid', player=self.bidders[0], max_bid=minimum + 7)
+        self.assertIn(self.card_id, self.bidders[2].owned_power_plants)
+        self.assertEqual(self.paid(self.bidders[2]), minimum + 8)
+
+    def bid_then_register(self, bid, max_bids):
+        self.game.handle_action('submit_bid', bid_amount=bid)
+        for player, max_bid in zip(self.bidders[1:], max_bids):
+            self.game.handle_action('register_max_bid', player=player, max_bid=max_bid)
+
+    def test_holder_wins_at_standing_bid(self):
+        minimum = int(self.card_id)
+        self.bid_then_register(minimum + 10, [minimum + 2, 0, 0])
+        # Lower maximums pass, the holder is not asked again
+        self.assertTrue(self.auction.auction_ended)
+        self.assertIn(self.card_id, self.bidders[0].owned_power_plants)
+        self.assertEqual(self.paid(self.bidders[0]), minimum + 10)
+        self.assertEqual(self.paid(self.bidders[1]), 0)
+
+    def test_winner_never_pays_more_than_its_maximum(self):
+        minimum = int(self.card_id)
+        self.bid_then_register(minimum + 10, [minimum + 11, 0, 0])
+        self.assertIs(self.auction.players[self.auction.active_bidder_index], self.bidders[0])
+        self.game.handle_action('pass_bid')
+        self.assertIn(self.card_id, self.bidders[1].owned_power_plants)
+        self.assertEqual(self.paid(self.bidders[1]), minimum + 11)
+
+    def test_settlement_is_one_undo_step(self):
+        self.register([int(self.card_id) + 1, int(self.card_id) + 2, 0, 0])
+        self.game.handle_action('undo')
+        self.assertIs(self.game.auction_logic, self.auction)
+        self.assertFalse(self.auction.auction_ended)
+        self.assertFalse(self.auction.max_bids)
+        self.assertEqual({player.name: player.money for player in self.bidders}, self.money)
+
+if __name__ == '__main__':
+    unittest.main()
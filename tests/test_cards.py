@@ -0,0 +1,46 @@
+import os
+import pickle
+import tempfile
+import unittest
+from logic.Cards import CARDS, CARD_INDEX, CARD_NUMBERS, CARDS_JSON_PATH, COMPATIBLE, load_cards, parse_cards, write_cache
+from logic.Deck import Deck
+
+class TestCardRegistry(unittest.TestCase):
+    def test_decks_share_the_registry(self):
+        self.assertIs(Deck().cards, CARDS)
+        self.assertIs(Deck().cards['13'], Deck().cards['13'])
+
+    def test_cards_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            CARDS['13'].cities_to_power = 5
+
+    def test_registry_is_read_only(self):
+        for table in (CARDS, CARD_NUMBERS, CARD_INDEX):
+            with self.assertRaises(TypeError):
+                table['13'] = None
+            with self.assertRaises(TypeError):
+                del table['13']
+
+    def test_numbers_order_step3_last(self):
+        self.assertEqual(CARDS['21'].number, 21)
+        self.assertEqual(max(CARD_NUMBERS, key=CARD_NUMBERS.get), 'step3')
+
+    def test_compatibility_table(self):
+        self.assertTrue(COMPATIBLE['hybrid', 'oil'])
+        self.assertFalse(COMPATIBLE['hybrid', 'trash'])
+        self.assertFalse(COMPATIBLE['renewable', 'coal'])
+
+    def test_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = os.path.join(directory, 'cards.pickle')
+            write_cache(cache_path=cache_path)
+            with open(cache_path, 'rb') as cache_file:
+                cached = pickle.load(cache_file)
+            self.assertEqual(
+                {card_id: repr(card) for card_id, card in cached.items()},
+                {card_id: repr(card) for card_id, card in parse_cards(CARDS_JSON_PATH).items()},
+            )
+            self.assertEqual(load_cards(cache_path=cache_path)['21'].number, 21)
+
+if __name__ == '__main__':
+    unittest.main()
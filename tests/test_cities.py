@@ -1,5 +1,6 @@
+import itertools
 import unittest
-from logic.Cities import Cities
+from logic.Cities import Cities, NetworkFrontier, compile_regions, get_distance_table
 
 class TestCities(unittest.TestCase):
     def setUp(self):
@@ -18,6 +19,60 @@ class TestCities(unittest.TestCase):
         cost = self.cities.get_connection_cost('Fulda', ['Dresden', 'Munster', 'Trier', 'Saarbrucken'])
         self.assertEqual(cost, 18)
 
+    def test_distance_table_is_symmetric(self):
+        table = get_distance_table()
+        self.assertIs(table, get_distance_table())
+        self.assertEqual(table['Hamburg']['Lubeck'], 6)
+        for a in ('Kiel', 'Fulda', 'Passau'):
+            for b in ('Aachen', 'Dresden', 'Konstanz'):
+                self.assertEqual(table[a][b], table[b][a])
+
+    def test_network_frontier_incremental(self):
+        network = NetworkFrontier()
+        self.assertEqual(network.get_connection_cost('Passau'), 0)
+        for city_name in ['Kiel', 'Lubeck', 'Fulda']:
+            network.add_city(city_name)
+        rebuilt = NetworkFrontier(['Kiel', 'Lubeck', 'Fulda'])
+        self.assertEqual(network.distances, rebuilt.distances)
+        self.assertEqual(network.get_connection_cost('Hamburg'),
+                         self.cities.get_connection_cost('Hamburg', ['Kiel', 'Lubeck', 'Fulda']))
+
+    def test_plan_builds_matches_brute_force(self):
+        owned = ['Kiel', 'Hamburg']
+        table = get_distance_table()
+
+        def order_cost(order):
+            network, total = list(owned), 0
+            for city_name in order:
+                total += self.cities.get_build_cost(city_name) + min(table[city_name][o] for o in network)
+                network.append(city_name)
+            return total
+
+        candidates = ['Lubeck', 'Flensburg', 'Schwerin', 'Bremen', 'Cuxhaven', 'Rostock']
+        expected = min(order_cost(p) for p in itertools.permutations(candidates, 3))
+        cost, order = self.cities.plan_builds(owned, 200, 3, candidates=candidates)
+        self.assertEqual(cost, expected)
+        self.assertEqual(order_cost(order), expected)
+        self.assertIsNone(self.cities.plan_builds(owned, 20, 3))
+
+    def test_region_restricted_connection_cost(self):
+        regions = ['Purple', 'Yellow']
+        table = get_distance_table(regions)
+        self.assertIs(table, get_distance_table(reversed(regions)))
+        self.assertTrue(all(c in table for c in ('Muenchen', 'Passau', 'Nurnberg')))
+        self.assertNotIn('Hamburg', table)
+        # Restricted paths can only be longer than paths across the whole map
+        for a in table:
+            for b in table:
+                self.assertGreaterEqual(table[a][b], get_distance_table()[a][b])
+        self.assertEqual(self.cities.get_connection_cost('Muenchen', ['Passau', 'Hamburg'], regions),
+                         table['Muenchen']['Passau'])
+        with self.assertRaises(ValueError):
+            self.cities.get_connection_cost('Hamburg', ['Kiel'], regions)
+        with self.assertRaises(ValueError):
+            self.cities.get_connection_cost('Atlantis', ['Kiel'])
+        self.assertGreaterEqual(compile_regions.cache_info().hits, 1)
+
     def test_get_build_cost(self):
         # First build cost = 10, then 15, then 20
         self.assertEqual(self.cities.get_build_cost('Lubeck'), 10)
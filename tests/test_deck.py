@@ -0,0 +1,51 @@
+import os
+import random
+import tempfile
+import unittest
+from logic.Cards import CARD_IDS
+from logic.Deck import Deck, deal_orders
+from logic.Game import Game
+from logic.Replay import replay
+
+class TestDeck(unittest.TestCase):
+    def test_draws_from_the_top(self):
+        deck = Deck(random.Random(1))
+        deck.prepare_initial_deck()
+        stack = deck.stack_card_ids
+        self.assertEqual((stack[0], stack[-1]), ('13', 'step3'))
+        self.assertEqual([deck.draw_card() for _ in stack], stack)
+        self.assertIsNone(deck.draw_card())
+
+    def test_put_back_goes_to_the_bottom(self):
+        deck = Deck(random.Random(1))
+        deck.prepare_initial_deck()
+        deck.put_back(deck.draw_card())
+        self.assertEqual(deck.stack_card_ids[-1], '13')
+
+    def test_dealt_orders_are_valid_and_reproducible(self):
+        orders = deal_orders(50, seed=7)
+        self.assertEqual(orders, deal_orders(50, seed=7))
+        self.assertGreater(len({bytes(order) for order in orders}), 1)
+        for order in orders:
+            card_ids = [CARD_IDS[index] for index in order]
+            self.assertEqual((card_ids[0], card_ids[-1]), ('13', 'step3'))
+            self.assertEqual(len(set(card_ids)), len(CARD_IDS) - 8)
+
+    def test_game_uses_dealt_order(self):
+        order = deal_orders(1, seed=3)[0]
+        game = Game(seed=1, deck_order=order)
+        self.assertEqual(game.deck.stack_card_ids, [CARD_IDS[index] for index in order])
+        self.assertEqual(game.power_plant_market.current_market, ['3', '4', '5', '6', '7', '8', '9', '10'])
+
+    def test_journal_replays_dealt_order(self):
+        order = deal_orders(1, seed=3)[0]
+        with tempfile.TemporaryDirectory() as directory:
+            journal_path = os.path.join(directory, 'game.jsonl')
+            game = Game(seed=1, journal_path=journal_path, deck_order=order)
+            game.handle_action('start_auction', card_id='3')
+            game.close_journal()
+            replayed, summary = replay(journal_path)
+            self.assertEqual(replayed.deck.stack_card_ids, game.deck.stack_card_ids)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import sys
+import unittest
+from logic.Game import Game, OwnedPowerPlant, PowerPlantMarket
+from utils.constants import PHASES
+
+class TestHeadlessGame(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+
+    def test_runs_without_tkinter(self):
+        self.assertIsNone(self.game.ui)
+        self.assertNotIn('ui.PowerGridUI', sys.modules)
+        self.assertEqual(PHASES[self.game.phase_index], 'Auction')
+        self.assertEqual(self.game.round, 1)
+
+    def test_events_reach_subscribers(self):
+        seen = []
+        self.game.events.subscribe('status_changed', lambda phase_name, current_player_name: seen.append(phase_name))
+        for _ in self.game.players:
+            self.game.handle_action('player_pass')
+        self.assertEqual(PHASES[self.game.phase_index], 'Resources')
+        self.assertIn('Resources', seen)
+
+    def test_auction_uses_default_decisions(self):
+        player = self.game.players[0]
+        card_id = self.game.power_plant_market.current_market[0]
+        self.game.handle_action('start_auction', card_id=card_id, card_image_tk=None)
+        self.game.auction_logic.submit_bid(int(card_id))
+        for _ in range(len(self.game.players) - 1):
+            self.game.auction_logic.pass_bid()
+        self.assertIn(card_id, player.owned_power_plants)
+        self.assertLessEqual(len(player.owned_power_plants), 3)
+        self.assertTrue(player.phase_completed)
+
+    def test_build_cost_overlay_matches_can_build_house(self):
+        overlays = []
+        self.game.events.subscribe('build_costs_changed', lambda costs, money: overlays.append(costs))
+        while PHASES[self.game.phase_index] != 'Houses':
+            self.game.handle_action('player_pass')
+        costs = overlays[-1]
+        self.assertTrue(costs)
+        for city_name, cost in costs.items():
+            result = self.game.can_build_house(city_name)
+            if result['success']:
+                self.assertEqual(result['cost'], cost)
+
+    def test_clone_is_independent(self):
+        clone = self.game.clone()
+        self.assertEqual([p.name for p in clone.players], [p.name for p in self.game.players])
+        while PHASES[clone.phase_index] != 'Houses':
+            clone.handle_action('player_pass')
+        player = clone.players[clone.current_player_index]
+        city_name, cost = min(clone.get_build_costs().items(), key=lambda item: item[1])
+        clone.handle_action('build_house', city_name=city_name, cost=cost)
+
+        original = next(p for p in self.game.players if p.name == player.name)
+        self.assertEqual(PHASES[self.game.phase_index], 'Auction')
+        self.assertNotIn(city_name, original.cities)
+        self.assertNotIn(city_name, self.game.cities.built_cities)
+        self.assertEqual(original.money, player.money + cost)
+        self.assertNotEqual(original.network.distances, player.network.distances)
+
+class TestUndoRedo(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+
+    def advance_to(self, phase):
+        while PHASES[self.game.phase_index] != phase:
+            self.game.handle_action('player_pass')
+
+    def test_undo_redo_build_house(self):
+        self.advance_to('Houses')
+        player = self.game.players[self.game.current_player_index]
+        money, costs = player.money, self.game.get_build_costs()
+        city_name, cost = min(costs.items(), key=lambda item: item[1])
+        owners = list(self.game.cities.built_cities.get(city_name, []))
+
+        self.game.handle_action('build_house', city_name=city_name, cost=cost)
+        self.assertEqual(self.game.handle_action('undo'), {'success': True, 'action': 'build_house'})
+        self.assertEqual(player.money, money)
+        self.assertNotIn(city_name, player.cities)
+        self.assertEqual(self.game.cities.built_cities.get(city_name, []), owners)
+        self.assertEqual(self.game.get_build_costs(), costs)
+
+        self.game.handle_action('redo')
+        self.assertEqual(player.money, money - cost)
+        self.assertIn(city_name, player.cities)
+        self.assertEqual(self.game.cities.built_cities[city_name], owners + [player.name])
+
+    def test_undo_resource_purchase(self):
+        self.advance_to('Resources')
+        player = self.game.players[self.game.current_player_index]
+        card_id = next(c for c, card in self.game.deck.cards.items() if card.card_type == 'coal')
+        player.owned_power_plants = {card_id: OwnedPowerPlant(self.game.deck.cards[card_id])}
+        undo_depth = len(self.game.history.undo_stack)
+        available = dict(self.game.resources.available)
+
+        cost = self.game.resources.get_next_cost('coal')
+        self.assertTrue(self.game.handle_action('add_res_to_purchase', res_type='coal', cost=cost)['success'])
+        self.game.handle_action('undo')
+        self.assertEqual(self.game.resources.available, available)
+        self.assertEqual(player.money_to_pay, 0)
+        self.assertFalse(player.owned_power_plants[card_id].resources_to_purchase)
+        self.assertEqual(len(self.game.history.undo_stack), undo_depth)
+
+    def test_undo_depth_is_capped(self):
+        game = Game(seed=1, undo_depth=2)
+        for _ in game.players:
+            game.handle_action('player_pass')
+        self.assertEqual(len(game.history.undo_stack), 2)
+        self.assertEqual(len(game.clone(undo_depth=0).history.undo_stack), 0)
+
+    def test_undo_phase_change(self):
+        restored = []
+        self.game.events.subscribe('state_restored', lambda game_state: restored.append(game_state['phase']))
+        order = [p.name for p in self.game.players]
+        for _ in self.game.players:
+            self.game.handle_action('player_pass')
+        self.assertEqual(PHASES[self.game.phase_index], 'Resources')
+
+        self.game.handle_action('undo')
+        self.assertEqual(PHASES[self.game.phase_index], 'Auction')
+        self.assertEqual([p.name for p in self.game.players], order)
+        self.assertEqual(self.game.current_player_index, len(order) - 1)
+        self.assertEqual(restored, ['Auction'])
+
+        self.game.handle_action('redo')
+        self.assertEqual(PHASES[self.game.phase_index], 'Resources')
+        self.assertFalse(self.game.history.can_redo())
+
+class TestPowerPlantMarket(unittest.TestCase):
+    def setUp(self):
+        self.market = PowerPlantMarket()
+        for card_id in ['3', '4', '5', '6', '7', '8', '9', '10']:
+            self.market.add_card_to_market(card_id)
+
+    def test_cards_stay_in_order(self):
+        self.market.add_card_to_market('step3')
+        self.market.add_card_to_market('25')
+        self.market.add_card_to_market('13')
+        self.assertEqual(self.market.current_market, ['3', '4', '5', '6', '7', '8', '9', '10', '13', '25', 'step3'])
+
+    def test_current_and_future_split(self):
+        self.assertEqual(self.market.current_cards(), ['3', '4', '5', '6'])
+        self.assertEqual(self.market.future_cards(), ['7', '8', '9', '10'])
+
+    def test_step3_layout(self):
+        self.market.remove_card_from_market('10')
+        self.market.add_card_to_market('step3')
+        self.market.start_step3()
+        self.assertEqual(self.market.current_cards(), ['4', '5', '6', '7', '8', '9'])
+        self.assertEqual(self.market.future_cards(), [])
+
+    def test_snapshot_restore(self):
+        snapshot = self.market.snapshot()
+        self.market.remove_lowest_card()
+        self.market.start_step3()
+        self.market.restore(snapshot)
+        self.assertEqual(self.market.current_market, ['3', '4', '5', '6', '7', '8', '9', '10'])
+        self.assertEqual(self.market.current_size, 4)
+
+class TestStep3(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=3)
+
+    def test_future_cards_cannot_be_auctioned(self):
+        card_id = self.game.power_plant_market.future_cards()[0]
+        self.assertTrue(self.game.handle_action('start_auction', card_id=card_id)[0] is False)
+        self.assertIsNone(self.game.auction_logic)
+
+    def test_step3_starts_after_the_auction(self):
+        market = self.game.power_plant_market
+        market.remove_card_from_market(market.current_market[-1])
+        market.add_card_to_market('step3')
+        expected = market.current_market[1:-1]
+        for _ in self.game.players:
+            self.game.handle_action('player_pass')
+        self.assertEqual(self.game.step, 3)
+        self.assertEqual(market.current_cards(), expected)
+
+        self.game.handle_action('undo')
+        self.assertEqual(self.game.step, 1)
+        self.assertIn('step3', market.current_market)
+        self.assertEqual(market.current_size, 4)
+
+class TestPlayerOrder(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=4)
+
+    def expected_key(self, player):
+        return (len(player.cities), max(self.game.deck.cards[card_id].number for card_id in player.owned_power_plants))
+
+    def test_key_follows_builds_and_undo(self):
+        while PHASES[self.game.phase_index] != 'Houses':
+            self.game.handle_action('player_pass')
+        player = self.game.players[self.game.current_player_index]
+        key = player.order_key
+        city_name, cost = min(self.game.get_build_costs().items(), key=lambda item: item[1])
+        self.game.handle_action('build_house', city_name=city_name, cost=cost)
+        self.assertEqual(player.order_key, (key[0] + 1, key[1]))
+        self.game.handle_action('undo')
+        self.assertEqual(player.order_key, key)
+
+    def test_key_follows_plant_replacement(self):
+        player = self.game.players[0]
+        player.money = 100
+        self.game.resolve_auction(player, '40', 40)
+        self.game.resolve_auction(player, '39', 39)
+        self.assertEqual(player.order_key, self.expected_key(player))
+        self.assertEqual(player.order_key[1], 40)
+
+    def test_sort_by_cities_then_highest_plant(self):
+        self.game.round = 2
+        self.game.sort_players()
+        keys = [self.expected_key(player) for player in self.game.players]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertEqual([player.order_key for player in self.game.players], keys)
+
+if __name__ == '__main__':
+    unittest.main()
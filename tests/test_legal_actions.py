@@ -0,0 +1,57 @@
+import random
+import unittest
+from logic.Actions import AddResToPurchase, BuildHouse, PlayerPass, failed
+from logic.Game import Game
+from utils.constants import CITIES, PHASES
+
+class TestLegalActions(unittest.TestCase):
+    def play_random(self, game, steps, rng):
+        for _ in range(steps):
+            actions = game.get_legal_actions()
+            if not actions:
+                break
+            action = rng.choice(actions)
+            result = game.apply_action(action)
+            self.assertFalse(failed(result), f"{action} was refused: {result}")
+
+    def test_every_legal_action_is_accepted(self):
+        for seed in range(3):
+            game = Game(seed=seed)
+            self.play_random(game, 400, random.Random(seed))
+            self.assertTrue(game.history.can_undo())
+
+    def test_houses_match_can_build_house(self):
+        game = Game(seed=1)
+        while PHASES[game.phase_index] != 'Houses':
+            game.handle_action('player_pass')
+        legal = {a.city_name: a.cost for a in game.get_legal_actions() if isinstance(a, BuildHouse)}
+        expected = {}
+        for city_name in CITIES:
+            result = game.can_build_house(city_name)
+            if result['success']:
+                expected[city_name] = result['cost']
+        self.assertEqual(legal, expected)
+        self.assertTrue(any(isinstance(a, PlayerPass) for a in game.get_legal_actions()))
+
+    def test_purchases_match_can_hold_resource(self):
+        game = Game(seed=2)
+        while PHASES[game.phase_index] != 'Resources':
+            game.handle_action('player_pass')
+        rng = random.Random(0)
+        for _ in range(6):
+            legal = {a.res_type for a in game.get_legal_actions() if isinstance(a, AddResToPurchase)}
+            player = game.players[game.current_player_index]
+            expected = {
+                res_type for res_type in ('coal', 'oil', 'trash', 'uranium')
+                if game.get_valid_cards_for_res(res_type)
+                and game.resources.get_next_cost(res_type) is not None
+                and player.money_to_pay + game.resources.get_next_cost(res_type) <= player.money
+            }
+            self.assertEqual(legal, expected)
+            if not legal:
+                break
+            res_type = rng.choice(sorted(legal))
+            game.handle_action('add_res_to_purchase', res_type=res_type, cost=game.resources.get_next_cost(res_type))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from logic.Bots import MCTSBot
+from logic.Game import Game
+from logic.MCTS import TreeSearch, action_key, merge_stats
+from logic.Simulation import play_game
+from utils.constants import PHASES
+
+class TestTreeSearch(unittest.TestCase):
+    def test_search_picks_a_legal_action(self):
+        game = Game(seed=4)
+        search = TreeSearch(game, seed=0)
+        iterations = search.run(time_budget=5, max_iterations=40)
+        self.assertEqual(iterations, 40)
+        stats = search.root_stats()
+        self.assertEqual(sum(entry[0] for entry in stats.values()), 40)
+        legal = {action_key(action) for action in game.get_legal_actions()}
+        self.assertTrue(set(stats) <= legal)
+        # The search never touches the game it was given
+        self.assertEqual(game.state_digest(), Game(seed=4).state_digest())
+
+    def test_worker_statistics_are_summed(self):
+        first = {('pass_bid', '{}'): [3, 1.5, 'pass_bid', {}]}
+        second = {('pass_bid', '{}'): [2, 0.5, 'pass_bid', {}], ('submit_bid', 'x'): [1, 1.0, 'submit_bid', {}]}
+        merged = merge_stats([first, second])
+        self.assertEqual(merged[('pass_bid', '{}')][:2], [5, 2.0])
+        self.assertEqual(merged[('submit_bid', 'x')][:2], [1, 1.0])
+
+class TestMCTSBot(unittest.TestCase):
+    def test_parallel_search_answers_within_budget(self):
+        bot = MCTSBot(seed=1, time_budget=0.3, workers=2)
+        try:
+            game = Game(seed=5)
+            while PHASES[game.phase_index] != 'Houses':
+                game.handle_action('player_pass')
+            action = bot.choose_action(game)
+            self.assertIn(action_key(action), {action_key(a) for a in game.get_legal_actions()})
+        finally:
+            bot.close()
+
+    def test_plays_through_the_simulator(self):
+        result = play_game(['mcts', 'random', 'random', 'random'], seed=2, max_rounds=1, bot_options={'mcts': {'time_budget': 0.01, 'workers': 1}})
+        self.assertEqual(result['players'][0]['bot'], 'MCTSBot')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from logic.Game import Game, OwnedPowerPlant
+from logic.Power import plan_power, plant_key
+from utils.constants import PHASES
+
+PRICES = (3, 5, 6, 12)  # coal, oil, trash, uranium
+
+def plant(card_id, card_type, needed, capacity, coal=0, oil=0, trash=0, uranium=0):
+    return (card_id, card_type, needed, capacity, (coal, oil, trash, uranium))
+
+class TestPlanPower(unittest.TestCase):
+    def test_hybrid_burns_the_cheaper_tokens(self):
+        powered, tokens = plan_power((plant('21', 'hybrid', 2, 4, coal=1, oil=3),), 5, PRICES)
+        self.assertEqual(powered, 4)
+        self.assertEqual(sorted(tokens), [('21', 'coal'), ('21', 'oil')])
+        powered, tokens = plan_power((plant('21', 'hybrid', 2, 4, oil=3),), 5, PRICES)
+        self.assertEqual(tokens, (('21', 'oil'), ('21', 'oil')))
+
+    def test_does_not_burn_tokens_for_cities_it_lacks(self):
+        plants = (
+            plant('13', 'renewable', 0, 1),
+            plant('20', 'coal', 3, 5, coal=3),
+            plant('11', 'uranium', 1, 2, uranium=1),
+        )
+        # Two cities need one fired plant; three coal cost less than one uranium
+        self.assertEqual(plan_power(plants, 2, PRICES), (2, (('20', 'coal'),) * 3))
+        powered, tokens = plan_power(plants, 8, PRICES)
+        self.assertEqual(powered, 8)
+        self.assertEqual(len(tokens), 4)
+
+    def test_plant_without_enough_tokens_stays_off(self):
+        self.assertEqual(plan_power((plant('10', 'coal', 2, 2, coal=1),), 3, PRICES), (0, ()))
+
+class TestAllocatePower(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=4)
+        while PHASES[self.game.phase_index] != 'Bureaucracy':
+            self.game.handle_action('player_pass')
+        self.player = self.game.players[self.game.current_player_index]
+        self.player.cities = ['Essen', 'Duisburg', 'Dortmund']
+        cards = self.game.deck.cards
+        self.hybrid = OwnedPowerPlant(cards['21'])
+        self.hybrid.resources_on_card['oil'] = 3
+        self.hybrid.resources_on_card['coal'] = 1
+        self.player.owned_power_plants = {'21': self.hybrid}
+
+    def test_allocation_replaces_hand_picked_tokens(self):
+        self.game.handle_action('add_res_to_power', card_id='21', res_type='oil')
+        self.assertIn('allocate_power', [action.name for action in self.game.get_legal_actions()])
+        result = self.game.handle_action('allocate_power')
+        self.assertEqual(result['cities_powered'], 3)
+        self.assertEqual(self.hybrid.resources_to_power.total() + self.hybrid.resources_on_card.total(), 4)
+        self.assertEqual(sorted(self.hybrid.resources_to_power.keys()), sorted({res for _, res in result['tokens']}))
+        self.assertNotIn('allocate_power', [action.name for action in self.game.get_legal_actions()])
+        self.game.handle_action('undo')
+        self.assertEqual(self.hybrid.resources_to_power, {'oil': 1})
+        self.assertEqual(self.hybrid.resources_on_card, {'oil': 2, 'coal': 1})
+
+    def test_plans_are_cached(self):
+        plan_power.cache_clear()
+        key = (plant_key(self.hybrid),)
+        self.game.get_power_plan()
+        self.game.get_power_plan()
+        self.assertEqual(plan_power.cache_info().hits, 1)
+        self.assertEqual(plan_power.cache_info().currsize, 1)
+        self.assertEqual(key[0][4], (1, 3, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import unittest
+from collections import deque
+from logic.Game import Game
+from logic.Journal import read_index
+from logic.Replay import answer_from, apply_entry, replay, seek
+from utils.constants import PHASES
+from logic.Simulation import play_game
+
+BOT_NAMES = ['greedy', 'random', 'greedy', 'random']
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.tmp_dir.name, 'game.jsonl')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_seed_fixes_the_setup(self):
+        first, second = Game(seed=7), Game(seed=7)
+        self.assertEqual(first.state_digest(), second.state_digest())
+        self.assertEqual(first.deck.stack_card_ids, second.deck.stack_card_ids)
+
+    def test_replay_reproduces_the_game(self):
+        play_game(BOT_NAMES, seed=5, max_rounds=8, journal_path=self.journal_path)
+        game, summary = replay(self.journal_path)
+        self.assertGreater(summary['actions'], 0)
+        self.assertEqual(summary['checkpoints_verified'], 1)
+        self.assertEqual(summary['keyframes_verified'], game.round)
+        with open(self.journal_path) as journal_file:
+            entries = [json.loads(line) for line in journal_file]
+        self.assertEqual(entries[0]['seed'], 5)
+        self.assertEqual(entries[-1]['digest'], game.state_digest())
+        # The bots settle auctions with a batch of maximum bids
+        batches = [entry['kwargs']['batch'] for entry in entries if entry.get('action') == 'apply_actions']
+        self.assertTrue(any(name == 'register_max_bid' for batch in batches for name, kwargs in batch))
+
+    def test_replay_detects_divergence(self):
+        play_game(BOT_NAMES, seed=5, max_rounds=3, journal_path=self.journal_path)
+        with open(self.journal_path) as journal_file:
+            entries = [json.loads(line) for line in journal_file]
+        entries[0]['seed'] = 6
+        with open(self.journal_path, 'w') as journal_file:
+            journal_file.writelines(json.dumps(entry) + '\n' for entry in entries)
+        with self.assertRaises(ValueError):
+            replay(self.journal_path)
+
+    def test_seek_matches_a_full_replay(self):
+        play_game(BOT_NAMES, seed=5, max_rounds=6, journal_path=self.journal_path)
+        index = read_index(self.journal_path)
+        self.assertIn((1, 'Auction'), index)
+        target = index[(4, 'Houses')]
+        self.assertLess(target['keyframe'], target['offset'])
+
+        game = seek(self.journal_path, 4, 'Houses')
+        self.assertEqual((game.round, PHASES[game.phase_index]), (4, 'Houses'))
+
+        full = Game(seed=5)
+        with open(self.journal_path) as journal_file:
+            entries = [json.loads(line) for line in journal_file][1:]
+        actions = [entry for entry in entries if entry['type'] == 'action'][:target['actions']]
+        pending = deque()
+        answer_from(full, pending)
+        for entry in actions:
+            apply_entry(full, entry, pending)
+        self.assertEqual(game.state_digest(), full.state_digest())
+
+    def test_restore_state_round_trips(self):
+        play_game(BOT_NAMES, seed=2, max_rounds=3, journal_path=self.journal_path)
+        game, _ = replay(self.journal_path)
+        restored = Game(seed=0)
+        restored.restore_state(json.loads(json.dumps(game.export_state())))
+        self.assertEqual(restored.state_digest(), game.state_digest())
+        self.assertEqual(restored.rng.random(), game.rng.random())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import random
+import unittest
+from logic.Resource import Resources, INITIAL_RESOURCES, TOTAL_RESOURCES
+
+class TestResources(unittest.TestCase):
+    def setUp(self):
+        self.resources = Resources()
+
+    def test_initial_market(self):
+        self.assertEqual(self.resources.get_current_market_resources(),
+                         {'coal': 24, 'oil': 18, 'trash': 6, 'uranium': 2})
+        self.assertEqual(self.resources.remaining_resources['trash'], TOTAL_RESOURCES['trash'] - 6)
+        self.assertEqual(self.resources.cur_resources, INITIAL_RESOURCES)
+
+    def test_price_of_next(self):
+        self.assertEqual(self.resources.price_of_next('coal', 4), 1 + 1 + 1 + 2)
+        self.assertEqual(self.resources.price_of_next('oil', 1), 3)
+        self.assertEqual(self.resources.price_of_next('uranium', 2), 14 + 16)
+        self.assertIsNone(self.resources.price_of_next('uranium', 3))
+        self.assertEqual(self.resources.validate_purchase({'coal': 4, 'oil': 1}, 8), (True, 'resources cost : 8'))
+        self.assertFalse(self.resources.validate_purchase({'coal': 4, 'oil': 1}, 7)[0])
+
+    def test_matches_slot_model(self):
+        # Reference: the per-slot (cost, available) lists the market used to keep
+        slots = {res_type: list(res_list) for res_type, res_list in INITIAL_RESOURCES.items()}
+        rng = random.Random(7)
+        for _ in range(500):
+            res_type = rng.choice(list(slots))
+            if rng.random() < 0.6:
+                idx = next((i for i, (_, available) in enumerate(slots[res_type]) if available), None)
+                if idx is not None:
+                    slots[res_type][idx] = (slots[res_type][idx][0], False)
+                self.assertEqual(self.resources.remove_left_most_resources(res_type), idx is not None)
+            else:
+                idx = -1
+                for i, (cost, available) in enumerate(slots[res_type]):
+                    if available:
+                        break
+                    idx = i
+                expected = -1
+                if idx >= 0:
+                    expected = slots[res_type][idx][0]
+                    slots[res_type][idx] = (expected, True)
+                self.assertEqual(self.resources.add_back_left_most_resource(res_type), expected)
+        self.assertEqual(self.resources.cur_resources, slots)
+
+    def test_markets_are_isolated(self):
+        other = Resources()
+        for _ in range(5):
+            self.resources.remove_left_most_resources('coal')
+        self.assertEqual(other.available['coal'], 24)
+        self.assertEqual(Resources().cur_resources, INITIAL_RESOURCES)
+
+        fork = self.resources.clone()
+        fork.remove_left_most_resources('oil')
+        fork.remaining_resources['oil'] += 1
+        self.assertEqual(self.resources.available['oil'], 18)
+        self.assertEqual(self.resources.remaining_resources['oil'], 6)
+        self.assertEqual(fork.available['coal'], 19)
+
+    def test_refill_fills_from_the_right(self):
+        for _ in range(18):
+            self.resources.remove_left_most_resources('oil')
+        self.resources.refill_resources(4, 1)
+        self.assertEqual(self.resources.available['oil'], 3)
+        self.assertEqual(self.resources.remaining_resources['oil'], 3)
+        self.assertEqual(self.resources.get_next_cost('oil'), 8)
+
+if __name__ == '__main__':
+    unittest.main()
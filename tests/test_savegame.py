@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from logic.Game import Game
+from logic.SaveGame import Archive, ArchiveWriter, decode_state, encode_state, load_game, save_game
+from logic.Simulation import play_game, simulate
+
+BOT_NAMES = ['greedy', 'random', 'greedy', 'random']
+
+class TestSaveGame(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_encoding_round_trips(self):
+        state = play_game(BOT_NAMES, seed=4, max_rounds=5, keep_state=True)['state']
+        self.assertEqual(decode_state(encode_state(state)), state)
+        without_rng = decode_state(encode_state(state, include_rng=False))
+        self.assertIsNone(without_rng['rng'])
+        self.assertEqual(dict(without_rng, rng=state['rng']), state)
+        self.assertLess(len(encode_state(state, include_rng=False)) * 4, len(json.dumps(dict(state, rng=None))))
+
+    def test_auction_in_progress_round_trips(self):
+        game = Game(seed=1)
+        game.handle_action('start_auction', card_id=game.power_plant_market.current_market[0])
+        game.handle_action('submit_bid', bid_amount=5)
+        game.handle_action('register_max_bid', player=game.players[2].name, max_bid=12)
+        state = game.export_state()
+        self.assertEqual(state['auction']['max_bids'], {game.players[2].name: 12})
+        self.assertIsNotNone(state['auction'])
+        self.assertEqual(decode_state(encode_state(state)), state)
+
+    def test_negative_money_and_seed_round_trip(self):
+        game = Game(seed=-3)
+        game.players[0].money = -7
+        game.players[0].money_to_pay = -2
+        state = game.export_state()
+        self.assertEqual(decode_state(encode_state(state)), state)
+
+    def test_save_and_load_game(self):
+        game = Game(seed=9)
+        for _ in game.players:
+            game.handle_action('player_pass')
+        path = os.path.join(self.tmp_dir.name, 'game.pgsave')
+        save_game(game, path)
+        loaded = load_game(path)
+        self.assertEqual(loaded.state_digest(), game.state_digest())
+        self.assertEqual(loaded.rng.random(), game.rng.random())
+
+    def test_bad_archive_is_closed(self):
+        opened = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            opened.append(real_open(*args, **kwargs))
+            return opened[-1]
+
+        for content in (b'', b'not an archive at all, just some bytes'):
+            path = os.path.join(self.tmp_dir.name, 'bad.pgar')
+            with open(path, 'wb') as bad_file:
+                bad_file.write(content)
+            with mock.patch('builtins.open', tracking_open), self.assertRaises(ValueError):
+                Archive(path)
+            self.assertTrue(opened[-1].closed)
+
+    def test_archive_reads_single_records(self):
+        path = os.path.join(self.tmp_dir.name, 'games.pgar')
+        states = [Game(seed=seed).export_state() for seed in range(5)]
+        with ArchiveWriter(path, include_rng=True) as writer:
+            for state in states:
+                writer.add_state(state)
+        with Archive(path) as archive:
+            self.assertEqual(len(archive), 5)
+            self.assertEqual(archive[3], states[3])
+            self.assertEqual(archive.game(2).state_digest(), Game(seed=2).state_digest())
+            with self.assertRaises(IndexError):
+                archive[5]
+
+    def test_simulate_writes_archive(self):
+        output_path = os.path.join(self.tmp_dir.name, 'results.jsonl')
+        archive_path = os.path.join(self.tmp_dir.name, 'results.pgar')
+        simulate(3, BOT_NAMES, output_path, workers=2, max_rounds=4, archive_path=archive_path)
+        with Archive(archive_path) as archive:
+            self.assertEqual(sorted(state['seed'] for state in archive), [0, 1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
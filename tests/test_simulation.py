@@ -0,0 +1,28 @@
+import json
+import os
+import tempfile
+import unittest
+from logic.Simulation import play_game, simulate
+
+BOT_NAMES = ['greedy', 'random', 'greedy', 'random']
+
+class TestSimulation(unittest.TestCase):
+    def test_play_game_reports_every_player(self):
+        result = play_game(BOT_NAMES, seed=3, max_rounds=20)
+        self.assertEqual(len(result['players']), 4)
+        self.assertEqual([p['bot'] for p in result['players']], ['GreedyBot', 'RandomBot', 'GreedyBot', 'RandomBot'])
+        self.assertGreaterEqual(result['rounds'], 1)
+        if result['completed']:
+            self.assertIsNotNone(result['winner'])
+
+    def test_simulate_streams_results(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, 'results.jsonl')
+            summary = simulate(4, BOT_NAMES, output_path, workers=2, max_rounds=10)
+            with open(output_path) as results_file:
+                results = [json.loads(line) for line in results_file]
+        self.assertEqual(summary['games'], 4)
+        self.assertEqual(sorted(r['seed'] for r in results), [0, 1, 2, 3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+from logic.Actions import failed
+from logic.Game import Game, OwnedPowerPlant
+from logic.Resource import ResourceCounts
+from logic.Storage import StorageIndex, store_tokens
+
+class TestStoreTokens(unittest.TestCase):
+    def test_moves_stored_tokens_to_make_room(self):
+        plants = [('10', ('coal',), 4), ('12', ('coal', 'oil'), 4)]
+        placement, dropped = store_tokens(plants, {'10': [0, 0, 0, 0], '12': [4, 0, 0, 0]}, [0, 3, 0, 0])
+        # Only as much coal moves as the oil needs
+        self.assertEqual(placement, {'10': [3, 0, 0, 0], '12': [1, 3, 0, 0]})
+        self.assertEqual(dropped, [0, 0, 0, 0])
+
+    def test_keeps_stored_tokens_and_drops_the_rest(self):
+        plants = [('11', ('uranium',), 2), ('12', ('coal', 'oil'), 4)]
+        placement, dropped = store_tokens(plants, {'11': [0, 0, 0, 1], '12': [0, 4, 0, 0]}, [2, 0, 1, 3])
+        self.assertEqual(placement, {'11': [0, 0, 0, 2], '12': [0, 4, 0, 0]})
+        self.assertEqual(dropped, [2, 0, 1, 2])
+
+class TestPlantReplacement(unittest.TestCase):
+    def setUp(self):
+        self.game = Game(seed=6)
+        self.player = self.game.players[self.game.current_player_index]
+        self.player.money = 100
+
+    def own(self, tokens):
+        cards = self.game.deck.cards
+        self.player.owned_power_plants = {}
+        for card_id, counts in tokens.items():
+            owned_pp = OwnedPowerPlant(cards[card_id])
+            owned_pp.resources_on_card = ResourceCounts(counts)
+            self.player.owned_power_plants[card_id] = owned_pp
+
+    def tokens(self):
+        return {card_id: dict(pp.resources_on_card.items()) for card_id, pp in self.player.owned_power_plants.items()}
+
+    def test_removed_tokens_are_stored_across_all_plants(self):
+        self.own({'10': {}, '12': {'coal': 4}, '7': {'oil': 3}})
+        # The new plant is renewable; the oil only fits on the hybrid once its coal moves
+        self.game.on_auction_end(self.player, '13', 13)
+        self.assertEqual(self.tokens(), {'10': {'coal': 3}, '12': {'coal': 1, 'oil': 3}, '13': {}})
+        self.assertFalse(self.player.left_resources_from_removed_pp)
+        self.assertTrue(self.player.phase_completed)
+
+    def test_auto_allocation_keeps_the_most_tokens(self):
+        self.own({'10': {}, '12': {'oil': 4}, '8': {'coal': 6}})
+        self.game.on_auction_end(self.player, '13', 13)
+        self.assertEqual(self.player.left_resources_from_removed_pp, {'coal': 6})
+        self.assertIn('auto_allocate_left_over_res', [action.name for action in self.game.get_legal_actions()])
+        result = self.game.handle_action('auto_allocate_left_over_res', player=self.player)
+        self.assertEqual(result, {'success': True, 'discarded': {'coal': 2}})
+        self.assertEqual(self.tokens(), {'10': {'coal': 4}, '12': {'oil': 4}, '13': {}})
+        self.assertTrue(self.player.phase_completed)
+        self.game.handle_action('undo')
+        self.assertEqual(self.player.left_resources_from_removed_pp, {'coal': 6})
+        self.assertEqual(self.tokens(), {'10': {}, '12': {'oil': 4}, '13': {}})
+
+class TestStorageIndex(unittest.TestCase):
+    def test_hybrid_slots_are_shared(self):
+        game = Game(seed=1)
+        cards = game.deck.cards
+        plants = {'10': OwnedPowerPlant(cards['10']), '12': OwnedPowerPlant(cards['12']), '14': OwnedPowerPlant(cards['14'])}
+        plants['14'].resources_on_card['trash'] = 3
+        storage = StorageIndex(plants)
+        self.assertEqual((storage.room('coal'), storage.room('oil'), storage.room('trash')), (8, 4, 1))
+        self.assertTrue(storage.can_store({'coal': 5, 'oil': 3}))
+        self.assertFalse(storage.can_store({'coal': 6, 'oil': 3}))
+        self.assertFalse(storage.can_store({'uranium': 1}))
+        storage.take('12', 4)
+        self.assertEqual(storage.cards_for('coal'), ['10'])
+        self.assertFalse(storage.can_hold('12', 'oil'))
+
+    def test_index_follows_the_game(self):
+        for seed in range(3):
+            game = Game(seed=seed)
+            rng = random.Random(seed)
+            for _ in range(400):
+                actions = game.get_legal_actions()
+                if not actions:
+                    break
+                if rng.random() < 0.1:
+                    game.handle_action('undo')
+                else:
+                    self.assertFalse(failed(game.apply_action(rng.choice(actions))))
+                for player in game.players:
+                    self.assertEqual(game.free_storage(player), StorageIndex(player.owned_power_plants).free)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,11 @@ import tkinter as tk
 from tkinter import messagebox
 
 class AuctionUI:
-    def __init__(self, root, auction_logic, card_image_tk):
+    def __init__(self, root, auction_logic, card_image_tk, action_handler):
         self.root = root
         self.auction_logic = auction_logic
+        # bids go through the game so they are journaled and can be undone
+        self.action_handler = action_handler
         self.card_image_tk = card_image_tk
 
         self.create_bid_window()
@@ -52,6 +54,10 @@ class AuctionUI:
         pass_button = tk.Button(bid_info_frame, text="Pass", bg="#D3D3D3", command=self.pass_bid)
         pass_button.grid(row=2, column=2, columnspan=2, pady=5)
 
+        # Bid automatically up to the entered amount; the auction is settled once everyone has done so
+        max_bid_button = tk.Button(bid_info_frame, text="Set Max Bid", bg="#B0C4DE", command=self.register_max_bid)
+        max_bid_button.grid(row=3, column=0, columnspan=4, pady=5)
+
         # Frame for bid order
         bid_order_frame = tk.Frame(self.bid_window)
         bid_order_frame.grid(row=1, column=1, padx=10, pady=10, sticky="n")
@@ -92,6 +98,8 @@ class AuctionUI:
             player_label.config(font=("Arial", 10))  # Reset font
             if self.auction_logic.players[i] == self.auction_logic.players[self.auction_logic.active_bidder_index]:
                 player_label.config(font=("Arial", 10, "underline"))
+            if self.auction_logic.players[i].name in self.auction_logic.max_bids:
+                player_label.config(font=("Arial", 10, "italic"))
             if self.auction_logic.players[i] in self.auction_logic.passed_players:
                 player_label.config(fg="gray", font=("Arial", 10, "overstrike"))
 
@@ -102,7 +110,22 @@ class AuctionUI:
             self.show_error("Invalid Bid", "Your bid must be an integer.")
             return
 
-        success, error_message = self.auction_logic.submit_bid(new_bid)
+        success, error_message = self.action_handler('submit_bid', bid_amount=new_bid)
+        if success:
+            if not self.auction_logic.auction_ended:
+                self.update_bid_display()
+        else:
+            self.show_error("Bid Error", error_message)
+
+    def register_max_bid(self):
+        try:
+            max_bid = int(self.bid_value.get())
+        except ValueError:
+            self.show_error("Invalid Bid", "Your bid must be an integer.")
+            return
+
+        player = self.auction_logic.players[self.auction_logic.active_bidder_index]
+        success, error_message = self.action_handler('register_max_bid', player=player, max_bid=max_bid)
         if success:
             if not self.auction_logic.auction_ended:
                 self.update_bid_display()
@@ -110,7 +133,7 @@ class AuctionUI:
             self.show_error("Bid Error", error_message)
 
     def pass_bid(self):
-        success, error_message = self.auction_logic.pass_bid()
+        success, error_message = self.action_handler('pass_bid')
 
         if success and not self.auction_logic.auction_ended:
             self.update_bid_display()
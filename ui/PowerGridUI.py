@@ -2,7 +2,8 @@ import tkinter as tk
 from tkinter import messagebox
 from PIL import Image, ImageTk
 import os
-import json
+from logic.Cards import CARDS
+from ui.AuctionUI import AuctionUI
 from utils.constants import RES_TOKEN_POS, CITIES
 
 class PowerGridUI:
@@ -16,8 +17,11 @@ class PowerGridUI:
         print(f'get state: {self.get_game_state()}')
         self.resources = self.game_state["resources"]
         self.resource_image_ids = []
+        self.house_ids = []
 
         self.action_handler = action_handler
+        self.root.bind("<Control-z>", lambda event: self.action_handler('undo'))
+        self.root.bind("<Control-y>", lambda event: self.action_handler('redo'))
         
         # Create main layout frames
         self.create_scrollable_container()
@@ -50,7 +54,70 @@ class PowerGridUI:
         uranium_image_sm = ImageTk.PhotoImage(Image.open(uranium_image_path).resize((8, 12), Image.Resampling.LANCZOS))
         self.resource_images_sm = {'coal': coal_image_sm, 'oil': oil_image_sm, 'trash': trash_image_sm, 'uranium': uranium_image_sm}
 
-        self.power_plant_cards = self.load_power_plant_cards()
+        self.power_plant_cards = CARDS  # the card registry shared with the game logic
+        self.auction_ui = None
+        self.build_cost_labels = []
+
+
+    def subscribe(self, events):
+        # Render game events emitted by the rules engine
+        events.subscribe("game_initialized", self.on_game_initialized)
+        events.subscribe("status_changed", self.update_status)
+        events.subscribe("players_changed", self.create_player_info)
+        events.subscribe("player_changed", self.update_player_info)
+        events.subscribe("player_control_changed", self.update_player_control)
+        events.subscribe("market_changed", self.create_power_plant_market)
+        events.subscribe("resource_market_changed", lambda resources: self.load_resources(resources.cur_resources))
+        events.subscribe("remaining_resources_changed", self.update_resource_section)
+        events.subscribe("house_built", self.add_house)
+        events.subscribe("build_costs_changed", self.show_build_costs)
+        events.subscribe("auction_started", self.on_auction_started)
+        events.subscribe("auction_ended", self.on_auction_ended)
+        events.subscribe("state_restored", self.on_state_restored)
+
+        # Answer the decisions the engine asks the current player to make
+        events.respond(
+            "select_power_plant_for_resource",
+            lambda player, valid_cards, res_type, cost: self.show_power_plant_selection_menu(valid_cards, res_type, cost),
+        )
+        events.respond(
+            "select_power_plant_to_remove",
+            lambda player, power_plant_ids: self.show_power_plant_removal_menu(power_plant_ids),
+        )
+
+
+    def on_game_initialized(self, step, power_plants_market, resources, remaining_resources):
+        self.create_power_plant_market(step, power_plants_market)
+        self.load_resources(resources.cur_resources)
+        self.create_resource_section(remaining_resources)
+
+
+    def on_state_restored(self, game_state):
+        # An undo or redo may have changed any part of the game, redraw everything
+        phase = game_state["phase"]
+        players = game_state["players"]
+        self.update_status(phase, players[game_state["current_player_index"]].name)
+        self.create_player_info(players, phase)
+        self.update_player_control()
+        self.create_power_plant_market(game_state["step"], game_state["power_plant_market"].current_market)
+        self.load_resources(game_state["resources"].cur_resources)
+        self.update_resource_section(game_state["resources"].remaining_resources)
+        self.load_houses()
+
+
+    def on_auction_started(self, auction_logic, card_image_tk):
+        self.auction_ui = AuctionUI(self.root, auction_logic, card_image_tk, self.action_handler)
+
+
+    def on_auction_ended(self, winner, card_id, final_bid):
+        # Close the auction window
+        if self.auction_ui:
+            self.auction_ui.close_window()
+            self.auction_ui = None
+
+        # Show a message box to announce the winner
+        message = f"{winner.name} won the auction for power plant {card_id} with a bid of {final_bid}."
+        messagebox.showinfo("Auction Result", message)
 
 
     def create_scrollable_container(self):
@@ -198,6 +265,33 @@ class PowerGridUI:
                         self.action_handler('build_house', city_name=clicked_city, cost=result['cost'])
     
     
+    def show_build_costs(self, costs, money):
+        """
+        Overlay the total build cost next to every city the current player can build in.
+        Affordable cities are highlighted; an empty costs dict just clears the overlay.
+        """
+        for lid in self.build_cost_labels:
+            self.map_canvas.delete(lid)
+        self.build_cost_labels.clear()
+
+        for city_name, cost in costs.items():
+            x, y = CITIES[city_name]['pos']
+            text_id = self.map_canvas.create_text(
+                x + 14, y - 12,
+                text=str(cost),
+                font=('Helvetica', 8, 'bold'),
+                fill='darkgreen' if cost <= money else 'gray30',
+                anchor='w'
+            )
+            bbox = self.map_canvas.bbox(text_id)
+            rect_id = self.map_canvas.create_rectangle(
+                bbox[0]-2, bbox[1]-1,
+                bbox[2]+2, bbox[3]+1,
+                fill='palegreen' if cost <= money else 'white', outline=''
+            )
+            self.map_canvas.tag_lower(rect_id, text_id)
+            self.build_cost_labels.extend([rect_id, text_id])
+    
     def update_status(self, phase_name, current_player_name):
         self.map_canvas.itemconfig(self.phase_label_canvas, text=f"Phase: {phase_name}")
         self.map_canvas.itemconfig(self.current_player_label_canvas, text=f"Current Player: {current_player_name}")
@@ -268,10 +362,17 @@ class PowerGridUI:
 
         # Ensure the house is on top of other items
         self.map_canvas.tag_raise(house_id)
+        self.house_ids.append(house_id)
     
     def load_houses(self):
-        players = self.game_state["players"]
-        built_cities = self.game_state["built_cities"]
+        # Clear existing houses
+        for house_id in self.house_ids:
+            self.map_canvas.delete(house_id)
+        self.house_ids.clear()
+
+        game_state = self.get_game_state()
+        players = game_state["players"]
+        built_cities = game_state["built_cities"]
 
         for player in players:
             for city_name, player_names in built_cities.items():
@@ -326,14 +427,6 @@ class PowerGridUI:
         menu.wait_window()
         return selected[0]
 
-    def load_power_plant_cards(self):
-        # Load the JSON file into a dictionary
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        json_path = os.path.join(current_dir, '..', 'power_plant_cards.json')
-        with open(json_path, 'r') as json_file:
-            cards_dict = json.load(json_file)
-        return cards_dict
-
 
     def create_power_plant_market(self, step, power_plants_market):
         # Clear existing widgets in the market_frame
@@ -361,8 +454,9 @@ class PowerGridUI:
             card_label.image = card_image_tk  # Keep a reference
             card_label.grid(row=i, column=j, padx=5, pady=5, sticky="nsew")
 
-            # [TODO] step 3 would allow click event on all cards, step 1 and 2 only needs to add click event on row 1
-            # Bind the click event to the card label
+            # Only the current market can be auctioned: every card in step 3, the first row before
+            if step != 3 and i > 0 or card_id == "step3":
+                continue
             card_label.bind("<Button-1>", lambda event, card_id=card_id: self.on_card_click(event, card_id))
 
 
@@ -377,9 +471,9 @@ class PowerGridUI:
 
     def load_card_image(self, card_id):
         # Example coordinates and dimensions for each card in the tile image        
-        if str(card_id) in self.power_plant_cards.keys():
-            power_plant_card = self.power_plant_cards[str(card_id)]
-            x, y, width, height = power_plant_card["col_index"] * 100, power_plant_card["row_index"] * 100, 100, 100
+        power_plant_card = self.power_plant_cards.get(str(card_id))
+        if power_plant_card is not None:
+            x, y, width, height = power_plant_card.col_index * 100, power_plant_card.row_index * 100, 100, 100
             card_image = self.tile_image.crop((x, y, x + width, y + height))
             return card_image
         else:
@@ -596,6 +690,8 @@ class PowerGridUI:
                 button.grid(row=1, column=0, pady=5)
             
             if player_name == current_player.name and cur_phase == "Bureaucracy":
+                auto_btn = tk.Button(control_frame, text='Auto Power', command=self.handle_allocate_power)
+                auto_btn.grid(row=0, column=0, pady=5)
                 button = tk.Button(control_frame, text='Generate Power', command=lambda pn=current_player.name: self.handle_generate_power(pn))
                 button.grid(row=1, column=0, pady=5)
 
@@ -605,6 +701,9 @@ class PowerGridUI:
                     confirm_btn = tk.Button(control_frame, text="Confirm Allocation",
                                             command=lambda: self.handle_confirm_left_over_res_allocation(current_player))
                     confirm_btn.grid(row=2, column=0, pady=5)
+                    auto_btn = tk.Button(control_frame, text="Auto Allocate",
+                                         command=lambda: self.handle_auto_allocate_left_over_res(current_player))
+                    auto_btn.grid(row=3, column=0, pady=5)
 
     def handle_pass(self, player_name):
         response = messagebox.askyesno("Pass", f"{player_name}, are you sure you want to pass?")
@@ -633,6 +732,12 @@ class PowerGridUI:
             else:
                 messagebox.showinfo("Success", result.get("message"))
             
+    def handle_allocate_power(self):
+        # Select the tokens that power the most cities most cheaply; the player can still adjust them
+        result = self.action_handler('allocate_power')
+        if result is not None and isinstance(result, dict) and not result.get("success", False):
+            messagebox.showerror("Error", result.get("message", "Failed to allocate power"))
+
     def handle_click_res_to_purchase(self, card_id, res_type):
         result = self.action_handler('put_back_res_to_purchase', card_id=card_id, res_type=res_type)
         if result is not None and isinstance(result, dict) and not result.get("success", False):
@@ -753,6 +858,13 @@ class PowerGridUI:
         
         self.action_handler("add_left_over_res_on_hold", player=player, card_id=selected_pp, res_type=res_type)
 
+    def handle_auto_allocate_left_over_res(self, player):
+        response = messagebox.askyesno("Auto Allocate", f"{player.name}, store your resources to keep as many as possible?")
+        if response:
+            result = self.action_handler("auto_allocate_left_over_res", player=player)
+            if result.get("discarded"):
+                messagebox.showinfo("Auto Allocate", f"Discarded resources: {result['discarded']}")
+
     def handle_confirm_left_over_res_allocation(self, player):
         response = messagebox.askyesno("Confirm Allocation", f"{player.name}, do you confirm the allocation of left-over resources?")
         if response:
@@ -97,6 +97,10 @@ PHASES = ["Auction", "Resources", "Houses", "Bureaucracy"]
 
 REGION_LIMITS = {2: 3, 3: 3, 4: 4, 5: 5, 6: 5}
 
+# Connected cities that start Step 2 / end the game, by number of players
+STEP_2_CITIES = {2: 10, 3: 7, 4: 7, 5: 7, 6: 6}
+GAME_END_CITIES = {2: 21, 3: 17, 4: 17, 5: 15, 6: 14}
+
 CITIES = {
     "Flensburg": {"region": "Green", "pos": (241, 26), "neighbors": [["Kiel", 4]]},
     "Kiel": {